@@ -0,0 +1,80 @@
+import threading
+
+
+class TaskCancelled(Exception):
+    """
+    Виняток, яким фонове завдання переривається після запиту на скасування.
+    """
+
+
+class BackgroundTask:
+    def __init__(self, function):
+        """
+        Завдання, що виконується у фоновому потоці. Функція отримує аргумент
+        progress - функцію progress(виконано, усього), яку слід викликати по мірі роботи:
+        вона запам'ятовує стан для інтерфейсу і перериває роботу винятком TaskCancelled
+        після cancel(). Потік не звертається до інтерфейсу: інтерфейс сам опитує
+        progress/done (наприклад, через root.after у Tk).
+        :param function: Функція function(progress) -> результат.
+        """
+        self.function = function
+        self.progress = (0, 0)  # Останній стан (виконано, усього)
+        self.result = None
+        self.error = None  # Виняток, яким завершилось завдання
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """
+        Запуск завдання.
+        :return: Це саме завдання.
+        """
+        self._thread.start()
+        return self
+
+    def _report(self, done, total):
+        if self._cancelled.is_set():
+            raise TaskCancelled("Операцію скасовано.")
+        self.progress = (done, total)
+
+    def _run(self):
+        try:
+            self.result = self.function(self._report)
+        except Exception as error:  # Помилку показує інтерфейс після завершення
+            self.error = error
+
+    def cancel(self):
+        """
+        Запит на скасування: завдання перерветься при наступному повідомленні про хід роботи.
+        """
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        """
+        True, якщо завдання завершилось через скасування.
+        """
+        return isinstance(self.error, TaskCancelled)
+
+    @property
+    def done(self):
+        """
+        True, якщо завдання завершилось (успішно, з помилкою або скасуванням).
+        """
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    def fraction(self):
+        """
+        Частка виконаної роботи від 0 до 1.
+        """
+        done, total = self.progress
+        return done / total if total else 0.0
+
+    def wait(self, timeout=None):
+        """
+        Очікування завершення завдання (для викликів поза інтерфейсом).
+        :param timeout: Максимальний час очікування, секунд (None - без обмеження).
+        :return: True, якщо завдання завершилось.
+        """
+        self._thread.join(timeout)
+        return self.done
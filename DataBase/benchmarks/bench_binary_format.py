@@ -0,0 +1,57 @@
+"""
+Порівняння часу збереження/завантаження та розміру файлу:
+JSON проти бінарного формату для таблиці з 500 000 рядків.
+
+Запуск: python benchmarks/bench_binary_format.py [кількість рядків]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from schema import Schema, Field
+from custom_types import RealInterval
+
+
+def build_database(row_count):
+    db = Database()
+    schema = Schema([
+        Field("id", int),
+        Field("score", float),
+        Field("name", str),
+        Field("interval", RealInterval)
+    ])
+    db.create_table("bench", schema, storage="columnar")
+    table = db.tables["bench"]
+    for i in range(row_count):
+        table.add_row({"id": i, "score": i * 0.5, "name": f"name-{i % 1000}",
+                       "interval": RealInterval(i, i + 1.5)})
+    return db
+
+
+def measure(db, filename):
+    start = time.perf_counter()
+    db.save_to_disk(filename)
+    save_time = time.perf_counter() - start
+    start = time.perf_counter()
+    Database().load_from_disk(filename)
+    load_time = time.perf_counter() - start
+    return save_time, load_time, os.path.getsize(filename)
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    db = build_database(row_count)
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Рядків: {row_count}")
+        for label, name in (("JSON", "bench.json"), ("binary", "bench.ldb")):
+            save_time, load_time, size = measure(db, os.path.join(directory, name))
+            print(f"{label:>7}: збереження {save_time:.2f} с, завантаження {load_time:.2f} с, "
+                  f"розмір {size / 1e6:.1f} МБ")
+
+
+if __name__ == "__main__":
+    main()
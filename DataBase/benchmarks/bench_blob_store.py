@@ -0,0 +1,60 @@
+"""
+Розмір на диску та час завантаження таблиці зображень, 95% яких повторюються:
+зображення у base64 всередині JSON проти сховища з дедуплікацією (save_to_disk(blobs=True)).
+
+Запуск: python benchmarks/bench_blob_store.py [кількість рядків] [розмір зображення, байт]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from schema import Schema, Field
+from custom_types import PictureFile
+from blob_store import blob_directory
+
+
+def _disk_size(filename):
+    size = os.path.getsize(filename)
+    for root, _, files in os.walk(blob_directory(filename)):
+        size += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return size
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    picture_size = int(sys.argv[2]) if len(sys.argv) > 2 else 8192
+    rng = random.Random(1)
+    thumbnails = [PictureFile(data=rng.randbytes(picture_size)) for _ in range(50)]
+    db = Database()
+    db.create_table("photos", Schema([Field("id", int), Field("photo", PictureFile)]))
+    table = db.tables["photos"]
+    for i in range(row_count):
+        if rng.random() < 0.05:
+            photo = PictureFile(data=rng.randbytes(picture_size))
+        else:
+            photo = rng.choice(thumbnails)
+        table.add_row({"id": i, "photo": photo})
+
+    print(f"Рядків: {row_count}, зображення: {picture_size} байт")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, extension, blobs in (("json", ".json", False), ("json+blobs", ".json", True),
+                                        ("binary", ".ldb", False), ("binary+blobs", ".ldb", True)):
+            filename = os.path.join(directory, label + extension)
+            start = time.perf_counter()
+            db.save_to_disk(filename, blobs=blobs)
+            save_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            Database().load_from_disk(filename)
+            load_time = time.perf_counter() - start
+            print(f"{label:>13}: {_disk_size(filename) / 2 ** 20:8.1f} МБ, "
+                  f"збереження {save_time:.2f} с, завантаження {load_time:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Пропускна здатність читання таблиці залежно від кількості потоків-читачів,
+поки потік-записувач постійно додає, редагує та видаляє рядки.
+
+Запуск: python benchmarks/bench_concurrency.py [кількість рядків] [тривалість, с]
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table import Table
+from schema import Schema, Field
+
+THREAD_COUNTS = (1, 2, 4, 8)
+
+
+def _run(table, reader_count, duration, writing=True):
+    stop = threading.Event()
+    reads = [0] * reader_count
+    writes = [0]
+
+    def reader(slot):
+        rng = random.Random(slot)
+        while not stop.is_set():
+            table.find("group", rng.randrange(100))
+            table.query().where("id", "<", rng.randrange(1000)).order_by("id", descending=True).limit(10).all()
+            reads[slot] += 2
+
+    def writer():
+        rng = random.Random(-1)
+        next_id = 10 ** 6
+        while not stop.is_set():
+            table.add_row({"id": next_id, "group": next_id % 100, "name": "w"})
+            table.edit_row(rng.randrange(len(table)), {"id": next_id, "group": 1, "name": "e"})
+            table.delete_row(len(table) - 1)  # Видалення з середини зсуває індекси і домінувало б у замірі
+            next_id += 1
+            writes[0] += 3
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(reader_count)]
+    if writing:
+        threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / duration, writes[0] / duration
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    table = Table("stress", Schema([Field("id", int), Field("group", int), Field("name", str)]))
+    table.add_rows([{"id": i, "group": i % 100, "name": f"n{i}"} for i in range(row_count)])
+    table.create_index("group")
+    table.create_index("id", "sorted")
+    print(f"Рядків: {row_count}, тривалість кожного заміру: {duration} с")
+    reads, _ = _run(table, 1, duration, writing=False)
+    print(f"читачів: 1 без записувача: читань {reads:10.0f}/с")
+    for reader_count in THREAD_COUNTS:
+        reads, writes = _run(table, reader_count, duration)
+        print(f"читачів: {reader_count}: читань {reads:10.0f}/с, змін {writes:8.0f}/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Вартість видалення рядків з великої таблиці з індексами: видалення з початку
+таблиці по одному рядку, масове видалення за позиціями та за ідентифікаторами.
+
+Запуск: python benchmarks/bench_delete.py [кількість рядків]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table import Table
+from schema import Schema, Field
+from custom_types import RealInterval
+
+SINGLE_DELETES = 1000  # Кількість видалень першого рядка
+MASS_FRACTION = 0.1  # Частка рядків для масового видалення
+
+
+def _table(storage, row_count):
+    table = Table("big", Schema([Field("id", int), Field("name", str), Field("interval", RealInterval)]), storage)
+    table.add_rows([{"id": i, "name": f"name-{i}", "interval": RealInterval(i, i + 1)} for i in range(row_count)])
+    table.create_index("id", "sorted")
+    table.create_index("name")
+    return table
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(1)
+    print(f"Рядків: {row_count}, індекси: sorted(id), hash(name)")
+    for storage in ("rows", "columnar"):
+        table = _table(storage, row_count)
+        start = time.perf_counter()
+        for _ in range(SINGLE_DELETES):
+            table.delete_row(0)
+        single = (time.perf_counter() - start) / SINGLE_DELETES
+
+        count = int(len(table) * MASS_FRACTION)
+        positions = rng.sample(range(len(table)), count)
+        start = time.perf_counter()
+        table.delete_rows(positions)
+        mass = time.perf_counter() - start
+
+        table = _table(storage, row_count)
+        row_ids = rng.sample(table.row_ids(), count)
+        start = time.perf_counter()
+        table.delete_rows_by_id(row_ids)
+        mass_by_id = time.perf_counter() - start
+        print(f"{storage:>9}: delete_row(0) {single * 1e6:8.1f} мкс; {count} рядків: "
+              f"delete_rows {mass:.3f} с, delete_rows_by_id {mass_by_id:.3f} с")
+
+
+if __name__ == "__main__":
+    main()
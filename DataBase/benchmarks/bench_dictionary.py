@@ -0,0 +1,60 @@
+"""
+Словникове кодування категоріальної колонки: пам'ять колонки (tracemalloc),
+розмір файлів JSON та .ldb, фільтр за рівністю та групування - без кодування і з ним.
+
+Запуск: python benchmarks/bench_dictionary.py [кількість рядків]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vectorized
+from database import Database
+from schema import Schema, Field
+from table import VALIDATE_NONE
+
+STATUSES = ["new", "in progress", "waiting for review", "done", "cancelled"]
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Рядків: {row_count}, різних значень: {len(STATUSES)}")
+    for storage in ("rows", "columnar"):
+        for encoded in (False, True):
+            db = Database()
+            db.create_table("T", Schema([Field("id", int), Field("status", str, dictionary=encoded)]), storage)
+            table = db.tables["T"]
+            # Окремі об'єкти рядків для кожного рядка, як після розбору JSON
+            tracemalloc.start()
+            table.add_rows(({"id": i, "status": "".join(STATUSES[i % len(STATUSES)])} for i in range(row_count)),
+                           VALIDATE_NONE)
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            count, query = _timed(lambda: table.query().where("status", "==", "done").count())
+            assert count == row_count // len(STATUSES)
+            _, group = _timed(lambda: vectorized.group_by(table, "status", "id", "count", use_numpy=False))
+            sizes = []
+            with tempfile.TemporaryDirectory() as directory:
+                for filename in ("db.json", "db.ldb"):
+                    path = os.path.join(directory, filename)
+                    db.save_to_disk(path)
+                    sizes.append(os.path.getsize(path))
+            label = f"{storage}{' + словник' if encoded else ''}"
+            print(f"{label:>18}: таблиця {memory / row_count:6.1f} байт/рядок, "
+                  f"JSON {sizes[0] / 2 ** 20:6.1f} МБ, .ldb {sizes[1] / 2 ** 20:6.1f} МБ, "
+                  f"where == {query * 1e3:7.1f} мс, group_by {group * 1e3:7.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
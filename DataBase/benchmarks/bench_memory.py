@@ -0,0 +1,50 @@
+"""
+Пам'ять таблиці з колонкою інтервалів (tracemalloc): рядкове та колонкове сховище
+і список усіх об'єктів Row, отриманих переглядом таблиці.
+
+Запуск: python benchmarks/bench_memory.py [кількість рядків]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table import Table, VALIDATE_NONE
+from schema import Schema, Field
+from custom_types import RealInterval
+
+
+def _allocated(function):
+    """
+    Пам'ять, що лишається зайнятою результатом функції, байт.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    schema = Schema([Field("id", int), Field("name", str), Field("interval", RealInterval)])
+    print(f"Рядків: {row_count}")
+    for storage in ("rows", "columnar"):
+        def build():
+            table = Table("big", schema, storage)
+            table.add_rows(({"id": i, "name": f"n{i}", "interval": RealInterval(i, i + 1)}
+                            for i in range(row_count)), VALIDATE_NONE)
+            return table
+
+        table, stored = _allocated(build)
+        rows, materialized = _allocated(lambda: list(table.rows))
+        print(f"{storage:>9}: таблиця {stored / row_count:6.1f} байт/рядок, "
+              f"список Row {materialized / row_count:6.1f} байт/рядок")
+        del table, rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Послідовне та паралельне (workers) збереження бази даних у JSON і бінарному форматі.
+Прискорення обмежене кількістю ядер процесора: на одному ядрі паралельний запис
+лише додає витрати на передачу сегментів між процесами.
+
+Запуск: python benchmarks/bench_parallel_save.py [кількість рядків]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from schema import Schema, Field
+from custom_types import RealInterval, PictureFile
+
+WORKER_COUNTS = (None, 1, 2, 4, 8, 16)
+TABLE_COUNT = 4
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    schema = Schema([Field("id", int), Field("name", str), Field("interval", RealInterval),
+                     Field("picture", PictureFile)])
+    db = Database()
+    for number in range(TABLE_COUNT):
+        db.create_table(f"t{number}", schema)
+        db.tables[f"t{number}"].add_rows([
+            {"id": i, "name": f"name-{i}", "interval": RealInterval(i, i + 1),
+             "picture": PictureFile(data=i.to_bytes(4, "little") * 256)} for i in range(row_count)])
+    print(f"Таблиць: {TABLE_COUNT} по {row_count} рядків, ядер: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in (".json", ".ldb"):
+            filename = os.path.join(directory, "db" + extension)
+            for workers in WORKER_COUNTS:
+                start = time.perf_counter()
+                db.save_to_disk(filename, workers=workers)
+                elapsed = time.perf_counter() - start
+                label = "послідовно" if workers is None else f"workers={workers}"
+                print(f"{extension:>5} {label:>12}: {elapsed:6.2f} с, {os.path.getsize(filename) / 2 ** 20:.1f} МБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Вартість перестановки колонок великої таблиці (лише зміна схеми)
+та повного перегляду рядків після неї.
+
+Запуск: python benchmarks/bench_reorder.py [кількість рядків]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table import Table, VALIDATE_NONE
+from schema import Schema, Field
+from custom_types import RealInterval
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    schema = Schema([Field("id", int), Field("name", str), Field("interval", RealInterval)])
+    print(f"Рядків: {row_count}")
+    for storage in ("rows", "columnar"):
+        table = Table("big", schema, storage)
+        table.add_rows([{"id": i, "name": f"name-{i}", "interval": RealInterval(i, i + 1)}
+                        for i in range(row_count)], VALIDATE_NONE)
+        table.create_index("id", "sorted")
+
+        start = time.perf_counter()
+        table.rename_or_reorder_columns(["name", "interval", "id"])
+        reorder = time.perf_counter() - start
+
+        start = time.perf_counter()
+        total = sum(row["id"] for row in table.rows)
+        scan = time.perf_counter() - start
+        assert total == row_count * (row_count - 1) // 2
+        print(f"{storage:>9}: перестановка колонок {reorder * 1e3:9.3f} мс, перегляд рядків {scan:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Час вставки, серіалізації та десеріалізації рядків таблиці
+(накладні витрати валідації та перетворення типів на рядок).
+
+Запуск: python benchmarks/bench_row_codecs.py [кількість рядків] [--no-gc]
+(--no-gc вимикає збирач сміття, щоб виміряти лише накладні витрати коду)
+"""
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table import Table
+from schema import Schema, Field
+from custom_types import PictureFile, RealInterval
+
+
+def main():
+    arguments = [argument for argument in sys.argv[1:] if argument != "--no-gc"]
+    if "--no-gc" in sys.argv:
+        gc.disable()
+    row_count = int(arguments[0]) if arguments else 200_000
+    schema = Schema([
+        Field("id", int),
+        Field("score", float),
+        Field("name", str),
+        Field("grade", "char"),
+        Field("photo", PictureFile),
+        Field("interval", RealInterval)
+    ])
+    picture = PictureFile(data=b"\xff\xd8\xff" + b"\x00" * 64)
+    rows = [{"id": i, "score": i * 0.5, "name": f"name-{i}", "grade": "A",
+             "photo": picture, "interval": RealInterval(i, i + 1)} for i in range(row_count)]
+
+    table = Table("bench", schema)
+    start = time.perf_counter()
+    for data in rows:
+        table.add_row(data)
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    data = table.to_dict()
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Table.from_dict(data)
+    load_time = time.perf_counter() - start
+
+    print(f"Рядків: {row_count}")
+    for label, elapsed in (("add_row", insert_time), ("to_dict", save_time), ("from_dict", load_time)):
+        print(f"{label:>10}: {elapsed:.2f} с ({elapsed / row_count * 1e6:.2f} мкс/рядок)")
+
+
+if __name__ == "__main__":
+    main()
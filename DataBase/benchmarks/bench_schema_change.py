@@ -0,0 +1,42 @@
+"""
+Вартість змін схеми великої таблиці: додавання та видалення колонки,
+початок зміни типу колонки (до повернення керування) та повне фонове перетворення.
+
+Запуск: python benchmarks/bench_schema_change.py [кількість рядків]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table import Table, VALIDATE_NONE
+from schema import Schema, Field
+
+
+def _timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Рядків: {row_count}")
+    for storage in ("rows", "columnar"):
+        table = Table("big", Schema([Field("id", int), Field("code", str)]), storage)
+        table.add_rows([{"id": i, "code": str(i)} for i in range(row_count)], VALIDATE_NONE)
+
+        _, add = _timed(table.add_column, Field("score", float), 0.0)
+        _, drop = _timed(table.drop_column, "score")
+        task, alter = _timed(table.alter_column_type, "code", int)
+        start = time.perf_counter()
+        task.wait()
+        convert = time.perf_counter() - start + alter
+        assert task.error is None and table.get_row(row_count - 1).data["code"] == row_count - 1
+        print(f"{storage:>9}: add_column {add * 1e3:8.2f} мс, drop_column {drop * 1e3:8.2f} мс, "
+              f"alter_column_type {alter * 1e3:8.2f} мс (перетворення {convert:.2f} с)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Генератор навантаження для сервера бази даних: конкурентні клієнтські завдання
+виконують суміш запитів (80% get_row, 10% find, 10% add_row) через пул з'єднань,
+звіт містить пропускну здатність і затримки p50/p99.
+Сервер запускається в окремому процесі на Unix-сокеті.
+
+Запуск: python benchmarks/bench_server.py [тривалість, с]
+"""
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from client import Client
+from database import Database
+from schema import Schema, Field
+from server import serve
+
+ROW_COUNT = 100_000
+SCENARIOS = ((1, 1), (1, 16), (4, 16), (4, 64))  # (з'єднань у пулі, конкурентних завдань)
+
+
+def _run_server(path, ready):
+    database = Database()
+    database.create_table("t", Schema([Field("id", int), Field("name", str)]))
+    database.tables["t"].add_rows([{"id": i, "name": f"name-{i}"} for i in range(ROW_COUNT)])
+    database.tables["t"].create_index("id")
+
+    async def run():
+        server = await serve(database, path=path)
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(run())
+
+
+async def _load(path, pool_size, concurrency, duration):
+    latencies = []
+    async with Client(path=path, pool_size=pool_size) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker(seed):
+            rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                choice = rng.random()
+                start = time.perf_counter()
+                if choice < 0.8:
+                    await client.get_row("t", rng.randrange(ROW_COUNT))
+                elif choice < 0.9:
+                    await client.find("t", "id", rng.randrange(ROW_COUNT))
+                else:
+                    await client.add_row("t", {"id": rng.randrange(ROW_COUNT), "name": "new"})
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker(seed) for seed in range(concurrency)))
+    latencies.sort()
+    return len(latencies) / duration, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "db.sock")
+        ready = multiprocessing.Event()
+        process = multiprocessing.Process(target=_run_server, args=(path, ready), daemon=True)
+        process.start()
+        ready.wait()
+        try:
+            print(f"Рядків: {ROW_COUNT}, тривалість кожного заміру: {duration} с")
+            for pool_size, concurrency in SCENARIOS:
+                rate, p50, p99 = asyncio.run(_load(path, pool_size, concurrency, duration))
+                print(f"з'єднань {pool_size}, завдань {concurrency:3}: {rate:8.0f} запитів/с, "
+                      f"p50 {p50 * 1e3:6.2f} мс, p99 {p99 * 1e3:6.2f} мс")
+        finally:
+            process.terminate()
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
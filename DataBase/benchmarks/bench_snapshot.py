@@ -0,0 +1,64 @@
+"""
+Вартість знімка бази даних: створення знімка, перша зміна таблиці після знімка
+(копіювання під час запису) та вставка рядків під час фонового збереження.
+
+Запуск: python benchmarks/bench_snapshot.py [кількість рядків]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from schema import Schema, Field
+from custom_types import RealInterval
+
+INSERTS = 100_000  # Кількість вставок для вимірювання під час збереження
+
+
+def _row(i):
+    return {"id": i, "score": i * 0.5, "name": f"name-{i}", "interval": RealInterval(i, i + 1)}
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    schema = Schema([Field("id", int), Field("score", float), Field("name", str), Field("interval", RealInterval)])
+    print(f"Рядків: {row_count}")
+    for storage in ("rows", "columnar"):
+        db = Database()
+        db.create_table("big", schema, storage)
+        table = db.tables["big"]
+        table.add_rows([_row(i) for i in range(row_count)])
+
+        start = time.perf_counter()
+        snapshot = db.snapshot()
+        snapshot_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        table.add_row(_row(row_count))
+        first_write = time.perf_counter() - start
+        del snapshot
+
+        batch = [_row(row_count + 1 + i) for i in range(INSERTS)]
+        start = time.perf_counter()
+        for data in batch:
+            table.add_row(data)
+        alone = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            saver = db.save_to_disk(os.path.join(directory, "big.json"), background=True)
+            for data in batch:
+                table.add_row(data)
+            during_save = time.perf_counter() - start
+            saver.join()
+            save_time = time.perf_counter() - start
+        print(f"{storage:>9}: знімок {snapshot_time * 1e6:.0f} мкс, перша зміна після знімка {first_write * 1e3:.1f} мс; "
+              f"{INSERTS} вставок: {alone:.2f} с без збереження, {during_save:.2f} с під час фонового збереження "
+              f"(збереження завершилось за {save_time:.2f} с)")
+
+
+if __name__ == "__main__":
+    main()
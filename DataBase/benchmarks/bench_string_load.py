@@ -0,0 +1,45 @@
+"""
+Швидкість завантаження таблиці з переважно рядковими колонками з JSON-файлу:
+повне завантаження (Database.load_from_disk) та потоковий перегляд рядків (Database.iter_rows).
+
+Запуск: python benchmarks/bench_string_load.py [кількість рядків]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from schema import Schema, Field
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    schema = Schema([Field("id", int)] + [Field(f"text{i}", str) for i in range(6)] + [Field("grade", "char")])
+    db = Database()
+    db.create_table("strings", schema)
+    db.tables["strings"].add_rows([dict({"id": i, "grade": "B"}, **{f"text{j}": f"value {i} {j}" for j in range(6)})
+                                   for i in range(row_count)])
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "strings.json")
+        db.save_to_disk(filename)
+
+        start = time.perf_counter()
+        Database().load_from_disk(filename)
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in Database.iter_rows(filename, "strings"):
+            pass
+        iter_time = time.perf_counter() - start
+
+    print(f"Рядків: {row_count}")
+    for label, elapsed in (("load", load_time), ("iter_rows", iter_time)):
+        print(f"{label:>10}: {elapsed:.2f} с ({elapsed / row_count * 1e6:.2f} мкс/рядок)")
+
+
+if __name__ == "__main__":
+    main()
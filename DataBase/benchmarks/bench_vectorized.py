@@ -0,0 +1,76 @@
+"""
+Порівняння агрегатів і фільтрів: чистий Python проти NumPy
+для колонкової таблиці з 1 000 000 рядків.
+
+Запуск: python benchmarks/bench_vectorized.py [кількість рядків]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vectorized
+from table import Table
+from schema import Schema, Field
+from custom_types import RealInterval
+
+
+def build_table(row_count):
+    schema = Schema([
+        Field("id", int),
+        Field("score", float),
+        Field("group", str),
+        Field("interval", RealInterval)
+    ])
+    table = Table("bench", schema, storage="columnar")
+    columns = {
+        "id": range(row_count),
+        "score": [i * 0.25 for i in range(row_count)],
+        "group": ["abcdefgh"[i % 8] for i in range(row_count)],
+        "interval": [RealInterval(i, i + i % 7) for i in range(row_count)]
+    }
+    table.rows.extend_columns({name: list(values) for name, values in columns.items()})
+    return table
+
+
+OPERATIONS = [
+    ("sum(score)", lambda table, mode: vectorized.aggregate(table, "score", "sum", use_numpy=mode)),
+    ("mean(id)", lambda table, mode: vectorized.aggregate(table, "id", "mean", use_numpy=mode)),
+    ("max(interval.length)", lambda table, mode: vectorized.aggregate(
+        table, "interval", "max", part="length", use_numpy=mode)),
+    ("histogram(score)", lambda table, mode: vectorized.histogram(table, "score", 20, use_numpy=mode)),
+    ("score > x", lambda table, mode: vectorized.filter_mask(table, "score", ">", 1000.0, use_numpy=mode)),
+    ("group_by(group, sum(id))", lambda table, mode: vectorized.group_by(
+        table, "group", "id", "sum", use_numpy=mode)),
+]
+
+
+def timed(operation, table, mode):
+    start = time.perf_counter()
+    operation(table, mode)
+    return time.perf_counter() - start
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    table = build_table(row_count)
+    print(f"Рядків: {row_count}, NumPy: {'так' if vectorized.HAS_NUMPY else 'ні'}")
+
+    # Базовий варіант: цикл по словниках Row.data
+    rows = [{"score": value} for value in table.column("score")]
+    start = time.perf_counter()
+    sum(row["score"] for row in rows)
+    print(f"{'sum(score) по Row.data':>26}: Python {(time.perf_counter() - start) * 1000:8.1f} мс")
+
+    for label, operation in OPERATIONS:
+        python_time = timed(operation, table, False)
+        line = f"{label:>26}: Python {python_time * 1000:8.1f} мс"
+        if vectorized.HAS_NUMPY:
+            numpy_time = timed(operation, table, True)
+            line += f", NumPy {numpy_time * 1000:7.1f} мс, x{python_time / numpy_time:.0f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
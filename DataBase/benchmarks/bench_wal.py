@@ -0,0 +1,63 @@
+"""
+Вартість збереження невеликих змін у великій базі: повний перезапис (save_to_disk)
+проти журналу змін (open_log) з груповим fsync, а також час контрольної точки та відтворення.
+
+Запуск: python benchmarks/bench_wal.py [кількість рядків] [кількість змін]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from schema import Schema, Field
+from custom_types import RealInterval
+
+
+def _row(i):
+    return {"id": i, "name": f"name-{i}", "interval": RealInterval(i, i + 1)}
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    edit_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    db = Database()
+    db.create_table("big", Schema([Field("id", int), Field("name", str), Field("interval", RealInterval)]))
+    db.tables["big"].add_rows([_row(i) for i in range(row_count)])
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "big.json")
+        start = time.perf_counter()
+        db.save_to_disk(filename)
+        full_save = time.perf_counter() - start
+
+        db.open_log(filename)
+        start = time.perf_counter()
+        for i in range(edit_count):
+            db.tables["big"].add_row(_row(row_count + i))
+        db.log.sync()
+        logged = time.perf_counter() - start
+        syncs = db.log.syncs
+
+        start = time.perf_counter()
+        Database().load_from_disk(filename)
+        replay_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        db.checkpoint(background=True)
+        checkpoint_call = time.perf_counter() - start
+        db.wait_checkpoint()
+        checkpoint_total = time.perf_counter() - start
+        db.close_log()
+
+    print(f"Рядків: {row_count}, змін: {edit_count}")
+    print(f"повний перезапис:           {full_save * 1e3:9.1f} мс на одне збереження")
+    print(f"журнал (add_row + запис):   {logged / edit_count * 1e6:9.1f} мкс на зміну, fsync: {syncs}")
+    print(f"завантаження з журналом:    {replay_load:9.2f} с")
+    print(f"контрольна точка:           {checkpoint_call:9.2f} с блокування, {checkpoint_total:.2f} с усього")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+import json
+import struct
+import sys
+from array import array
+from table import Table
+from custom_types import PictureFile, RealInterval
+
+# Заголовок файлу: сигнатура, версія формату, кількість таблиць
+MAGIC = b"LABDB"
+VERSION = 1
+HEADER = struct.Struct("<5sHI")
+BLOCK_LENGTH = struct.Struct("<Q")  # Довжина блоку таблиці
+META_LENGTH = struct.Struct("<I")  # Довжина метаданих таблиці
+
+BINARY_EXTENSION = ".ldb"
+
+
+def _to_little_endian(values):
+    """
+    Байти масиву у порядку little-endian.
+    :param values: Об'єкт array.
+    :return: Байти.
+    """
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode, data):
+    """
+    Відновлення масиву з байтів у порядку little-endian.
+    :param typecode: Код типу array.
+    :param data: Байти.
+    :return: Об'єкт array.
+    """
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _encode_column(type_name, values, blobs=None):
+    """
+    Кодування колонки значень у байти.
+    :param type_name: Назва типу поля ("int", "float", ...).
+    :param values: Послідовність значень колонки.
+    :param blobs: Сховище BlobStore; якщо задано, зображення записуються як хеші вмісту.
+    :return: Список частин у байтах.
+    """
+    if type_name == "int":
+        return [_to_little_endian(array('q', values))]
+    elif type_name == "float":
+        return [_to_little_endian(array('d', values))]
+    elif type_name == "realInvl":
+        starts = array('d', [value.start for value in values])
+        ends = array('d', [value.end for value in values])
+        return [_to_little_endian(starts), _to_little_endian(ends)]
+    elif type_name == "picture" and blobs is not None:
+        return _encode_column("str", [blobs.put_picture(value) for value in values])
+    elif type_name == "picture":
+        # Довжини у байтах, далі сирі дані зображень без base64
+        views = [value.view for value in values]
+        lengths = array('q', [view.nbytes for view in views])
+        return [_to_little_endian(lengths)] + views
+    elif type_name in ("str", "char"):
+        # Довжини у символах, далі весь текст колонки одним блоком UTF-8
+        lengths = array('I', [len(value) for value in values])
+        text = "".join(values).encode("utf-8")
+        return [_to_little_endian(lengths), META_LENGTH.pack(len(text)), text]
+    raise ValueError(f"Невідомий тип даних: {type_name}")
+
+
+def _decode_column(type_name, buffer, offset, count, zero_copy=False, blobs=None):
+    """
+    Декодування колонки з буфера.
+    :param type_name: Назва типу поля.
+    :param buffer: Байти або memoryview з даними.
+    :param offset: Зміщення початку колонки.
+    :param count: Кількість рядків.
+    :param zero_copy: Якщо True, зображення посилаються на зрізи буфера без копіювання.
+    :param blobs: Сховище BlobStore, якщо зображення записані як хеші вмісту.
+    :return: Кортеж (значення колонки, нове зміщення).
+    """
+    if type_name in ("int", "float"):
+        typecode = 'q' if type_name == "int" else 'd'
+        end = offset + 8 * count
+        return _from_little_endian(typecode, buffer[offset:end]), end
+    elif type_name == "realInvl":
+        middle = offset + 8 * count
+        end = middle + 8 * count
+        starts = _from_little_endian('d', buffer[offset:middle])
+        ends = _from_little_endian('d', buffer[middle:end])
+        return [RealInterval(start, stop) for start, stop in zip(starts, ends)], end
+    elif type_name == "picture" and blobs is not None:
+        digests, end = _decode_column("str", buffer, offset, count)
+        return [blobs.picture(digest) for digest in digests], end
+    elif type_name == "picture":
+        position = offset + 8 * count
+        lengths = _from_little_endian('q', buffer[offset:position])
+        values = []
+        for length in lengths:
+            if zero_copy:
+                values.append(PictureFile.from_buffer(buffer[position:position + length]))
+            else:
+                values.append(PictureFile(data=bytes(buffer[position:position + length])))
+            position += length
+        return values, position
+    elif type_name in ("str", "char"):
+        position = offset + 4 * count
+        lengths = _from_little_endian('I', buffer[offset:position])
+        (text_length,) = META_LENGTH.unpack_from(buffer, position)
+        position += META_LENGTH.size
+        text = bytes(buffer[position:position + text_length]).decode("utf-8")
+        values = []
+        start = 0
+        for length in lengths:
+            values.append(text[start:start + length])
+            start += length
+        return values, position + text_length
+    raise ValueError(f"Невідомий тип даних: {type_name}")
+
+
+def encode_meta(table, blobs=None):
+    """
+    Кодування метаданих таблиці (початок блоку перед колонками).
+    :param table: Об'єкт Table.
+    :param blobs: Сховище BlobStore для зображень (None - зображення всередині блоку).
+    :return: Байти довжини та метаданих у JSON.
+    """
+    meta = {
+        "name": table.name,
+        "schema": table.schema.to_dict(),
+        "storage": table.storage,
+        "indexes": table.index_definitions(),
+        "row_count": len(table.rows),
+        "blobs": blobs is not None,
+        "lsn": table.lsn,
+        "ids": not table.rows.ids_are_positions(),  # Блок ідентифікаторів рядків після колонок
+        "next_id": table.rows.next_id
+    }
+    meta_bytes = json.dumps(meta).encode("utf-8")
+    return META_LENGTH.pack(len(meta_bytes)) + meta_bytes
+
+
+def encode_column(table, field, blobs=None):
+    """
+    Кодування однієї колонки таблиці.
+    :param table: Об'єкт Table.
+    :param field: Поле схеми (Field).
+    :param blobs: Сховище BlobStore для зображень.
+    :return: Список частин у байтах.
+    """
+    if field.dictionary:
+        # Розмір словника, значення словника, далі 32-бітні коди рядків
+        dictionary, codes = table.dictionary_codes(field.name)
+        return ([META_LENGTH.pack(len(dictionary))] + _encode_column(field.type_name, dictionary)
+                + [_to_little_endian(array('i', codes))])
+    return _encode_column(field.type_name, table.column(field.name), blobs)
+
+
+def _decode_dictionary_column(type_name, buffer, offset, count):
+    """
+    Декодування колонки зі словниковим кодуванням (див. encode_column).
+    Рядки отримують спільні об'єкти значень словника.
+    :return: Кортеж (значення колонки, нове зміщення).
+    """
+    (size,) = META_LENGTH.unpack_from(buffer, offset)
+    dictionary, offset = _decode_column(type_name, buffer, offset + META_LENGTH.size, size)
+    end = offset + 4 * count
+    codes = _from_little_endian('i', buffer[offset:end])
+    return list(map(dictionary.__getitem__, codes)), end
+
+
+def encode_ids(table):
+    """
+    Кодування ідентифікаторів рядків (лише якщо вони відрізняються від позицій).
+    :param table: Об'єкт Table.
+    :return: Список частин у байтах (порожній, якщо блок не потрібен).
+    """
+    if table.rows.ids_are_positions():
+        return []
+    return _encode_column("int", table.rows.live_ids())
+
+
+def encode_table(table, blobs=None):
+    """
+    Кодування таблиці у блок байтів: метадані (JSON) та колонки.
+    :param table: Об'єкт Table.
+    :param blobs: Сховище BlobStore для зображень (None - зображення всередині блоку).
+    :return: Байти блоку таблиці.
+    """
+    parts = [encode_meta(table, blobs)]
+    for field in table.schema.fields:
+        parts.extend(encode_column(table, field, blobs))
+    parts.extend(encode_ids(table))
+    return b"".join(parts)
+
+
+def _read_meta(buffer, offset):
+    """
+    Читання метаданих таблиці на початку блоку.
+    :param buffer: Байти або memoryview з блоком.
+    :param offset: Зміщення початку блоку.
+    :return: Кортеж (словник метаданих, зміщення першої колонки).
+    """
+    (meta_length,) = META_LENGTH.unpack_from(buffer, offset)
+    offset += META_LENGTH.size
+    meta = json.loads(bytes(buffer[offset:offset + meta_length]).decode("utf-8"))
+    return meta, offset + meta_length
+
+
+def decode_table(buffer, offset=0, zero_copy=False, blobs=None):
+    """
+    Декодування блоку таблиці.
+    :param buffer: Байти або memoryview з блоком.
+    :param offset: Зміщення початку блоку.
+    :param zero_copy: Якщо True, зображення не копіюються з буфера.
+    :param blobs: Сховище BlobStore, якщо зображення таблиці збережені в ньому.
+    :return: Об'єкт Table.
+    """
+    meta, offset = _read_meta(buffer, offset)
+    if not meta.get("blobs"):
+        blobs = None
+    elif blobs is None:
+        raise ValueError(f"Для таблиці '{meta['name']}' потрібне сховище зображень.")
+    table = Table.from_dict({
+        "name": meta["name"],
+        "schema": meta["schema"],
+        "storage": meta["storage"],
+        "lsn": meta.get("lsn", 0),
+        "rows": []
+    })
+    count = meta["row_count"]
+    columns = {}
+    for field_meta in meta["schema"]["fields"]:
+        if field_meta.get("dictionary"):
+            columns[field_meta["name"]], offset = _decode_dictionary_column(
+                field_meta["data_type"], buffer, offset, count)
+        else:
+            columns[field_meta["name"]], offset = _decode_column(
+                field_meta["data_type"], buffer, offset, count, zero_copy, blobs)
+    table.rows.extend_columns(columns)
+    ids = None
+    if meta.get("ids"):
+        ids, offset = _decode_column("int", buffer, offset, count)
+    table.rows.assign_ids(ids, meta.get("next_id"))
+    for definition in meta.get("indexes", []):
+        table.create_index(definition["column"], definition["kind"])
+    return table
+
+
+def dump(tables, file, blobs=None):
+    """
+    Запис таблиць у бінарний файл.
+    :param tables: Словник {назва: Table}.
+    :param file: Файл, відкритий у режимі 'wb'.
+    :param blobs: Сховище BlobStore для зображень.
+    """
+    write_blocks((encode_table(table, blobs) for table in tables.values()), len(tables), file)
+
+
+def write_blocks(blocks, count, file):
+    """
+    Запис заголовка файлу та вже закодованих блоків таблиць.
+    :param blocks: Ітерований набір блоків (результатів encode_table).
+    :param count: Кількість блоків.
+    :param file: Файл, відкритий у режимі 'wb'.
+    """
+    file.write(HEADER.pack(MAGIC, VERSION, count))
+    for block in blocks:
+        file.write(BLOCK_LENGTH.pack(len(block)))
+        file.write(block)
+
+
+def _check_header(header):
+    """
+    Перевірка заголовка файлу.
+    :param header: Байти заголовка.
+    :return: Кількість таблиць у файлі.
+    """
+    magic, version, table_count = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Файл не є бінарною базою даних.")
+    if version > VERSION:
+        raise ValueError(f"Непідтримувана версія формату: {version}")
+    return table_count
+
+
+def index_tables(buffer):
+    """
+    Побудова індексу блоків таблиць без декодування колонок.
+    :param buffer: Байти або memoryview з усім файлом.
+    :return: Словник {назва таблиці: зміщення блоку}.
+    """
+    table_count = _check_header(bytes(buffer[:HEADER.size]))
+    offsets = {}
+    offset = HEADER.size
+    for _ in range(table_count):
+        (block_length,) = BLOCK_LENGTH.unpack_from(buffer, offset)
+        offset += BLOCK_LENGTH.size
+        meta, _ = _read_meta(buffer, offset)
+        offsets[meta["name"]] = offset
+        offset += block_length
+    return offsets
+
+
+def load(file, blobs=None):
+    """
+    Читання таблиць з бінарного файлу.
+    :param file: Файл, відкритий у режимі 'rb'.
+    :param blobs: Сховище BlobStore для зображень.
+    :return: Словник {назва: Table}.
+    """
+    table_count = _check_header(file.read(HEADER.size))
+    tables = {}
+    for _ in range(table_count):
+        (block_length,) = BLOCK_LENGTH.unpack(file.read(BLOCK_LENGTH.size))
+        table = decode_table(memoryview(file.read(block_length)), blobs=blobs)
+        tables[table.name] = table
+    return tables
+
+
+def is_binary_file(filename):
+    """
+    Перевірка, чи файл записаний у бінарному форматі.
+    :param filename: Ім'я файлу.
+    :return: True, якщо файл починається з сигнатури формату.
+    """
+    with open(filename, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
@@ -0,0 +1,157 @@
+import hashlib
+import mmap
+import os
+import tempfile
+from custom_types import PictureFile
+
+BLOB_SUFFIX = ".blobs"  # Каталог сховища поруч із файлом бази даних
+
+
+def blob_directory(filename):
+    """
+    Каталог сховища зображень для файлу бази даних.
+    :param filename: Ім'я файлу бази даних.
+    :return: Шлях до каталогу.
+    """
+    return filename + BLOB_SUFFIX
+
+
+class BlobStore:
+    def __init__(self, directory, use_mmap=False):
+        """
+        Сховище байтів зображень, адресоване хешем вмісту (SHA-256).
+        Однакові зображення зберігаються один раз: <каталог>/<2 символи хешу>/<хеш>.
+        :param directory: Каталог сховища (створюється при першому записі).
+        :param use_mmap: Відображати файли у пам'ять замість читання при доступі через view.
+        """
+        self.directory = os.path.abspath(directory)
+        self.use_mmap = use_mmap
+        self.referenced = set()  # Хеші, на які посилались під час збереження
+
+    def path(self, digest):
+        """
+        Шлях до файлу з байтами.
+        :param digest: Хеш вмісту.
+        :return: Шлях до файлу.
+        """
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def __contains__(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def _write(self, digest, data):
+        """
+        Атомарний запис байтів: тимчасовий файл у тому ж каталозі та перейменування.
+        """
+        folder = os.path.dirname(self.path(digest))
+        os.makedirs(folder, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=folder)
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, self.path(digest))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def put(self, data):
+        """
+        Додавання байтів у сховище (повторний запис того самого вмісту не виконується).
+        :param data: Байти або memoryview.
+        :return: Хеш вмісту.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self:
+            self._write(digest, data)
+        self.referenced.add(digest)
+        return digest
+
+    def put_picture(self, picture):
+        """
+        Додавання зображення у сховище. Зображення, вже прочитані з цього сховища,
+        не читаються і не хешуються повторно.
+        :param picture: Об'єкт PictureFile.
+        :return: Хеш вмісту.
+        """
+        digest = picture.digest
+        if digest not in self.referenced:
+            if not (picture.blob and picture.blob[0].directory == self.directory) and digest not in self:
+                self._write(digest, picture.view)
+            self.referenced.add(digest)
+        return digest
+
+    def read(self, digest):
+        """
+        Читання байтів зі сховища.
+        :param digest: Хеш вмісту.
+        :return: Байти.
+        """
+        with open(self.path(digest), 'rb') as file:
+            return file.read()
+
+    def view(self, digest):
+        """
+        Доступ до байтів через memoryview (з mmap, якщо увімкнено use_mmap).
+        :param digest: Хеш вмісту.
+        :return: Об'єкт memoryview.
+        """
+        if not self.use_mmap:
+            return memoryview(self.read(digest))
+        with open(self.path(digest), 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return memoryview(b"")  # Порожній файл не можна відобразити у пам'ять
+            return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def picture(self, digest):
+        """
+        Зображення, байти якого читаються зі сховища лише при зверненні.
+        :param digest: Хеш вмісту.
+        :return: Об'єкт PictureFile.
+        """
+        return PictureFile.from_blob(self, digest)
+
+    def encode_picture(self, picture):
+        """
+        Збереження зображення у сховищі та посилання на нього для рядка JSON.
+        :param picture: Об'єкт PictureFile.
+        :return: Словник {"blob": хеш}.
+        """
+        return {"blob": self.put_picture(picture)}
+
+    def decode_picture(self, value):
+        """
+        Відновлення зображення з посилання або (для старих файлів) з base64.
+        :param value: Словник {"blob": хеш} або рядок base64.
+        :return: Об'єкт PictureFile.
+        """
+        if isinstance(value, dict):
+            return PictureFile.from_blob(self, value["blob"])
+        return PictureFile.from_base64(value)
+
+    def digests(self):
+        """
+        Хеші всіх збережених об'єктів.
+        :return: Генератор хешів.
+        """
+        if not os.path.isdir(self.directory):
+            return
+        for folder in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, folder)
+            if os.path.isdir(path):
+                for name in sorted(os.listdir(path)):
+                    if name.startswith(folder) and len(name) == 64:
+                        yield name
+
+    def collect_garbage(self, keep=None):
+        """
+        Видалення об'єктів, на які немає посилань.
+        :param keep: Множина хешів, що використовуються (за замовчуванням - referenced).
+        :return: Кількість видалених об'єктів.
+        """
+        keep = self.referenced if keep is None else keep
+        removed = 0
+        for digest in list(self.digests()):
+            if digest not in keep:
+                os.remove(self.path(digest))
+                removed += 1
+        return removed
@@ -0,0 +1,158 @@
+import io
+import threading
+from collections import OrderedDict
+
+PICTURE_CACHE_BUDGET = 64 * 2 ** 20  # Бюджет спільного кешу зображень, байт
+
+
+class LRUCache:
+    def __init__(self, budget):
+        """
+        Кеш з обмеженням за розміром у байтах та витісненням найдавніше використаних записів.
+        :param budget: Максимальний сумарний розмір записів, байт.
+        """
+        self.budget = budget
+        self.size = 0  # Поточний сумарний розмір записів
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # {ключ: (значення, розмір)}, від найдавнішого до найновішого
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Значення за ключем; запис стає найновішим.
+        :param key: Ключ.
+        :param default: Значення, якщо ключа немає.
+        :return: Значення з кешу або default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size=None):
+        """
+        Додавання або заміна запису. Запис, більший за весь бюджет, не зберігається.
+        :param key: Ключ.
+        :param value: Значення.
+        :param size: Розмір значення у байтах (за замовчуванням len(value)).
+        :return: Значення.
+        """
+        size = len(value) if size is None else size
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            if size <= self.budget:
+                self._entries[key] = (value, size)
+                self.size += size
+                self._evict()
+        return value
+
+    def get_or_create(self, key, factory, size=None):
+        """
+        Значення з кешу або створене функцією factory (і додане в кеш).
+        :param key: Ключ.
+        :param factory: Функція без аргументів, що створює значення.
+        :param size: Функція, що повертає розмір значення (за замовчуванням len).
+        :return: Значення.
+        """
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value, None if size is None else size(value))
+        return value
+
+    def _evict(self):
+        while self.size > self.budget:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def resize(self, budget):
+        """
+        Зміна бюджету; зайві записи витісняються одразу.
+        :param budget: Новий бюджет, байт.
+        """
+        with self._lock:
+            self.budget = budget
+            self._evict()
+
+    def discard(self, key):
+        """
+        Видалення запису, якщо він є.
+        :param key: Ключ.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry[1]
+
+    def clear(self):
+        """
+        Очищення кешу та лічильників.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = self.hits = self.misses = self.evictions = 0
+
+    def after_fork(self):
+        """
+        Нове блокування в дочірньому процесі після fork: потік, що міг утримувати
+        старе блокування в момент fork, у дочірньому процесі не існує.
+        """
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Статистика використання кешу.
+        :return: Словник з кількістю влучань, промахів, витіснень, записів та розміром.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size": self.size,
+            "budget": self.budget
+        }
+
+
+# Спільний для процесу кеш: байти зображень (за хешем або текстом base64) та декодовані зображення
+picture_cache = LRUCache(PICTURE_CACHE_BUDGET)
+
+
+def _image_size(image):
+    return image.width * image.height * len(image.getbands())
+
+
+def picture_image(picture, max_size=None):
+    """
+    Декодоване зображення PIL (за потреби зменшене) з кешу за хешем вмісту.
+    Повторний перегляд того самого зображення не декодує його знову і не звертається до диска.
+    :param picture: Об'єкт PictureFile.
+    :param max_size: Пара (ширина, висота) для мініатюри або None - повний розмір.
+    :return: Об'єкт PIL.Image.Image.
+    """
+    from PIL import Image  # Pillow потрібен лише для показу зображень
+
+    def decode():
+        image = Image.open(io.BytesIO(picture.view))
+        image.load()
+        if max_size is not None:
+            image.thumbnail(max_size)
+        return image
+
+    key = ("image", picture.digest, max_size)
+    return picture_cache.get_or_create(key, decode, _image_size)
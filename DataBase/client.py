@@ -0,0 +1,336 @@
+import asyncio
+import itertools
+from protocol import read_frame, write_frame, value_codecs, condition_codecs, raise_error
+from schema import Schema
+
+MAX_IN_FLIGHT = 64  # Найбільша кількість запитів без відповіді на одне з'єднання
+STREAM_BUFFER = 4  # Кількість кадрів потокового результату, що чекають на читання
+
+
+class Connection:
+    def __init__(self, reader, writer, max_in_flight=MAX_IN_FLIGHT):
+        """
+        З'єднання з сервером з конвеєром запитів: запити надсилаються, не чекаючи
+        відповідей на попередні, а фонове завдання розподіляє відповіді за ідентифікаторами.
+        :param reader: Об'єкт asyncio.StreamReader.
+        :param writer: Об'єкт asyncio.StreamWriter.
+        :param max_in_flight: Найбільша кількість запитів без відповіді (далі запит чекає).
+        """
+        self.reader = reader
+        self.writer = writer
+        self._ids = itertools.count(1)
+        self._pending = {}  # {ідентифікатор: Future або Queue потокового результату (None - відкинути)}
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._receiver = asyncio.create_task(self._receive())
+
+    @property
+    def load(self):
+        """
+        Кількість запитів без відповіді.
+        """
+        return len(self._pending)
+
+    async def _receive(self):
+        error = ConnectionError("З'єднання з сервером закрито.")
+        try:
+            while True:
+                message = await read_frame(self.reader)
+                if message is None:
+                    break
+                request_id = message.get("id")
+                if request_id not in self._pending:
+                    if "error" in message:
+                        error = ConnectionError(message["error"])  # Помилка всього з'єднання
+                    continue
+                target = self._pending[request_id]
+                final = "rows" not in message or "result" in message
+                if final:
+                    del self._pending[request_id]
+                if isinstance(target, asyncio.Queue):
+                    # Черга обмежена: поки користувач не прочитає результат, з'єднання не читається далі,
+                    # і сервер чекає (зворотний тиск через TCP). Тому потоковий запит
+                    # виконується на окремому з'єднанні (див. Client.query)
+                    await target.put(message)
+                elif target is not None:
+                    target.set_result(message)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as failure:
+            error = ConnectionError(str(failure))
+        finally:
+            for target in self._pending.values():
+                if isinstance(target, asyncio.Queue):
+                    target.put_nowait({"error": str(error), "type": "ConnectionError"})
+                elif target is not None and not target.done():
+                    target.set_exception(error)
+            self._pending.clear()
+
+    async def _send(self, message, target):
+        request_id = next(self._ids)
+        if self._receiver.done():
+            raise ConnectionError("З'єднання з сервером закрито.")
+        write_frame(self.writer, dict(message, id=request_id))  # Помилка кодування - до реєстрації запиту
+        self._pending[request_id] = target
+        try:
+            await self.writer.drain()
+        except BaseException:
+            self._pending.pop(request_id, None)
+            raise
+        return request_id
+
+    async def request(self, message):
+        """
+        Виконання запиту.
+        :param message: Словник з полем "op" та параметрами операції.
+        :return: Поле "result" відповіді.
+        """
+        async with self._slots:
+            future = asyncio.get_running_loop().create_future()
+            await self._send(message, future)
+            response = await future
+        if "error" in response:
+            raise_error(response)
+        return response["result"]
+
+    async def stream(self, message):
+        """
+        Виконання запиту з потоковим результатом. Поки результат не прочитано,
+        з'єднання не отримує відповідей на інші запити, тож воно не повинно
+        використовуватися іншими запитами до кінця потоку.
+        :param message: Словник запиту "query".
+        :return: Асинхронний генератор рядків у вигляді для передачі.
+        """
+        async with self._slots:
+            queue = asyncio.Queue(STREAM_BUFFER)
+            request_id = await self._send(message, queue)
+            finished = False
+            try:
+                while not finished:
+                    response = await queue.get()
+                    if "error" in response:
+                        finished = True
+                        raise_error(response)
+                    finished = "result" in response
+                    for row in response["rows"]:
+                        yield row
+            finally:
+                if not finished and request_id in self._pending:
+                    # Результат прочитано не до кінця: решта кадрів відкидається
+                    self._pending[request_id] = None
+                    while not queue.empty():
+                        queue.get_nowait()
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._receiver
+
+
+class Client:
+    def __init__(self, host="127.0.0.1", port=8765, path=None, pool_size=4, max_in_flight=MAX_IN_FLIGHT):
+        """
+        Асинхронний клієнт сервера бази даних з пулом з'єднань: кожен запит
+        надсилається найменш завантаженим з'єднанням. Запити, виконані конкурентно,
+        можуть потрапити на різні з'єднання, тож порядок виконується лише для
+        запитів, що чекають на відповідь попереднього.
+        Значення передаються у типах схеми (PictureFile, RealInterval).
+        :param host: Адреса сервера.
+        :param port: Порт сервера.
+        :param path: Шлях до Unix-сокета (замість TCP).
+        :param pool_size: Кількість з'єднань.
+        :param max_in_flight: Найбільша кількість запитів без відповіді на з'єднання.
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.pool_size = pool_size
+        self.max_in_flight = max_in_flight
+        self.connections = []
+        self._stream_connections = []  # Вільні з'єднання для потокових запитів
+        self._schemas = {}  # Кеш схем таблиць для перетворення значень: {назва: Future зі схемою}
+
+    async def connect(self):
+        """
+        Відкриття з'єднань пулу.
+        """
+        for _ in range(self.pool_size - len(self.connections)):
+            self.connections.append(await self._open())
+        return self
+
+    async def _open(self):
+        if self.path is not None:
+            reader, writer = await asyncio.open_unix_connection(self.path)
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        return Connection(reader, writer, self.max_in_flight)
+
+    async def close(self):
+        """
+        Закриття всіх з'єднань.
+        """
+        connections = self.connections + self._stream_connections
+        self.connections, self._stream_connections = [], []
+        for connection in connections:
+            await connection.close()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _connection(self):
+        if not self.connections:
+            raise ConnectionError("Клієнт не підключено (викличте connect).")
+        return min(self.connections, key=lambda connection: connection.load)
+
+    async def _request(self, op, **fields):
+        return await self._connection().request(dict(fields, op=op))
+
+    async def schema(self, table):
+        """
+        Схема таблиці (кешується).
+        :param table: Назва таблиці.
+        :return: Об'єкт Schema.
+        """
+        if table not in self._schemas:
+            # Одночасні звернення чекають на один і той самий запит схеми
+            self._schemas[table] = asyncio.ensure_future(self._fetch_schema(table))
+        try:
+            return await asyncio.shield(self._schemas[table])
+        except Exception:
+            self._schemas.pop(table, None)
+            raise
+
+    async def _fetch_schema(self, table):
+        return Schema.from_dict(await self._request("schema", table=table))
+
+    async def _codec(self, table, encode):
+        return value_codecs(await self.schema(table), encode)
+
+    async def _where(self, table, where):
+        encode = condition_codecs(await self.schema(table), encode=True)
+        return [[column, op, encode(column, op, value)] for column, op, value in where]
+
+    async def tables(self):
+        """
+        Назви таблиць бази даних.
+        """
+        return await self._request("tables")
+
+    async def create_table(self, table, schema, storage="rows"):
+        """
+        Створення таблиці.
+        :param table: Назва таблиці.
+        :param schema: Об'єкт Schema.
+        :param storage: Тип сховища ("rows" або "columnar").
+        """
+        await self._request("create_table", table=table, schema=schema.to_dict(), storage=storage)
+        self._schemas[table] = asyncio.get_running_loop().create_future()
+        self._schemas[table].set_result(schema)
+
+    async def delete_table(self, table):
+        """
+        Видалення таблиці.
+        :param table: Назва таблиці.
+        """
+        self._schemas.pop(table, None)
+        await self._request("delete_table", table=table)
+
+    async def add_row(self, table, data):
+        """
+        Додавання рядка.
+        :param table: Назва таблиці.
+        :param data: Словник значень рядка.
+        """
+        encode = await self._codec(table, encode=True)
+        await self._request("add_row", table=table, data=encode(data))
+
+    async def add_rows(self, table, rows):
+        """
+        Додавання кількох рядків одним запитом (атомарно).
+        :param table: Назва таблиці.
+        :param rows: Список словників значень.
+        """
+        encode = await self._codec(table, encode=True)
+        await self._request("add_rows", table=table, rows=[encode(data) for data in rows])
+
+    async def edit_row(self, table, index, data):
+        """
+        Редагування рядка.
+        :param table: Назва таблиці.
+        :param index: Індекс рядка.
+        :param data: Нові значення рядка.
+        """
+        encode = await self._codec(table, encode=True)
+        await self._request("edit_row", table=table, index=index, data=encode(data))
+
+    async def delete_row(self, table, index):
+        """
+        Видалення рядка.
+        :param table: Назва таблиці.
+        :param index: Індекс рядка.
+        """
+        await self._request("delete_row", table=table, index=index)
+
+    async def get_row(self, table, index):
+        """
+        Отримання рядка за індексом.
+        :param table: Назва таблиці.
+        :param index: Індекс рядка.
+        :return: Словник значень рядка.
+        """
+        decode = await self._codec(table, encode=False)
+        return decode(await self._request("get_row", table=table, index=index))
+
+    async def find(self, table, column, value):
+        """
+        Позиції рядків із заданим значенням колонки (див. Table.find).
+        """
+        encode = condition_codecs(await self.schema(table), encode=True)
+        return await self._request("find", table=table, column=column, value=encode(column, "==", value))
+
+    async def count(self, table, where=()):
+        """
+        Кількість рядків, що відповідають умовам.
+        :param table: Назва таблиці.
+        :param where: Список умов (колонка, оператор, значення у типах схеми).
+        :return: Кількість рядків.
+        """
+        return await self._request("count", table=table, where=await self._where(table, where))
+
+    async def query(self, table, where=(), select=None, order_by=None, descending=False, limit=None, offset=0):
+        """
+        Потоковий запит: рядки надходять кадрами, поки їх читають. Запит виконується
+        на окремому з'єднанні, тож інші запити (зокрема під час читання результату)
+        не чекають на повільного читача.
+        :param table: Назва таблиці.
+        :param where: Список умов (колонка, оператор, значення у типах схеми).
+        :param select: Список колонок (None - усі).
+        :param order_by: Колонка сортування.
+        :param descending: Сортування за спаданням.
+        :param limit: Найбільша кількість рядків.
+        :param offset: Кількість пропущених рядків.
+        :return: Асинхронний генератор словників.
+        """
+        decode = await self._codec(table, encode=False)
+        message = {"op": "query", "table": table, "where": await self._where(table, where),
+                   "select": select, "order_by": order_by, "descending": descending,
+                   "limit": limit, "offset": offset}
+        if not self.connections:
+            raise ConnectionError("Клієнт не підключено (викличте connect).")
+        connection = self._stream_connections.pop() if self._stream_connections else await self._open()
+        stream = connection.stream(message)
+        finished = False
+        try:
+            async for row in stream:
+                yield decode(row)
+            finished = True
+        finally:
+            await stream.aclose()
+            if finished and self.connections and len(self._stream_connections) < self.pool_size:
+                self._stream_connections.append(connection)
+            else:
+                # Недочитаний результат ще надходить (або вільних з'єднань достатньо) - з'єднання закривається
+                await connection.close()
@@ -1,35 +1,140 @@
 import base64
+import binascii
+import hashlib
+from functools import total_ordering
+from cache import picture_cache
+
+MIN_CACHED_BASE64 = 1024  # Коротші зображення декодувати швидше, ніж шукати в кеші
 
 class PictureFile:
-    def __init__(self, filepath=None, base64_data=None):
+    __slots__ = ("_data", "_view", "_digest", "blob")
+
+    def __init__(self, filepath=None, base64_data=None, data=None):
         """
-        Ініціалізація об'єкта з файлу або з base64-даних.
+        Ініціалізація об'єкта з файлу, з base64-даних або з сирих байтів.
         :param filepath: Шлях до файлу зображення.
         :param base64_data: Дані у форматі base64.
+        :param data: Сирі байти зображення.
         """
+        self._view = None  # memoryview без копіювання (для лінивого завантаження)
+        self._digest = None  # Кешований хеш вмісту
+        self.blob = None  # (сховище, хеш), якщо байти читаються зі сховища BlobStore
         if filepath:
             with open(filepath, 'rb') as file:
                 self.data = file.read()
         elif base64_data:
             self.data = base64.b64decode(base64_data)
+        elif data is not None:
+            self.data = bytes(data)
         else:
-            raise ValueError("Необхідно вказати або 'filepath', або 'base64_data'.")
+            raise ValueError("Необхідно вказати 'filepath', 'base64_data' або 'data'.")
+
+    @property
+    def data(self):
+        """
+        Байти зображення. Якщо об'єкт створено з memoryview або зі сховища,
+        дані копіюються (читаються) лише при першому зверненні.
+        Байти зі сховища беруться зі спільного кешу, якщо вже читались.
+        :return: Байти зображення.
+        """
+        if self._data is None:
+            if self._view is None:
+                store, digest = self.blob
+                self._data = picture_cache.get_or_create(("bytes", digest), lambda: store.read(digest))
+            else:
+                self._data = bytes(self._view)
+                self._view = None
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._view = None
+        self._digest = None
+        self.blob = None
+
+    @property
+    def view(self):
+        """
+        Доступ до байтів зображення без копіювання.
+        :return: Об'єкт memoryview.
+        """
+        if self._view is None and self._data is None:
+            store, digest = self.blob
+            self._view = store.view(digest)
+        if self._view is not None:
+            return self._view
+        return memoryview(self._data)
+
+    @property
+    def digest(self):
+        """
+        Хеш SHA-256 вмісту зображення (для сховища з дедуплікацією).
+        Для зображень зі сховища байти не читаються.
+        :return: Шістнадцятковий рядок.
+        """
+        if self._digest is None:
+            self._digest = self.blob[1] if self.blob else hashlib.sha256(self.view).hexdigest()
+        return self._digest
+
+    @staticmethod
+    def from_buffer(view):
+        """
+        Створює об'єкт PictureFile поверх memoryview без копіювання даних.
+        :param view: memoryview з байтами зображення (наприклад, зріз mmap).
+        :return: Об'єкт PictureFile.
+        """
+        picture = PictureFile.__new__(PictureFile)
+        picture._data = None
+        picture._view = view
+        picture._digest = None
+        picture.blob = None
+        return picture
+
+    @staticmethod
+    def from_blob(store, digest):
+        """
+        Створює об'єкт PictureFile, байти якого читаються зі сховища лише при зверненні.
+        :param store: Об'єкт BlobStore.
+        :param digest: Хеш вмісту зображення.
+        :return: Об'єкт PictureFile.
+        """
+        picture = PictureFile.__new__(PictureFile)
+        picture._data = None
+        picture._view = None
+        picture._digest = digest
+        picture.blob = (store, digest)
+        return picture
 
     def to_base64(self):
         """
         Перетворює дані зображення у формат base64.
         :return: Строка у форматі base64.
         """
-        return base64.b64encode(self.data).decode('utf-8')
+        return binascii.b2a_base64(self.data, newline=False).decode('ascii')
 
     @staticmethod
     def from_base64(base64_data):
         """
         Створює об'єкт PictureFile з base64-даних.
+        Декодовані байти беруться зі спільного кешу: однакові зображення
+        декодуються один раз і не дублюються в пам'яті.
         :param base64_data: Дані у форматі base64.
         :return: Об'єкт PictureFile.
         """
-        return PictureFile(base64_data=base64_data)
+        if not base64_data:
+            return PictureFile(base64_data=base64_data)
+        picture = PictureFile.__new__(PictureFile)
+        if len(base64_data) < MIN_CACHED_BASE64:
+            picture._data = binascii.a2b_base64(base64_data)
+        else:
+            picture._data = picture_cache.get_or_create(
+                ("base64", base64_data), lambda: binascii.a2b_base64(base64_data),
+                lambda data: len(data) + len(base64_data))
+        picture._view = None
+        picture._digest = None
+        picture.blob = None
+        return picture
 
     def save_to_file(self, filepath):
         """
@@ -39,6 +144,19 @@ class PictureFile:
         with open(filepath, 'wb') as file:
             file.write(self.data)
 
+    def __eq__(self, other):
+        """
+        Зображення рівні, якщо збігається їхній вміст (для пошуку за значенням колонки).
+        """
+        if not isinstance(other, PictureFile):
+            return NotImplemented
+        if self._digest is not None and other._digest is not None:
+            return self._digest == other._digest
+        return self.view == other.view
+
+    def __hash__(self):
+        return hash(self.digest)
+
     def __repr__(self):
         """
         Представлення об'єкта як тексту.
@@ -46,15 +164,41 @@ class PictureFile:
         """
         return "Зображення збережено"
 
+@total_ordering
 class RealInterval:
+    __slots__ = ("start", "end")
+
     def __init__(self, start, end):
         """
-        Ініціалізація інтервалу дійсних чисел.
+        Ініціалізація інтервалу дійсних чисел. Інтервал незмінний: його можна
+        використовувати як ключ словника, а порівняння виконується за парою (початок, кінець).
         :param start: Початок інтервалу.
         :param end: Кінець інтервалу.
         """
-        self.start = float(start)
-        self.end = float(end)
+        _set_start(self, float(start))
+        _set_end(self, float(end))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Інтервал RealInterval незмінний.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Інтервал RealInterval незмінний.")
+
+    def __reduce__(self):
+        return RealInterval, (self.start, self.end)
+
+    def __eq__(self, other):
+        if not isinstance(other, RealInterval):
+            return NotImplemented
+        return self.start == other.start and self.end == other.end
+
+    def __lt__(self, other):
+        if not isinstance(other, RealInterval):
+            return NotImplemented
+        return (self.start, self.end) < (other.start, other.end)
+
+    def __hash__(self):
+        return hash((self.start, self.end))
 
     def to_dict(self):
         """
@@ -78,3 +222,7 @@ class RealInterval:
         :return: Текстове представлення інтервалу.
         """
         return f"{self.start} - {self.end}"
+
+
+_set_start = RealInterval.start.__set__  # Запис у слоти в обхід заборони зміни
+_set_end = RealInterval.end.__set__
@@ -1,5 +1,104 @@
 import json
+import os
+import tempfile
+import threading
+import binary_format
+import json_stream
+import parallel_io
+import wal
+from blob_store import BlobStore, blob_directory
+from lazy_tables import LazyTables
 from table import Table
+from storage import STORAGE_ROWS
+
+FORMAT_JSON = "json"
+FORMAT_BINARY = "binary"
+
+
+def _file_format(filename, format=None):
+    """
+    Формат файлу: заданий явно або за розширенням (".ldb" - бінарний, інше - JSON).
+    """
+    if format is None:
+        return FORMAT_BINARY if filename.endswith(binary_format.BINARY_EXTENSION) else FORMAT_JSON
+    if format not in (FORMAT_JSON, FORMAT_BINARY):
+        raise ValueError(f"Невідомий формат файлу: {format}")
+    return format
+
+
+def _write_atomic(filename, mode, write):
+    """
+    Запис файлу через тимчасовий файл у тому ж каталозі, fsync та атомарну заміну:
+    після збою на диску лишається або старий, або повністю записаний новий файл.
+    :param filename: Ім'я файлу.
+    :param mode: Режим відкриття ('w' або 'wb').
+    :param write: Функція, що записує вміст у відкритий файл.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(filename) + ".")
+    try:
+        with os.fdopen(descriptor, mode) as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, filename)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class _ProgressReader:
+    def __init__(self, file, progress):
+        """
+        Обгортка файлу для читання, що повідомляє про прочитаний обсяг.
+        :param file: Відкритий файл.
+        :param progress: Функція progress(прочитано байтів, розмір файлу).
+        """
+        self.file = file
+        self.progress = progress
+        self.total = os.fstat(file.fileno()).st_size
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        # Для текстового файлу - позиція у байтах нижчого рівня (з урахуванням буфера читання)
+        self.progress(self.file.buffer.tell() if hasattr(self.file, "buffer") else self.file.tell(), self.total)
+        return data
+
+
+def _with_progress(file, progress):
+    return file if progress is None else _ProgressReader(file, progress)
+
+
+class Snapshot:
+    def __init__(self, tables):
+        """
+        Незмінний знімок бази даних (результат Database.snapshot).
+        :param tables: Словник {назва: Table лише для читання}.
+        """
+        self.tables = tables
+
+    def save_to_disk(self, filename, format=None, blobs=False, workers=None, progress=None):
+        """
+        Атомарний запис знімка у файл: тимчасовий файл, fsync, перейменування.
+        :param filename: Назва файлу для збереження.
+        :param format: "json" або "binary" (див. Database.save_to_disk).
+        :param blobs: Зберігати зображення у сховищі поруч із файлом.
+        :param workers: Кількість паралельних виконавців кодування (None - послідовний запис).
+        :param progress: Функція progress(виконано, усього) (див. Database.save_to_disk).
+        """
+        format = _file_format(filename, format)
+        store = BlobStore(blob_directory(filename)) if blobs else None
+        if workers is not None or progress is not None:
+            _write_atomic(filename, 'wb' if format == FORMAT_BINARY else 'w',
+                          lambda file: parallel_io.dump(self.tables, file, format == FORMAT_BINARY,
+                                                        workers, store, progress))
+        elif format == FORMAT_BINARY:
+            _write_atomic(filename, 'wb', lambda file: binary_format.dump(self.tables, file, store))
+        else:
+            data = {name: table.to_dict(store) for name, table in self.tables.items()}
+            _write_atomic(filename, 'w', lambda file: json.dump(data, file))
+        if store is not None:
+            store.collect_garbage()
 
 
 class Database:
@@ -8,41 +107,245 @@ class Database:
         Ініціалізація бази даних.
         """
         self.tables = {}  # Словник для зберігання таблиць
+        self.log = None  # Журнал змін (WriteAheadLog), якщо підключено
+        self.lock = threading.RLock()  # Блокування складу таблиць
+        self._checkpoint = None  # Потік фонової контрольної точки
 
-    def create_table(self, name, schema):
+    def create_table(self, name, schema, storage=STORAGE_ROWS):
         """
         Створення таблиці з заданим іменем та схемою.
         :param name: Назва таблиці.
         :param schema: Схема таблиці.
+        :param storage: Тип сховища таблиці ("rows" або "columnar").
         """
-        if name in self.tables:
-            raise ValueError(f"Таблиця з іменем '{name}' вже існує.")
-        self.tables[name] = Table(name, schema)
+        with self.lock:
+            if name in self.tables:
+                raise ValueError(f"Таблиця з іменем '{name}' вже існує.")
+            table = Table(name, schema, storage)
+            self.tables[name] = table
+            if self.log is not None:
+                table.log = self._log_operation
+                table._record("create_table", schema=schema.to_dict(), storage=storage)
 
     def delete_table(self, name):
         """
         Видалення таблиці за іменем.
         :param name: Назва таблиці.
         """
-        if name not in self.tables:
-            raise ValueError(f"Таблиця з іменем '{name}' не знайдена.")
-        del self.tables[name]
+        with self.lock:
+            if name not in self.tables:
+                raise ValueError(f"Таблиця з іменем '{name}' не знайдена.")
+            table = self.tables.pop(name)
+            if self.log is not None:
+                table.log = None
+                self._log_operation(name, "delete_table", {})
+
+    def snapshot(self):
+        """
+        Узгоджений знімок усіх таблиць лише для читання.
+        Дані не копіюються: таблиця, що змінюється після знімка, спершу копіює своє
+        сховище (копіювання під час запису), тож знімок бачить стан на момент виклику,
+        а зміни продовжуються без очікування. Знімок можна зберігати або читати
+        з іншого потоку.
+        :return: Об'єкт Snapshot.
+        """
+        return self._snapshot()[0]
+
+    def _snapshot(self, on_locked=None):
+        """
+        Знімок під блокуванням усіх таблиць.
+        :param on_locked: Функція on_locked(таблиці), яку потрібно виконати атомарно разом зі знімком.
+        :return: Кортеж (Snapshot, результат on_locked).
+        """
+        with self.lock:
+            tables = dict(self.tables.items())
+            ordered = [tables[name] for name in sorted(tables)]  # Сталий порядок блокування
+            for table in ordered:
+                table.lock.acquire_read()
+            try:
+                result = on_locked(ordered) if on_locked is not None else None
+                frozen = {name: table.freeze() for name, table in tables.items()}
+            finally:
+                for table in reversed(ordered):
+                    table.lock.release_read()
+        return Snapshot(frozen), result
 
-    def save_to_disk(self, filename):
+    def save_to_disk(self, filename, format=None, blobs=False, background=False, workers=None, progress=None):
         """
-        Збереження бази даних на диск.
+        Збереження бази даних на диск зі знімка (див. snapshot): зміни таблиць
+        під час запису не потрапляють у файл і не чекають на його завершення.
+        Файл записується через тимчасовий файл і атомарне перейменування.
         :param filename: Назва файлу для збереження.
+        :param format: "json" або "binary"; за замовчуванням визначається за розширенням
+                       (".ldb" - бінарний формат, інше - JSON).
+        :param blobs: Якщо True, зображення зберігаються один раз у сховищі поруч із файлом
+                      (каталог "<файл>.blobs"), а рядки містять лише хеш вмісту.
+                      Зображення, на які більше немає посилань, видаляються зі сховища.
+        :param background: Записати файл у фоновому потоці.
+        :param workers: Кількість паралельних виконавців: таблиці та їхні частини кодуються
+                        в окремих процесах, а файл збирається з сегментів у сталому порядку
+                        (вміст збігається з послідовним записом). None - послідовний запис.
+        :param progress: Функція progress(виконано, усього), що викликається по мірі запису
+                         (одиниці - частини таблиць). Виняток з неї скасовує запис:
+                         тимчасовий файл видаляється, а попередній файл лишається без змін.
+        :return: Потік запису (для background=True) або None.
         """
-        data = {name: table.to_dict() for name, table in self.tables.items()}
-        with open(filename, 'w') as file:
-            json.dump(data, file)
+        format = _file_format(filename, format)
+        if isinstance(self.tables, LazyTables) and os.path.exists(filename):
+            # Файл може бути відображений у пам'ять - звільняємо його перед перезаписом
+            self.tables.detach()
+        snapshot = self.snapshot()
+        if not background:
+            snapshot.save_to_disk(filename, format, blobs, workers, progress)
+            return None
+        thread = threading.Thread(target=snapshot.save_to_disk, args=(filename, format, blobs, workers, progress),
+                                  daemon=True)
+        thread.start()
+        return thread
 
-    def load_from_disk(self, filename):
+    def load_from_disk(self, filename, lazy=False, log=False, progress=None):
         """
         Завантаження бази даних з диска.
+        Формат (бінарний чи JSON) визначається за сигнатурою файлу.
+        Зміни з журналу, записані після останньої контрольної точки, відтворюються.
         :param filename: Назва файлу для завантаження.
+        :param lazy: Для бінарних файлів - відобразити файл у пам'ять (mmap)
+                     і декодувати кожну таблицю лише при першому зверненні.
+                     Зображення зі сховища теж відображаються у пам'ять.
+        :param log: Після завантаження підключити журнал змін (див. open_log).
+        :param progress: Функція progress(прочитано байтів, розмір файлу), що викликається
+                         по мірі читання. Виняток з неї перериває завантаження; таблиці,
+                         прочитані до цього, лишаються в self.tables, тому для скасовуваного
+                         завантаження варто використовувати нову базу даних.
+        """
+        if os.path.exists(filename) or not wal.segment_paths(filename):
+            self._load_file(filename, lazy, progress)
+        wal.replay(self.tables, filename)
+        if log:
+            self.open_log(filename)
+
+    def _load_file(self, filename, lazy, progress=None):
+        """
+        Завантаження таблиць з основного файлу бази даних (без журналу).
+        """
+        # Зображення, збережені посиланням, читаються зі сховища лише при зверненні
+        store = BlobStore(blob_directory(filename), use_mmap=lazy)
+        if binary_format.is_binary_file(filename):
+            if lazy:
+                if not isinstance(self.tables, LazyTables):
+                    self.tables = LazyTables(self.tables)
+                self.tables.open(filename, store)
+                return
+            with open(filename, 'rb') as file:
+                self.tables.update(binary_format.load(_with_progress(file, progress), store))
+            return
+        with open(filename, 'r', encoding='utf-8') as file:
+            # Потоковий розбір: таблиці та рядки створюються по мірі читання
+            for name, table in json_stream.iter_tables(_with_progress(file, progress), blobs=store):
+                self.tables[name] = table
+
+    def _log_operation(self, table_name, op, fields):
+        """
+        Запис операції в журнал (функція, яку викликають таблиці).
+        :return: Номер запису.
+        """
+        return self.log.append(dict(fields, op=op, table=table_name))
+
+    def open_log(self, filename, sync_every=wal.SYNC_EVERY, sync_interval=wal.SYNC_INTERVAL):
+        """
+        Підключення журналу змін: кожна зміна таблиць дописується у "<файл>.wal.<номер>",
+        тож її збереження коштує O(зміни), а не перезапис усієї бази.
+        Записи скидаються на диск групами (див. WriteAheadLog); після збою
+        load_from_disk відтворює їх поверх основного файлу.
+        Зміни, зроблені без методів Database/Table (пряма заміна self.tables[назва]), не журналюються.
+        :param filename: Ім'я файлу бази даних.
+        :param sync_every: Кількість записів у групі fsync.
+        :param sync_interval: Максимальна затримка fsync, секунд.
+        """
+        if self.log is not None:
+            raise ValueError("Журнал змін уже підключено.")
+        next_lsn = max([table.lsn for table in self.tables.values()], default=0) + 1
+        self.log = wal.WriteAheadLog(filename, next_lsn, sync_every, sync_interval)
+        for table in self.tables.values():
+            table.log = self._log_operation
+
+    def close_log(self):
+        """
+        Завершення контрольної точки, скидання журналу на диск та його відключення.
+        """
+        if self.log is None:
+            return
+        self.wait_checkpoint()
+        self.log.close()
+        for table in self.tables.values():
+            table.log = None
+        self.log = None
+
+    def checkpoint(self, background=False, blobs=False):
+        """
+        Контрольна точка: стиснення журналу в основний файл бази даних.
+        Знімок таблиць і перемикання на новий сегмент журналу виконуються разом
+        під блокуванням таблиць, а запис файлу та видалення врахованих сегментів
+        можуть виконуватись у фоновому потоці, не зупиняючи зміни таблиць.
+        Файл замінюється атомарно, тож збій під час запису не пошкоджує базу.
+        :param background: Виконати запис у фоновому потоці.
+        :param blobs: Зберігати зображення у сховищі (див. save_to_disk).
+        :return: Потік контрольної точки (для background=True) або None.
+        """
+        if self.log is None:
+            raise ValueError("Журнал змін не підключено.")
+        self.wait_checkpoint()
+        filename = self.log.filename
+        if isinstance(self.tables, LazyTables) and os.path.exists(filename):
+            # Файл може бути відображений у пам'ять - звільняємо його перед перезаписом
+            self.tables.detach()
+
+        def rotate(tables):
+            # Нова схема незавершеної зміни типу ще не записана в журнал: така зміна
+            # може бути скасована, тож у файл вона потрапляти не повинна
+            return None if any(table.converting for table in tables) else self.log.rotate()
+
+        segments = None
+        while segments is None:
+            with self.lock:
+                tables = list(self.tables.values())
+            for table in tables:
+                table.finish_conversion()
+            snapshot, segments = self._snapshot(rotate)
+
+        def run():
+            snapshot.save_to_disk(filename, blobs=blobs)
+            self.log.remove_segments(segments)
+
+        if not background:
+            run()
+            return None
+        self._checkpoint = threading.Thread(target=run, daemon=True)
+        self._checkpoint.start()
+        return self._checkpoint
+
+    def wait_checkpoint(self):
+        """
+        Очікування завершення фонової контрольної точки.
+        """
+        if self._checkpoint is not None:
+            self._checkpoint.join()
+            self._checkpoint = None
+
+    @staticmethod
+    def iter_rows(filename, table_name):
+        """
+        Перегляд рядків однієї таблиці з файлу без завантаження всієї бази даних.
+        :param filename: Назва файлу (JSON або бінарний).
+        :param table_name: Назва таблиці.
+        :return: Генератор об'єктів Row.
         """
-        with open(filename, 'r') as file:
-            data = json.load(file)
-            for name, table_data in data.items():
-                self.tables[name] = Table.from_dict(table_data)
+        store = BlobStore(blob_directory(filename))
+        if binary_format.is_binary_file(filename):
+            tables = LazyTables()
+            tables.open(filename, store)
+            if table_name not in tables:
+                raise ValueError(f"Таблиця з іменем '{table_name}' не знайдена.")
+            yield from tables[table_name].rows
+            return
+        yield from json_stream.iter_rows(filename, table_name, blobs=store)
@@ -1,11 +1,109 @@
 import tkinter as tk
-import json
 from tkinter import ttk, messagebox, filedialog
+from background import BackgroundTask
 from database import Database
 from schema import Schema, Field
 from custom_types import PictureFile, RealInterval
-from table import Table
-from PIL import Image, ImageTk
+from cache import picture_image
+from table_view import RowWindow, VISIBLE_ROWS
+from PIL import ImageTk
+
+PREVIEW_SIZE = (800, 800)  # Максимальний розмір вікна перегляду зображення
+POLL_INTERVAL = 500  # Період перевірки змін таблиці у вікні перегляду, мс
+TASK_POLL_INTERVAL = 100  # Період оновлення стану фонового завантаження/збереження, мс
+FILE_TYPES = [("JSON файли", "*.json"), ("Бінарні файли", "*.ldb"), ("Усі файли", "*.*")]
+
+class TableViewer:
+    def __init__(self, parent, table, height=VISIBLE_ROWS):
+        """
+        Віртуалізований перегляд таблиці: Treeview містить лише видимі рядки,
+        які замінюються під час прокрутки (див. RowWindow). Зміни таблиці
+        (додавання, видалення рядків) перевіряються кожні POLL_INTERVAL мс.
+        :param parent: Батьківський віджет.
+        :param table: Об'єкт Table.
+        :param height: Кількість видимих рядків.
+        """
+        self.window = RowWindow(table, height)
+        self.frame = tk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, show="headings", height=height)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._columns = None
+
+        self.tree.bind("<MouseWheel>", self._on_wheel)  # Windows, macOS
+        self.tree.bind("<Button-4>", self._on_wheel)  # Linux
+        self.tree.bind("<Button-5>", self._on_wheel)
+        self.tree.bind("<Prior>", lambda event: self._scroll(-height))
+        self.tree.bind("<Next>", lambda event: self._scroll(height))
+        self.render()
+        self.frame.after(POLL_INTERVAL, self._poll)
+
+    def render(self):
+        """Оновлення видимих рядків і смуги прокрутки."""
+        columns = self.window.columns
+        if columns != self._columns:
+            self._columns = columns
+            self.tree["columns"] = columns
+            for name in columns:
+                self.tree.heading(name, text=name)
+        rows = self.window.visible_rows()
+        items = self.tree.get_children()
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        for position, values in enumerate(rows):
+            if position < len(items):
+                self.tree.item(items[position], values=values)
+            else:
+                self.tree.insert("", "end", values=values)
+        self.scrollbar.set(*self.window.fraction())
+
+    def _scroll(self, count):
+        self.window.scroll_by(count)
+        self.render()
+        return "break"
+
+    def _on_scrollbar(self, action, value, unit=None):
+        """Обробник смуги прокрутки: moveto або scroll на рядки/сторінки."""
+        if action == "moveto":
+            self.window.moveto(float(value))
+        else:
+            self.window.scroll_by(int(value) * (self.window.height if unit == "pages" else 1))
+        self.render()
+
+    def _on_wheel(self, event):
+        """Прокрутка коліщатком миші на 3 рядки."""
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        return self._scroll(-3 if up else 3)
+
+    def _poll(self):
+        if not self.frame.winfo_exists():
+            return
+        if self.window.refresh():
+            self.render()
+        self.frame.after(POLL_INTERVAL, self._poll)
+
+    def jump_to(self, index):
+        """
+        Перехід до рядка з його виділенням.
+        :param index: Індекс рядка.
+        """
+        position = self.window.jump_to(index)
+        self.render()
+        item = self.tree.get_children()[position]
+        self.tree.selection_set(item)
+        self.tree.focus(item)
+
+    def selected_row_id(self):
+        """
+        Сталий ідентифікатор виділеного рядка (не зсувається після видалення інших рядків).
+        :return: Ідентифікатор або None, якщо нічого не виділено.
+        """
+        selected_row = self.tree.selection()
+        if not selected_row:
+            return None
+        return self.window.row_id(self.tree.index(selected_row[0]))
+
 
 class App:
     def __init__(self, root):
@@ -62,6 +160,17 @@ class App:
         )
         self.reorder_columns_button.pack(side=tk.LEFT, padx=5, pady=5)
 
+        # Рядок стану фонових операцій
+        self.task = None  # Поточне фонове завантаження/збереження (BackgroundTask)
+        self.status_frame = tk.Frame(root)
+        self.status_frame.pack(fill=tk.X)
+        self.status_label = tk.Label(self.status_frame, text="Готово", anchor="w")
+        self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.cancel_button = tk.Button(self.status_frame, text="Скасувати", state=tk.DISABLED, command=self.cancel_task)
+        self.cancel_button.pack(side=tk.RIGHT, padx=5, pady=2)
+        self.progress_bar = ttk.Progressbar(self.status_frame, length=200, maximum=1.0)
+        self.progress_bar.pack(side=tk.RIGHT, padx=5)
+
     def update_table_list(self):
         """Оновити список таблиць у Treeview."""
         self.table_list.delete(*self.table_list.get_children())
@@ -148,34 +257,38 @@ class App:
         dialog = tk.Toplevel(self.root)
         dialog.title(f"Таблиця: {table_name}")
 
-        tree = ttk.Treeview(dialog, columns=[field.name for field in table.schema.fields], show="headings")
-        for field in table.schema.fields:
-            tree.heading(field.name, text=field.name)
+        # Перехід до рядка за номером
+        jump_frame = tk.Frame(dialog)
+        jump_frame.pack(fill=tk.X)
+        tk.Label(jump_frame, text="Рядок:").pack(side=tk.LEFT, padx=5)
+        jump_entry = tk.Entry(jump_frame, width=10)
+        jump_entry.pack(side=tk.LEFT)
 
-        for row in table.rows:
-            # Перетворення значень перед додаванням до таблиці
-            values = []
-            for field in table.schema.fields:
-                value = row.data[field.name]
-                if isinstance(value, PictureFile):
-                    values.append("Зображення збережено")  # Явне представлення для PictureFile
-                elif isinstance(value, RealInterval):
-                    values.append(repr(value))  # Для інтервалу
-                else:
-                    values.append(value)
-            tree.insert("", "end", values=values)
+        viewer = TableViewer(dialog, table)
+        viewer.frame.pack(fill=tk.BOTH, expand=True)
+
+        def jump():
+            """Перехід до введеного рядка (нумерація з 1)."""
+            try:
+                viewer.jump_to(int(jump_entry.get()) - 1)
+            except (ValueError, IndexError) as e:
+                messagebox.showerror("Помилка", f"Невірний номер рядка: {e}")
 
-        tree.pack(fill=tk.BOTH, expand=True)
+        tk.Button(jump_frame, text="Перейти", command=jump).pack(side=tk.LEFT, padx=5)
+        jump_entry.bind("<Return>", lambda event: jump())
 
         def delete_selected_row():
             """Видалення вибраного рядка."""
-            selected_row = tree.selection()
-            if not selected_row:
+            row_id = viewer.selected_row_id()
+            if row_id is None:
                 messagebox.showwarning("Попередження", "Виберіть рядок для видалення.")
                 return
-            row_index = tree.index(selected_row[0])
-            table.delete_row(row_index)
-            tree.delete(selected_row[0])
+            try:
+                table.delete_row_by_id(row_id)
+            except IndexError as e:
+                messagebox.showerror("Помилка", str(e))
+                return
+            viewer.render()
             messagebox.showinfo("Успіх", "Рядок успішно видалено.")
 
         # Кнопка "Видалити рядок"
@@ -184,27 +297,23 @@ class App:
 
         def on_double_click(event):
             """Обробник подвійного клацання для перегляду зображення."""
-            selected_row = tree.selection()
-            if not selected_row:
+            row_id = viewer.selected_row_id()
+            if row_id is None:
                 return
-            item = tree.item(selected_row[0])
-            row_values = item["values"]
-            for idx, field in enumerate(table.schema.fields):
+            for field in table.schema.fields:
                 if field.data_type == PictureFile:
-                    picture_data = table.rows[tree.index(selected_row[0])].data[field.name]
+                    picture_data = table.get_row_by_id(row_id).data[field.name]
                     if isinstance(picture_data, PictureFile):
-                        temp_path = "temp_image.jpg"
-                        picture_data.save_to_file(temp_path)
-
                         img_window = tk.Toplevel(dialog)
                         img_window.title("Перегляд зображення")
-                        img = Image.open(temp_path)
+                        # Декодоване зображення береться з кешу без тимчасових файлів
+                        img = picture_image(picture_data, PREVIEW_SIZE)
                         img = ImageTk.PhotoImage(img)
                         img_label = tk.Label(img_window, image=img)
                         img_label.image = img
                         img_label.pack()
 
-        tree.bind("<Double-1>", on_double_click)
+        viewer.tree.bind("<Double-1>", on_double_click)
 
     def add_row_dialog(self):
         """Діалог для додавання рядка до таблиці."""
@@ -290,7 +399,7 @@ class App:
         dialog = tk.Toplevel(self.root)
         dialog.title(f"Змінити колонки таблиці: {table_name}")
 
-        tk.Label(dialog, text="Введіть новий порядок колонок (через кому):").pack(pady=5)
+        tk.Label(dialog, text="Введіть новий порядок колонок (через кому; стара=нова - перейменування):").pack(pady=5)
         current_columns = ", ".join([field.name for field in table.schema.fields])
         tk.Label(dialog, text=f"Поточні колонки: {current_columns}").pack(pady=5)
 
@@ -298,9 +407,15 @@ class App:
         new_order_entry.pack(pady=5)
 
         def apply_reorder():
-            new_order = [name.strip() for name in new_order_entry.get().split(",")]
+            new_order = []
+            renames = {}
+            for entry in new_order_entry.get().split(","):
+                old_name, _, new_name = (part.strip() for part in entry.partition("="))
+                new_order.append(old_name)
+                if new_name:
+                    renames[old_name] = new_name
             try:
-                table.rename_or_reorder_columns(new_order)
+                table.rename_or_reorder_columns(new_order, renames)
                 messagebox.showinfo("Успіх", "Колонки успішно змінено.")
                 dialog.destroy()
             except ValueError as e:
@@ -308,43 +423,83 @@ class App:
 
         tk.Button(dialog, text="Застосувати", command=apply_reorder).pack(pady=10)
 
+    def run_task(self, description, function, on_success):
+        """
+        Виконання операції у фоновому потоці з відображенням ходу в рядку стану.
+        :param description: Назва операції для рядка стану.
+        :param function: Функція function(progress) -> результат (див. BackgroundTask).
+        :param on_success: Функція on_success(результат), що виконується в головному потоці.
+        :return: True, якщо операцію запущено.
+        """
+        if self.task is not None:
+            messagebox.showwarning("Попередження", "Дочекайтеся завершення поточної операції.")
+            return False
+        self.task = BackgroundTask(function).start()
+        self.cancel_button.config(state=tk.NORMAL)
+        self._poll_task(description, on_success)
+        return True
+
+    def _poll_task(self, description, on_success):
+        """Оновлення рядка стану; завершення операції обробляється в головному потоці."""
+        task = self.task
+        if not task.done:
+            self.progress_bar["value"] = task.fraction()
+            self.status_label.config(text=f"{description}: {task.fraction():.0%}")
+            self.root.after(TASK_POLL_INTERVAL, self._poll_task, description, on_success)
+            return
+        self.task = None
+        self.cancel_button.config(state=tk.DISABLED)
+        self.progress_bar["value"] = 0
+        if task.cancelled:
+            self.status_label.config(text=f"{description}: скасовано")
+        elif task.error is not None:
+            self.status_label.config(text=f"{description}: помилка")
+            messagebox.showerror("Помилка", f"{description} не вдалося:\n{task.error}")
+        else:
+            self.status_label.config(text="Готово")
+            on_success(task.result)
+
+    def cancel_task(self):
+        """Скасування поточної фонової операції."""
+        if self.task is not None:
+            self.task.cancel()
+
     def save_database(self):
-        """Збереження бази даних."""
+        """Збереження бази даних у фоновому потоці (зі знімка, тож таблиці можна змінювати)."""
         filepath = filedialog.asksaveasfilename(
             title="Зберегти базу даних",
             defaultextension=".json",
-            filetypes=[("JSON файли", "*.json"), ("Усі файли", "*.*")]
+            filetypes=FILE_TYPES
         )
         if not filepath:
             return  # Користувач скасував вибір
 
-        try:
-            # Перетворення бази даних у словник
-            data = {name: table.to_dict() for name, table in self.db.tables.items()}
-            with open(filepath, 'w', encoding='utf-8') as file:
-                json.dump(data, file, indent=4, ensure_ascii=False)
-            messagebox.showinfo("Успіх", f"База даних успішно збережена у файл:\n{filepath}")
-        except Exception as e:
-            messagebox.showerror("Помилка", f"Не вдалося зберегти базу даних:\n{e}")
+        self.run_task(
+            "Збереження",
+            lambda progress: self.db.save_to_disk(filepath, progress=progress),
+            lambda result: messagebox.showinfo("Успіх", f"База даних успішно збережена у файл:\n{filepath}")
+        )
 
     def load_database(self):
-        """Завантаження бази даних."""
+        """Завантаження бази даних у фоновому потоці; поточна база замінюється лише після успіху."""
         filepath = filedialog.askopenfilename(
             title="Завантажити базу даних",
-            filetypes=[("JSON файли", "*.json"), ("Усі файли", "*.*")]
+            filetypes=FILE_TYPES
         )
         if not filepath:
             return  # Користувач скасував вибір
 
-        try:
-            # Завантаження бази даних з JSON файлу
-            with open(filepath, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                self.db.tables = {name: Table.from_dict(table_data) for name, table_data in data.items()}
+        def load(progress):
+            database = Database()
+            database.load_from_disk(filepath, progress=progress)
+            return database
+
+        def loaded(database):
+            self.db = database
             self.update_table_list()
             messagebox.showinfo("Успіх", f"База даних успішно завантажена з файлу:\n{filepath}")
-        except Exception as e:
-            messagebox.showerror("Помилка", f"Не вдалося завантажити базу даних:\n{e}")
+
+        self.run_task("Завантаження", load, loaded)
 
 def start_gui():
     root = tk.Tk()
@@ -0,0 +1,441 @@
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress
+from custom_types import PictureFile, RealInterval
+
+INDEX_HASH = "hash"
+INDEX_SORTED = "sorted"
+INDEX_INTERVAL = "interval"
+BATCH_REMOVE_MIN = 64  # З цієї кількості видалень впорядкований індекс фільтрується за один прохід
+
+
+def index_key(value):
+    """
+    Ключ значення для індексу: інтервал представляється парою (початок, кінець).
+    :param value: Значення колонки.
+    :return: Хешований та порівнюваний ключ.
+    """
+    if isinstance(value, RealInterval):
+        return (value.start, value.end)
+    return value
+
+
+class HashIndex:
+    kind = INDEX_HASH
+
+    def __init__(self, field):
+        """
+        Хеш-індекс колонки: пошук рядків за рівністю значення за O(1).
+        Індекси зберігають сталі ідентифікатори рядків, тож видалення рядка
+        не змінює записи інших рядків.
+        :param field: Об'єкт Field колонки.
+        """
+        self.column = field.name
+        self.buckets = {}  # {ключ: множина ідентифікаторів рядків}
+
+    def build(self, values, row_ids=None):
+        """
+        Побудова індексу з усіх значень колонки.
+        :param values: Значення колонки у порядку рядків.
+        :param row_ids: Ідентифікатори рядків (None - 0, 1, 2, ...).
+        """
+        self.buckets = {}
+        for row_id, value in zip(row_ids if row_ids is not None else range(len(values)), values):
+            self.insert(row_id, value)
+
+    def insert(self, row_id, value):
+        self.buckets.setdefault(index_key(value), set()).add(row_id)
+
+    def remove(self, row_id, value):
+        key = index_key(value)
+        bucket = self.buckets[key]
+        bucket.remove(row_id)
+        if not bucket:
+            del self.buckets[key]
+
+    def remove_many(self, entries):
+        """
+        Видалення кількох рядків з індексу.
+        :param entries: Пари (ідентифікатор рядка, значення).
+        """
+        for row_id, value in entries:
+            self.remove(row_id, value)
+
+    def lookup(self, value):
+        """
+        Ідентифікатори рядків з заданим значенням.
+        :param value: Шукане значення.
+        :return: Відсортований список ідентифікаторів (порядок збігається з порядком рядків).
+        """
+        return sorted(self.buckets.get(index_key(value), ()))
+
+
+class _SortedKeys:
+    def __init__(self):
+        """
+        Відсортовані ключі з паралельним списком ідентифікаторів рядків.
+        Рівні ключі впорядковані за ідентифікатором, тож запис знаходиться бінарним пошуком.
+        """
+        self.keys = []
+        self.positions = []  # Ідентифікатори рядків
+
+    def build(self, keys, row_ids):
+        pairs = sorted(zip(keys, row_ids))
+        self.keys = [key for key, _ in pairs]
+        self.positions = [row_id for _, row_id in pairs]
+
+    def insert(self, key, row_id):
+        i = bisect_right(self.positions, row_id, bisect_left(self.keys, key), bisect_right(self.keys, key))
+        self.keys.insert(i, key)
+        self.positions.insert(i, row_id)
+
+    def _find(self, key, row_id):
+        i = bisect_left(self.positions, row_id, bisect_left(self.keys, key), bisect_right(self.keys, key))
+        if i == len(self.positions) or self.positions[i] != row_id or self.keys[i] != key:
+            raise ValueError(f"Рядок {row_id} відсутній в індексі.")
+        return i
+
+    def remove(self, key, row_id):
+        i = self._find(key, row_id)
+        del self.keys[i]
+        del self.positions[i]
+
+    def remove_many(self, pairs):
+        """
+        Видалення кількох пар (ключ, ідентифікатор). Кожне видалення зі списку
+        зсуває його хвіст, тож для великої групи списки один раз фільтруються за маскою.
+        """
+        found = [self._find(key, row_id) for key, row_id in pairs]
+        if len(found) < BATCH_REMOVE_MIN:
+            for i in sorted(found, reverse=True):
+                del self.keys[i]
+                del self.positions[i]
+            return
+        mask = bytearray(b"\x01") * len(self.keys)
+        for i in found:
+            mask[i] = 0
+        self.keys = list(compress(self.keys, mask))
+        self.positions = list(compress(self.positions, mask))
+
+    def range(self, low, high, include_low, include_high):
+        start = 0
+        if low is not None:
+            start = bisect_left(self.keys, low) if include_low else bisect_right(self.keys, low)
+        end = len(self.keys)
+        if high is not None:
+            end = bisect_right(self.keys, high) if include_high else bisect_left(self.keys, high)
+        return self.positions[start:end]
+
+
+class SortedIndex:
+    kind = INDEX_SORTED
+
+    def __init__(self, field):
+        """
+        Впорядкований індекс колонки (bisect) для запитів за діапазоном.
+        Для колонок RealInterval підтримуються окремі впорядкування за початком і кінцем.
+        :param field: Об'єкт Field колонки.
+        """
+        self.column = field.name
+        if field.data_type is RealInterval:
+            self.parts = {"start": _SortedKeys(), "end": _SortedKeys()}
+        else:
+            self.parts = {None: _SortedKeys()}
+
+    @staticmethod
+    def _part_key(part, value):
+        if part is None:
+            return value
+        return getattr(value, part)
+
+    def build(self, values, row_ids=None):
+        values = list(values)
+        row_ids = row_ids if row_ids is not None else range(len(values))
+        for part, keys in self.parts.items():
+            keys.build([self._part_key(part, value) for value in values], row_ids)
+
+    def insert(self, row_id, value):
+        for part, keys in self.parts.items():
+            keys.insert(self._part_key(part, value), row_id)
+
+    def remove(self, row_id, value):
+        for part, keys in self.parts.items():
+            keys.remove(self._part_key(part, value), row_id)
+
+    def remove_many(self, entries):
+        for part, keys in self.parts.items():
+            keys.remove_many([(self._part_key(part, value), row_id) for row_id, value in entries])
+
+    def lookup(self, value):
+        if None not in self.parts:
+            start = self.parts["start"].range(value.start, value.start, True, True)
+            return sorted(set(start) & set(self.parts["end"].range(value.end, value.end, True, True)))
+        return sorted(self.parts[None].range(value, value, True, True))
+
+    def range(self, low=None, high=None, part=None, include_low=True, include_high=True):
+        """
+        Ідентифікатори рядків зі значеннями в діапазоні [low, high].
+        :param low: Нижня межа (None - без обмеження).
+        :param high: Верхня межа (None - без обмеження).
+        :param part: Для інтервалів - "start" або "end".
+        :param include_low: Чи включати нижню межу.
+        :param include_high: Чи включати верхню межу.
+        :return: Список ідентифікаторів у порядку зростання значень.
+        """
+        if part not in self.parts:
+            raise ValueError(f"Для колонки '{self.column}' потрібно вказати частину: {list(self.parts)}.")
+        return self.parts[part].range(low, high, include_low, include_high)
+
+
+class _Node:
+    __slots__ = ("key", "end", "priority", "left", "right", "size", "max_end")
+
+    def __init__(self, key, end, priority):
+        self.key = key  # (межа впорядкування, друга межа, ідентифікатор рядка)
+        self.end = end  # Кінець інтервалу
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.size = 1
+        self.max_end = end  # Найбільший кінець у піддереві
+
+
+def _update(node):
+    node.size = 1
+    node.max_end = node.end
+    for child in (node.left, node.right):
+        if child is not None:
+            node.size += child.size
+            if child.max_end > node.max_end:
+                node.max_end = child.max_end
+
+
+def _split(node, key):
+    """
+    Розділення дерева на вузли з ключами < key та >= key.
+    """
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key)
+    _update(node)
+    return left, node
+
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _insert(node, new):
+    if node is None:
+        return new
+    if new.priority > node.priority:
+        new.left, new.right = _split(node, new.key)
+        _update(new)
+        return new
+    if new.key < node.key:
+        node.left = _insert(node.left, new)
+    else:
+        node.right = _insert(node.right, new)
+    _update(node)
+    return node
+
+
+def _delete(node, key):
+    if node is None:
+        raise KeyError(key)
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    elif node.key < key:
+        node.right = _delete(node.right, key)
+    else:
+        return _merge(node.left, node.right)
+    _update(node)
+    return node
+
+
+def _build(nodes, low, high, level):
+    """
+    Побудова збалансованого дерева з відсортованих вузлів nodes[low:high].
+    Пріоритет вузла на глибині d лежить у [level - d, level - d + 1),
+    тож батьківський вузол завжди має більший пріоритет, ніж дочірні.
+    """
+    if low >= high:
+        return None
+    middle = (low + high) // 2
+    node = nodes[middle]
+    node.priority = level + random.random()
+    node.left = _build(nodes, low, middle, level - 1)
+    node.right = _build(nodes, middle + 1, high, level - 1)
+    _update(node)
+    return node
+
+
+class _Treap:
+    def __init__(self):
+        """
+        Декартове дерево (treap) з розміром піддерев та максимальним кінцем інтервалу.
+        """
+        self.root = None
+
+    def build(self, entries):
+        """
+        Побудова дерева з уже відсортованих пар (ключ, кінець інтервалу).
+        """
+        nodes = [_Node(key, end, 0.0) for key, end in entries]
+        # Нові вузли отримують пріоритет у [0, 1) і опускаються під збудовану частину
+        self.root = _build(nodes, 0, len(nodes), len(nodes).bit_length())
+
+    def insert(self, key, end):
+        self.root = _insert(self.root, _Node(key, end, random.random()))
+
+    def remove(self, key):
+        self.root = _delete(self.root, key)
+
+    def count_less(self, bound):
+        """
+        Кількість ключів, менших за bound, за O(log n).
+        """
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.key < bound:
+                count += 1 + (node.left.size if node.left is not None else 0)
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+
+class IntervalIndex:
+    kind = INDEX_INTERVAL
+
+    def __init__(self, field):
+        """
+        Індекс інтервалів для колонок RealInterval: декартове дерево,
+        впорядковане за початком і доповнене максимальним кінцем у піддереві,
+        та дерево, впорядковане за кінцем, для підрахунку за O(log n).
+        Інтервали з початком більшим за кінець вважаються порожніми й не індексуються.
+        :param field: Об'єкт Field колонки.
+        """
+        if field.data_type is not RealInterval:
+            raise ValueError(f"Індекс інтервалів можливий лише для колонок realInvl, а не '{field.name}'.")
+        self.column = field.name
+        self.by_start = _Treap()
+        self.by_end = _Treap()
+
+    @staticmethod
+    def _is_empty(value):
+        return value.start > value.end
+
+    def build(self, values, row_ids=None):
+        starts = array('d')
+        ends = array('d')
+        positions = []
+        for row_id, value in zip(row_ids if row_ids is not None else range(len(values)), values):
+            if not self._is_empty(value):
+                starts.append(value.start)
+                ends.append(value.end)
+                positions.append(row_id)
+        # Два стабільні сортування за числовими ключами замість порівняння кортежів;
+        # ідентифікатори вже зростають, тож порядок збігається з порядком ключів дерева
+        order = sorted(range(len(positions)), key=ends.__getitem__)
+        order.sort(key=starts.__getitem__)
+        self.by_start.build([((starts[i], ends[i], positions[i]), ends[i]) for i in order])
+        order = sorted(range(len(positions)), key=starts.__getitem__)
+        order.sort(key=ends.__getitem__)
+        self.by_end.build([((ends[i], starts[i], positions[i]), ends[i]) for i in order])
+
+    def insert(self, row_id, value):
+        if not self._is_empty(value):
+            self.by_start.insert((value.start, value.end, row_id), value.end)
+            self.by_end.insert((value.end, value.start, row_id), value.end)
+
+    def remove(self, row_id, value):
+        if not self._is_empty(value):
+            self.by_start.remove((value.start, value.end, row_id))
+            self.by_end.remove((value.end, value.start, row_id))
+
+    def remove_many(self, entries):
+        for row_id, value in entries:
+            self.remove(row_id, value)
+
+    def overlaps(self, low, high):
+        """
+        Ідентифікатори рядків, інтервали яких перетинаються з [low, high].
+        Складність O((k + 1) log n), де k - кількість знайдених інтервалів.
+        :param low: Початок запиту.
+        :param high: Кінець запиту.
+        :return: Відсортований список ідентифікаторів.
+        """
+        result = []
+        stack = [self.by_start.root] if self.by_start.root is not None else []
+        while stack:
+            node = stack.pop()
+            if node.max_end < low:
+                continue  # У піддереві немає інтервалів, що закінчуються після low
+            if node.left is not None:
+                stack.append(node.left)
+            start, end, position = node.key
+            if start > high:
+                continue  # Праве піддерево починається ще правіше
+            if end >= low:
+                result.append(position)
+            if node.right is not None:
+                stack.append(node.right)
+        result.sort()
+        return result
+
+    def contains_point(self, point):
+        """
+        Ідентифікатори рядків, інтервали яких містять точку.
+        :param point: Точка.
+        :return: Відсортований список ідентифікаторів.
+        """
+        return self.overlaps(point, point)
+
+    def stabbing_count(self, point):
+        """
+        Кількість інтервалів, що містять точку, за O(log n):
+        (кількість початків <= point) - (кількість кінців < point).
+        :param point: Точка.
+        :return: Кількість інтервалів.
+        """
+        started = self.by_start.count_less((point, float("inf"), float("inf")))
+        finished = self.by_end.count_less((point, float("-inf"), float("-inf")))
+        return started - finished
+
+
+INDEX_TYPES = {
+    INDEX_HASH: HashIndex,
+    INDEX_SORTED: SortedIndex,
+    INDEX_INTERVAL: IntervalIndex
+}
+
+
+def make_index(field, kind):
+    """
+    Створення індексу заданого виду для поля.
+    :param field: Об'єкт Field.
+    :param kind: Вид індексу ("hash" або "sorted").
+    :return: Об'єкт індексу.
+    """
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Невідомий тип індексу: {kind}")
+    if field.data_type is PictureFile:
+        raise ValueError(f"Колонку '{field.name}' типу picture не можна індексувати.")
+    return INDEX_TYPES[kind](field)
@@ -0,0 +1,227 @@
+import json
+from row import Row
+from schema import Schema
+from table import Table
+from storage import STORAGE_ROWS
+
+CHUNK_SIZE = 1 << 16  # Розмір порції читання (символів)
+WHITESPACE = " \t\n\r"
+
+# Режими читання таблиці
+MODE_TABLE = "table"
+MODE_ROWS = "rows"
+MODE_SKIP = "skip"
+
+
+class _Reader:
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        """
+        Покрокове читання JSON-тексту з файлу порціями.
+        :param file: Текстовий файл.
+        :param chunk_size: Розмір порції читання.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size=None):
+        """
+        Дочитування наступної порції; прочитана частина буфера відкидається.
+        :param size: Мінімальна кількість символів для читання.
+        :return: False, якщо файл закінчився.
+        """
+        if self.eof:
+            return False
+        chunk = self.file.read(max(size or 0, self.chunk_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self):
+        """
+        Перший непробільний символ без його споживання.
+        :return: Символ або "" в кінці файлу.
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        """
+        Споживання очікуваного символу.
+        :param char: Очікуваний символ.
+        :raises ValueError: Якщо у файлі інший символ.
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Некоректний JSON: очікувався '{char}', знайдено '{found}'.")
+        self.position += 1
+
+    def value(self):
+        """
+        Читання одного повного JSON-значення (рядка, числа, словника тощо).
+        :return: Розібране значення.
+        """
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # Число в кінці буфера може продовжуватись у наступній порції
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+    def items(self):
+        """
+        Ітерація по ключах JSON-об'єкта; значення читає код, що викликає.
+        :return: Генератор ключів.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.position += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.position += 1
+                continue
+            self.expect("}")
+            return
+
+    def elements(self):
+        """
+        Ітерація по елементах JSON-масиву без накопичення їх у пам'яті.
+        :return: Генератор значень.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.position += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.position += 1
+                continue
+            self.expect("]")
+            return
+
+
+def _deserializer(schema, blobs, dictionaries=None):
+    """
+    Функція відновлення рядків таблиці з урахуванням сховища зображень
+    та словників колонок, записаних кодами.
+    """
+    if blobs is None and not dictionaries:
+        return schema.deserializer
+    return schema.compile_deserializer(blobs, dictionaries)
+
+
+def _read_table(reader, name, mode=MODE_TABLE, blobs=None):
+    """
+    Потокове читання об'єкта таблиці; рядки обробляються по одному.
+    Типи значень визначаються схемою таблиці, а не вмістом рядків.
+    :param reader: Об'єкт _Reader, встановлений на початок таблиці.
+    :param name: Ключ таблиці у файлі.
+    :param mode: "table" - видати один об'єкт Table, "rows" - видавати рядки (Row),
+                 "skip" - пропустити таблицю, нічого не створюючи.
+    :param blobs: Сховище BlobStore для зображень, збережених посиланням.
+    :return: Генератор.
+    """
+    meta = {"name": name, "storage": STORAGE_ROWS}
+    pending_rows = []  # Рядки, що трапились до схеми
+    schema = None
+    table = None
+    for key in reader.items():
+        if key != "rows":
+            meta[key] = reader.value()
+            continue
+        if mode == MODE_SKIP:
+            for _ in reader.elements():
+                pass
+            continue
+        if "schema" in meta:
+            schema = Schema.from_dict(meta["schema"])
+            deserialize = _deserializer(schema, blobs, meta.get("dictionaries"))
+        for row_data in reader.elements():
+            if schema is None:
+                pending_rows.append(row_data)
+            elif mode == MODE_ROWS:
+                yield Row(deserialize(row_data))
+            else:
+                if table is None:
+                    table = Table(meta["name"], schema, meta["storage"])
+                table.rows.append(deserialize(row_data))
+    if mode == MODE_SKIP:
+        return
+    if schema is None:
+        if "schema" not in meta:
+            raise ValueError(f"Таблиця '{name}' не містить схеми.")
+        schema = Schema.from_dict(meta["schema"])
+        deserialize = _deserializer(schema, blobs, meta.get("dictionaries"))
+    if mode == MODE_ROWS:
+        for row_data in pending_rows:
+            yield Row(deserialize(row_data))
+        return
+    if table is None:
+        table = Table(meta["name"], schema, meta["storage"])
+    for row_data in pending_rows:
+        table.rows.append(deserialize(row_data))
+    table.rows.assign_ids(meta.get("ids"), meta.get("next_id"))
+    table.lsn = meta.get("lsn", 0)
+    for definition in meta.get("indexes", []):
+        table.create_index(definition["column"], definition["kind"])
+    yield table
+
+
+def iter_tables(file, chunk_size=CHUNK_SIZE, blobs=None):
+    """
+    Потокове завантаження таблиць з JSON-файлу, таблиця за таблицею.
+    :param file: Текстовий файл у форматі Database.save_to_disk.
+    :param chunk_size: Розмір порції читання.
+    :param blobs: Сховище BlobStore для зображень.
+    :return: Генератор пар (назва, Table).
+    """
+    reader = _Reader(file, chunk_size)
+    for name in reader.items():
+        for table in _read_table(reader, name, MODE_TABLE, blobs):
+            yield name, table
+
+
+def iter_rows(filename, table_name, chunk_size=CHUNK_SIZE, blobs=None):
+    """
+    Перегляд рядків однієї таблиці без завантаження решти бази даних.
+    :param filename: Ім'я JSON-файлу.
+    :param table_name: Назва таблиці.
+    :param chunk_size: Розмір порції читання.
+    :param blobs: Сховище BlobStore для зображень.
+    :return: Генератор об'єктів Row.
+    :raises ValueError: Якщо таблицю не знайдено.
+    """
+    with open(filename, 'r', encoding='utf-8') as file:
+        reader = _Reader(file, chunk_size)
+        for name in reader.items():
+            if name == table_name:
+                yield from _read_table(reader, name, MODE_ROWS, blobs)
+                return
+            # Інші таблиці пропускаються рядок за рядком
+            for _ in _read_table(reader, name, MODE_SKIP):
+                pass
+    raise ValueError(f"Таблиця з іменем '{table_name}' не знайдена.")
@@ -0,0 +1,82 @@
+import mmap
+from collections.abc import MutableMapping
+import binary_format
+from custom_types import PictureFile
+
+
+class LazyTables(MutableMapping):
+    def __init__(self, tables=None):
+        """
+        Словник таблиць, що декодує таблиці з бінарного файлу лише при першому зверненні.
+        :param tables: Початковий словник уже завантажених таблиць.
+        """
+        self._tables = dict(tables or {})  # Уже декодовані таблиці
+        self._pending = {}  # {назва: (memoryview файлу, зміщення блоку, сховище зображень)}
+        self._maps = []  # Відкриті mmap-файли
+
+    def open(self, filename, blobs=None):
+        """
+        Відображення бінарного файлу в пам'ять та індексація його таблиць.
+        Колонки не читаються, доки таблиця не знадобиться.
+        :param filename: Ім'я бінарного файлу.
+        :param blobs: Сховище BlobStore для зображень.
+        """
+        with open(filename, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(mapped)
+        for name, offset in binary_format.index_tables(buffer).items():
+            self._tables.pop(name, None)
+            self._pending[name] = (buffer, offset, blobs)
+        self._maps.append(mapped)
+
+    def is_loaded(self, name):
+        """
+        Перевірка, чи таблицю вже декодовано.
+        :param name: Назва таблиці.
+        :return: True, якщо таблиця в пам'яті.
+        """
+        return name in self._tables
+
+    def __getitem__(self, name):
+        if name not in self._tables:
+            if name not in self._pending:
+                raise KeyError(name)
+            buffer, offset, blobs = self._pending.pop(name)
+            self._tables[name] = binary_format.decode_table(buffer, offset, zero_copy=True, blobs=blobs)
+        return self._tables[name]
+
+    def __setitem__(self, name, table):
+        self._pending.pop(name, None)
+        self._tables[name] = table
+
+    def __delitem__(self, name):
+        if name in self._pending:
+            del self._pending[name]
+        else:
+            del self._tables[name]
+
+    def __contains__(self, name):
+        return name in self._tables or name in self._pending
+
+    def __iter__(self):
+        yield from list(self._tables)
+        yield from list(self._pending)
+
+    def __len__(self):
+        return len(self._tables) + len(self._pending)
+
+    def detach(self):
+        """
+        Декодування всіх таблиць і копіювання зображень з mmap у пам'ять,
+        після чого файли можна безпечно перезаписати.
+        Зображення зі сховища BlobStore не копіюються: його файли не змінюються.
+        """
+        for name in list(self._pending):
+            self[name]
+        for table in self._tables.values():
+            for field in table.schema.fields:
+                if field.data_type is PictureFile:
+                    for picture in table.column(field.name):
+                        if picture.blob is None:
+                            picture.data  # Примусове копіювання байтів
+        self._maps.clear()
@@ -0,0 +1,101 @@
+import threading
+
+
+class _Guard:
+    def __init__(self, acquire, release):
+        """
+        Контекстний менеджер для пари функцій захоплення/звільнення блокування.
+        """
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._release()
+
+
+class RWLock:
+    def __init__(self):
+        """
+        Блокування читання/запису: багато потоків можуть читати одночасно,
+        запис виконується монопольно. Потоки, що чекають на запис, мають пріоритет
+        перед новими читачами (запис не голодує при постійному читанні), а читачі,
+        що чекали під час запису, проходять перед наступним записувачем
+        (читання не голодує при постійному записі).
+        Обидва режими повторно вхідні для того самого потоку; потік, що пише,
+        може також читати, але потік, що лише читає, не може почати запис.
+        """
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0  # Кількість утримань блокування читання (усіма потоками)
+        self._writer = None  # Ідентифікатор потоку, що пише
+        self._write_depth = 0
+        self._waiting_writers = 0
+        self._releases = 0  # Кількість завершених записів (для черговості читачів)
+        self._waiting_readers = 0
+        self._readers_turn = False  # Читачі, що чекали під час запису, входять перед наступним записом
+        self._local = threading.local()  # Глибина читання поточного потоку
+        self._read_guard = _Guard(self.acquire_read, self.release_read)
+        self._write_guard = _Guard(self.acquire_write, self.release_write)
+
+    def read(self):
+        """
+        Контекстний менеджер блокування читання: with lock.read(): ...
+        """
+        return self._read_guard
+
+    def write(self):
+        """
+        Контекстний менеджер блокування запису: with lock.write(): ...
+        """
+        return self._write_guard
+
+    def acquire_read(self):
+        depth = getattr(self._local, "depth", 0)
+        with self._condition:
+            if not depth and self._writer != threading.get_ident():
+                releases = self._releases
+                self._waiting_readers += 1
+                try:
+                    while self._writer is not None or (self._waiting_writers and releases == self._releases):
+                        self._condition.wait()
+                finally:
+                    self._waiting_readers -= 1
+                self._readers_turn = False
+            self._readers += 1
+        self._local.depth = depth + 1
+
+    def release_read(self):
+        self._local.depth -= 1
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if getattr(self._local, "depth", 0):
+                raise RuntimeError("Неможливо почати запис, утримуючи блокування читання.")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers or self._readers_turn:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        with self._condition:
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._releases += 1
+                self._readers_turn = self._waiting_readers > 0
+                self._condition.notify_all()
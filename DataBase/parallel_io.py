@@ -0,0 +1,178 @@
+import collections
+import contextlib
+import itertools
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import binary_format
+from blob_store import BlobStore
+from cache import picture_cache
+from locks import RWLock
+
+CHUNK_ROWS = 50_000  # Кількість рядків в одному сегменті JSON
+ROWS_PLACEHOLDER = '"rows": []'  # Місце вставки рядків в опис таблиці
+
+_jobs = {}  # Таблиці знімків, що зберігаються: {номер: (таблиці, каталог сховища або None)}
+_job_numbers = itertools.count()
+
+
+def _executor(workers, job):
+    """
+    Пул виконавців. Дочірні процеси створюються через fork і успадковують знімок,
+    тож таблиці не серіалізуються для передачі; назад передаються лише готові байти.
+    Там, де fork недоступний, використовуються потоки.
+    :param workers: Кількість виконавців.
+    :param job: Номер запису в _jobs (для ініціалізації дочірніх процесів).
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"),
+                                   initializer=_after_fork, initargs=(job,))
+    return ThreadPoolExecutor(workers)
+
+
+def _after_fork(job):
+    """
+    Ініціалізація дочірнього процесу. Після fork у ньому існує лише один потік, тож
+    блокування, які в момент fork утримували інші потоки батьківського процесу
+    (читачі знімка, завантаження зображень), лишились би зайнятими назавжди.
+    Завдання беруть лише блокування таблиць знімка та кешу зображень - вони створюються заново.
+    Журнал змін, Database.lock та живі таблиці в дочірньому процесі не використовуються.
+    """
+    for table in _jobs[job][0].values():
+        table.lock = RWLock()
+    picture_cache.after_fork()
+
+
+def _store(directory):
+    return BlobStore(directory) if directory is not None else None
+
+
+def _json_rows(job, name, start, stop):
+    """
+    Завдання: серіалізація рядків [start, stop) таблиці у фрагмент JSON-масиву.
+    :return: Кортеж (текст без дужок, хеші зображень, записаних у сховище).
+    """
+    tables, directory = _jobs[job]
+    table = tables[name]
+    store = _store(directory)
+    dictionaries = table.dictionaries()
+    if store is None and not dictionaries:
+        serialize = table.schema.serializer
+    else:
+        serialize = table.schema.compile_serializer(store, dictionaries)
+    rows = table.rows
+    text = json.dumps([serialize(rows[position].data) for position in range(start, stop)])
+    return text[1:-1], store.referenced if store is not None else set()
+
+
+def _binary_column(job, name, field_number):
+    """
+    Завдання: кодування однієї колонки таблиці.
+    :return: Кортеж (байти колонки, хеші зображень, записаних у сховище).
+    """
+    tables, directory = _jobs[job]
+    table = tables[name]
+    store = _store(directory)
+    parts = binary_format.encode_column(table, table.schema.fields[field_number], store)
+    return b"".join(parts), store.referenced if store is not None else set()
+
+
+def _ordered(executor, tasks, window):
+    """
+    Виконання завдань у пулі з результатами в порядку завдань. Одночасно в роботі
+    не більше window завдань, тож готові, але ще не записані сегменти не накопичуються в пам'яті.
+    :param tasks: Ітерований набір кортежів (функція, аргументи...).
+    :return: Генератор результатів.
+    """
+    pending = collections.deque()
+    for task in tasks:
+        pending.append(executor.submit(*task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _write_json(results, tables, store, file):
+    file.write("{")
+    for number, (name, table) in enumerate(tables.items()):
+        head, _, tail = json.dumps(table.to_dict(store, rows=False)).rpartition(ROWS_PLACEHOLDER)
+        file.write(f"{', ' if number else ''}{json.dumps(name)}: {head}\"rows\": [")
+        for chunk_number in range(0, len(table.rows), CHUNK_ROWS):
+            text, referenced = next(results)
+            file.write(", " + text if chunk_number else text)
+            if store is not None:
+                store.referenced |= referenced
+        file.write("]" + tail)
+    file.write("}")
+
+
+def _json_tasks(job, tables):
+    for name, table in tables.items():
+        for start in range(0, len(table.rows), CHUNK_ROWS):
+            yield _json_rows, job, name, start, min(start + CHUNK_ROWS, len(table.rows))
+
+
+def _write_binary(results, tables, store, file):
+    def blocks():
+        for table in tables.values():
+            parts = [binary_format.encode_meta(table, store)]
+            for _ in table.schema.fields:
+                data, referenced = next(results)
+                parts.append(data)
+                if store is not None:
+                    store.referenced |= referenced
+            parts.extend(binary_format.encode_ids(table))
+            yield b"".join(parts)
+
+    binary_format.write_blocks(blocks(), len(tables), file)
+
+
+def _binary_tasks(job, tables):
+    for name, table in tables.items():
+        for field_number in range(len(table.schema.fields)):
+            yield _binary_column, job, name, field_number
+
+
+def _reported(results, total, progress):
+    for done, result in enumerate(results, 1):
+        progress(done, total)
+        yield result
+
+
+def dump(tables, file, binary, workers=None, blobs=None, progress=None):
+    """
+    Посегментний запис таблиць: таблиці (для бінарного формату - окремі колонки,
+    для JSON - частини по CHUNK_ROWS рядків) кодуються окремо, паралельно в пулі
+    виконавців, якщо задано workers, а готові сегменти записуються у файл у сталому
+    порядку. Результат побайтово збігається з послідовним записом (json.dump / binary_format.dump).
+    Таблиці не повинні змінюватись під час запису (використовуйте знімок). Дочірні процеси
+    створюються через fork, тож викликати dump слід без утримуваних блокувань: знімок
+    береться заздалегідь, а блокування таблиць звільняються до запуску виконавців
+    (так працюють Snapshot.save_to_disk і Database.save_to_disk).
+    :param tables: Словник {назва: Table}.
+    :param file: Файл, відкритий у режимі 'wb' (бінарний формат) або 'w' (JSON).
+    :param binary: True - бінарний формат, False - JSON.
+    :param workers: Кількість виконавців (None - кодування в поточному потоці).
+    :param blobs: Сховище BlobStore для зображень.
+    :param progress: Функція progress(записано сегментів, усього сегментів), що викликається
+                     після кожного сегмента; виняток з неї перериває запис.
+    """
+    job = next(_job_numbers)
+    _jobs[job] = (tables, blobs.directory if blobs is not None else None)
+    tasks = list(_binary_tasks(job, tables) if binary else _json_tasks(job, tables))
+    try:
+        with contextlib.ExitStack() as stack:
+            if workers is None:
+                results = (task[0](*task[1:]) for task in tasks)
+            else:
+                executor = stack.enter_context(_executor(workers, job))
+                results = _ordered(executor, tasks, 2 * workers)
+            if progress is not None:
+                results = _reported(results, len(tasks), progress)
+            if binary:
+                _write_binary(results, tables, blobs, file)
+            else:
+                _write_json(results, tables, blobs, file)
+    finally:
+        del _jobs[job]
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import struct
+
+FRAME_HEADER = struct.Struct(">I")  # Довжина тіла кадру в байтах
+MAX_FRAME = 64 * 2 ** 20  # Найбільший допустимий кадр
+BATCH_SIZE = 1000  # Кількість рядків в одному кадрі потокового результату
+
+# Типи помилок, що передаються клієнту без змін; інші стають RuntimeError
+ERRORS = {error.__name__: error for error in (ValueError, TypeError, IndexError, KeyError, ConnectionError)}
+
+
+async def read_frame(reader):
+    """
+    Читання одного кадру: 4 байти довжини (big-endian) і тіло у JSON.
+    :param reader: Об'єкт asyncio.StreamReader.
+    :return: Словник-повідомлення або None, якщо з'єднання закрито між кадрами.
+    :raises ValueError: Якщо кадр більший за MAX_FRAME.
+    """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError as error:
+        if not error.partial:
+            return None
+        raise
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f"Кадр завеликий: {length} байт.")
+    return json.loads(await reader.readexactly(length))
+
+
+def write_frame(writer, message):
+    """
+    Запис кадру в буфер з'єднання (надсилання чекає на writer.drain()).
+    :param writer: Об'єкт asyncio.StreamWriter.
+    :param message: JSON-сумісний словник.
+    :raises ValueError: Якщо повідомлення більше за MAX_FRAME.
+    """
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    if len(body) > MAX_FRAME:
+        raise ValueError(f"Повідомлення завелике: {len(body)} байт.")
+    writer.write(FRAME_HEADER.pack(len(body)) + body)
+
+
+def value_codecs(schema, encode):
+    """
+    Функції перетворення значень колонок для передачі (як у файлі JSON: зображення - base64,
+    інтервали - словники). На відміну від серіалізатора схеми, підходять і для часткових
+    рядків (результатів select).
+    :param schema: Схема таблиці.
+    :param encode: True - у JSON-сумісний вигляд, False - назад.
+    :return: Функція convert(data).
+    """
+    codecs = {}
+    for field in schema.fields:
+        codec = field.encoder() if encode else field.decoder()
+        if codec is not None:
+            codecs[field.name] = codec
+
+    def convert(data):
+        return {name: codecs[name](value) if name in codecs else value for name, value in data.items()}
+
+    return convert
+
+
+def condition_codecs(schema, encode):
+    """
+    Функція перетворення значення умови пошуку (find, where) для передачі. Значення колонки
+    перетворюється як у value_codecs, для "in" - кожен елемент списку. Межі "overlaps",
+    точка "contains" і значення частини інтервалу ("колонка.start") - числа і передаються як є.
+    :param schema: Схема таблиці.
+    :param encode: True - у JSON-сумісний вигляд, False - назад.
+    :return: Функція convert(колонка, оператор, значення).
+    """
+    codecs = {}
+    for field in schema.fields:
+        codec = field.encoder() if encode else field.decoder()
+        if codec is not None:
+            codecs[field.name] = codec
+
+    def convert(column, op, value):
+        codec = codecs.get(column)
+        if codec is None or op in ("overlaps", "contains"):
+            return value
+        if op == "in":
+            return [codec(option) for option in value]
+        return codec(value)
+
+    return convert
+
+
+def error_message(request_id, error):
+    """
+    Відповідь з помилкою виконання запиту.
+    :param request_id: Ідентифікатор запиту.
+    :param error: Об'єкт винятку.
+    :return: Словник-повідомлення.
+    """
+    return {"id": request_id, "error": str(error), "type": type(error).__name__}
+
+
+def raise_error(message):
+    """
+    Відтворення винятку з відповіді сервера на боці клієнта.
+    :param message: Словник-відповідь з полем "error".
+    """
+    raise ERRORS.get(message.get("type"), RuntimeError)(message["error"])
@@ -0,0 +1,257 @@
+import heapq
+import operator
+from itertools import islice
+from indexes import index_key, INDEX_HASH, INDEX_SORTED, INDEX_INTERVAL
+
+
+def _overlaps(value, bounds):
+    low, high = bounds
+    return value.start <= high and value.end >= low and value.start <= value.end
+
+
+def _contains(value, point):
+    return value.start <= point <= value.end
+
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, options: value in options,
+    "overlaps": _overlaps,  # Для інтервалів: value - пара (low, high)
+    "contains": _contains  # Для інтервалів: value - точка
+}
+
+# Межі діапазону для впорядкованого індексу: (low, high, include_low, include_high)
+RANGE_BOUNDS = {
+    "==": lambda value: (value, value, True, True),
+    "<": lambda value: (None, value, True, False),
+    "<=": lambda value: (None, value, True, True),
+    ">": lambda value: (value, None, False, True),
+    ">=": lambda value: (value, None, True, True)
+}
+
+SNAPSHOT_THRESHOLD = 1000  # Результати, не обмежені цією кількістю рядків, читаються зі знімка таблиці
+
+
+class Query:
+    def __init__(self, table):
+        """
+        Побудова запиту до таблиці. Запит виконується ліниво під час ітерації.
+        :param table: Об'єкт Table.
+        """
+        self.table = table
+        self._conditions = []  # Умови: (колонка, частина, оператор, значення) або функція
+        self._columns = None  # Колонки для вибірки (None - усі)
+        self._order = None  # (колонка, частина, за спаданням)
+        self._limit = None
+        self._offset = 0
+
+    def _parse_column(self, column):
+        """
+        Розбір назви колонки; для інтервалів можна вказати частину: "колонка.start" або "колонка.end".
+        :param column: Назва колонки.
+        :return: Кортеж (назва, частина або None).
+        """
+        name, _, part = column.partition(".")
+        self.table.schema.get_field(name)
+        if part and part not in ("start", "end"):
+            raise ValueError(f"Невідома частина колонки: {column}")
+        return name, part or None
+
+    def where(self, column, op=None, value=None):
+        """
+        Додавання умови фільтрації (умови поєднуються через "і").
+        :param column: Назва колонки або функція, що приймає словник даних рядка.
+        :param op: Оператор: ==, !=, <, <=, >, >=, in, overlaps, contains.
+        :param value: Значення для порівняння.
+        :return: Цей самий запит.
+        """
+        if callable(column):
+            self._conditions.append(column)
+            return self
+        if op not in OPERATORS:
+            raise ValueError(f"Невідомий оператор: {op}")
+        name, part = self._parse_column(column)
+        self._conditions.append((name, part, op, value))
+        return self
+
+    def select(self, *columns):
+        """
+        Вибір колонок результату; інші колонки не читаються.
+        :param columns: Назви колонок.
+        :return: Цей самий запит.
+        """
+        for column in columns:
+            self.table.schema.get_field(column)
+        self._columns = list(columns)
+        return self
+
+    def order_by(self, column, descending=False):
+        """
+        Сортування результату за колонкою.
+        :param column: Назва колонки (для інтервалів можна "колонка.start"/"колонка.end").
+        :param descending: Сортування за спаданням.
+        :return: Цей самий запит.
+        """
+        name, part = self._parse_column(column)
+        self._order = (name, part, descending)
+        return self
+
+    def limit(self, count):
+        """
+        Обмеження кількості рядків результату.
+        :param count: Максимальна кількість рядків.
+        :return: Цей самий запит.
+        """
+        if count < 0:
+            raise ValueError("Ліміт не може бути від'ємним.")
+        self._limit = count
+        return self
+
+    def offset(self, count):
+        """
+        Пропуск перших рядків результату.
+        :param count: Кількість рядків для пропуску.
+        :return: Цей самий запит.
+        """
+        if count < 0:
+            raise ValueError("Зміщення не може бути від'ємним.")
+        self._offset = count
+        return self
+
+    def _value(self, rows, position, name, part):
+        value = rows.get_value(position, name)
+        return getattr(value, part) if part else value
+
+    def _index_candidates(self, condition):
+        """
+        Позиції рядків, що задовольняють умову, отримані з індексу.
+        :param condition: Умова (колонка, частина, оператор, значення).
+        :return: Відсортований список позицій або None, якщо індекс не підходить.
+        """
+        name, part, op, value = condition
+        indexes = self.table.indexes
+        row_ids = None
+        if op == "==" and part is None and (name, INDEX_HASH) in indexes:
+            row_ids = indexes[(name, INDEX_HASH)].lookup(value)
+        elif op in RANGE_BOUNDS and (name, INDEX_SORTED) in indexes:
+            index = indexes[(name, INDEX_SORTED)]
+            if part in index.parts:
+                low, high, include_low, include_high = RANGE_BOUNDS[op](value)
+                row_ids = sorted(index.range(low, high, part, include_low, include_high))
+        elif op in ("overlaps", "contains") and part is None and (name, INDEX_INTERVAL) in indexes:
+            index = indexes[(name, INDEX_INTERVAL)]
+            row_ids = index.overlaps(*value) if op == "overlaps" else index.contains_point(value)
+        if row_ids is None:
+            if op in ("==", "in") and part is None:
+                # Колонка зі словниковим кодуванням: порівняння цілих кодів замість рядків
+                return self.table.rows.equal_positions(name, [value] if op == "==" else value)
+            return None
+        # Індекси зберігають ідентифікатори рядків; вони зростають разом з позиціями
+        return self.table.rows.positions(row_ids)
+
+    def _plan(self):
+        """
+        Вибір умови, яку можна виконати через індекс.
+        :return: Кортеж (позиції-кандидати або None, умови, що лишились).
+        """
+        for i, condition in enumerate(self._conditions):
+            if callable(condition):
+                continue
+            candidates = self._index_candidates(condition)
+            if candidates is not None:
+                return candidates, self._conditions[:i] + self._conditions[i + 1:]
+        return None, list(self._conditions)
+
+    def _matches(self, rows, position, conditions):
+        for condition in conditions:
+            if callable(condition):
+                if not condition(rows[position].data):
+                    return False
+                continue
+            name, part, op, value = condition
+            if not OPERATORS[op](self._value(rows, position, name, part), value):
+                return False
+        return True
+
+    def positions(self):
+        """
+        Позиції рядків результату з урахуванням фільтрів, сортування, зміщення та ліміту.
+        :return: Генератор індексів рядків.
+        """
+        candidates, conditions = self._plan()
+        return self._select(self.table.rows, candidates, conditions)
+
+    def _select(self, rows, candidates, conditions):
+        """
+        Відбір, сортування та обмеження позицій рядків сховища rows.
+        :param rows: Сховище таблиці (живої або знімка).
+        :param candidates: Позиції-кандидати з індексу або None (повний перегляд).
+        :param conditions: Умови, що лишились після індексу.
+        :return: Генератор індексів рядків.
+        """
+        if candidates is None:
+            candidates = range(len(rows))
+        matched = (position for position in candidates if self._matches(rows, position, conditions))
+
+        if self._order is not None:
+            name, part, descending = self._order
+
+            def key(position):
+                return index_key(self._value(rows, position, name, part))
+
+            if self._limit is not None:
+                # Top-k через купу замість повного сортування
+                select = heapq.nlargest if descending else heapq.nsmallest
+                matched = iter(select(self._offset + self._limit, matched, key=key))
+            else:
+                matched = iter(sorted(matched, key=key, reverse=descending))
+
+        stop = None if self._limit is None else self._offset + self._limit
+        return islice(matched, self._offset, stop)
+
+    def _build(self, table, positions):
+        columns = self._columns
+        if columns is None:
+            columns = [field.name for field in table.schema.fields]
+        get_value = table.rows.get_value
+        for position in positions:
+            yield {name: get_value(position, name) for name in columns}
+
+    def __iter__(self):
+        """
+        Потокове отримання результату: кожен рядок - словник лише з вибраних колонок.
+        Рядки відбираються та читаються зі знімка таблиці по одному, тож зміни з інших
+        потоків під час ітерації не впливають на результат, а пам'ять не залежить від його розміру.
+        Результат, заздалегідь обмежений лімітом або кандидатами з індексу, будується одразу
+        під блокуванням: живий знімок змусив би наступну зміну таблиці копіювати сховище.
+        """
+        with self.table.lock.read():
+            candidates, conditions = self._plan()
+            bounded = min(len(candidates) if candidates is not None else len(self.table.rows),
+                          self._limit if self._limit is not None else len(self.table.rows))
+            if bounded <= SNAPSHOT_THRESHOLD:
+                result = list(self._build(self.table, self._select(self.table.rows, candidates, conditions)))
+            else:
+                view = self.table.freeze()
+                result = self._build(view, self._select(view.rows, candidates, conditions))
+        yield from result
+
+    def all(self):
+        """
+        Виконання запиту з накопиченням результату у списку.
+        :return: Список словників.
+        """
+        return list(self)
+
+    def count(self):
+        """
+        Кількість рядків результату (без побудови словників).
+        :return: Кількість рядків.
+        """
+        with self.table.lock.read():
+            return sum(1 for _ in self.positions())
@@ -1,13 +1,84 @@
+from functools import lru_cache
 from custom_types import PictureFile, RealInterval
 
 
+class RowLayout:
+    __slots__ = ("names", "positions")
+
+    def __init__(self, names):
+        """
+        Спільний для рядків однієї схеми опис колонок: рядок зберігає лише кортеж значень,
+        а назви та їхні позиції зберігаються один раз.
+        :param names: Назви колонок у порядку значень.
+        """
+        self.names = tuple(names)
+        self.positions = {name: position for position, name in enumerate(self.names)}
+
+
+@lru_cache(maxsize=256)
+def layout_of(names):
+    """
+    Спільний опис колонок для кортежу назв (для рядків, створених зі словника).
+    :param names: Кортеж назв колонок.
+    :return: Об'єкт RowLayout.
+    """
+    return RowLayout(names)
+
+
 class Row:
-    def __init__(self, data):
+    __slots__ = ("layout", "values")
+
+    def __init__(self, data, layout=None):
+        """
+        Ініціалізація рядка таблиці. Значення зберігаються кортежем у порядку колонок схеми,
+        без словника на кожен рядок.
+        :param data: Дані рядка у вигляді словника або кортеж значень (разом з layout).
+        :param layout: Об'єкт RowLayout для кортежу значень (None - data є словником).
+        """
+        if layout is None:
+            layout = layout_of(tuple(data))
+            data = tuple(data.values())
+        self.layout = layout
+        self.values = data
+
+    @property
+    def data(self):
         """
-        Ініціалізація рядка таблиці.
-        :param data: Дані рядка у вигляді словника.
+        Дані рядка у вигляді словника {назва: значення} (новий словник при кожному зверненні).
         """
-        self.data = data
+        return dict(zip(self.layout.names, self.values))
+
+    def __getitem__(self, name):
+        return self.values[self.layout.positions[name]]
+
+    def get(self, name, default=None):
+        position = self.layout.positions.get(name)
+        return default if position is None else self.values[position]
+
+    def keys(self):
+        return self.layout.names
+
+    def items(self):
+        return zip(self.layout.names, self.values)
+
+    def __iter__(self):
+        return iter(self.layout.names)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, name):
+        return name in self.layout.positions
+
+    def __eq__(self, other):
+        if not isinstance(other, Row):
+            return NotImplemented
+        return self.layout.names == other.layout.names and self.values == other.values
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Row({self.data!r})"
 
     def to_dict(self):
         """
@@ -15,7 +86,7 @@ class Row:
         :return: Словник із серіалізованими даними.
         """
         serialized_data = {}
-        for key, value in self.data.items():
+        for key, value in self.items():
             if isinstance(value, PictureFile):
                 serialized_data[key] = value.to_base64()
             elif isinstance(value, RealInterval):
@@ -25,12 +96,20 @@ class Row:
         return serialized_data
 
     @staticmethod
-    def from_dict(data):
+    def from_dict(data, schema=None):
         """
         Створення рядка з словника.
+        Зі схемою типи колонок відомі наперед і значення перетворюються
+        заздалегідь побудованими функціями схеми, без перевірки вмісту.
+        Без схеми типи вгадуються за значеннями (лише для сумісності:
+        зображення розпізнаються тільки у форматі JPEG, а рядок, що починається з "/9j/",
+        буде помилково прочитано як зображення).
         :param data: Словник із десеріалізованими даними.
+        :param schema: Схема таблиці (об'єкт Schema).
         :return: Об'єкт Row.
         """
+        if schema is not None:
+            return Row(schema.deserializer(data))
         deserialized_data = {}
         for key, value in data.items():
             if isinstance(value, str) and value.startswith("/9j/"):  # Base64 для картинки
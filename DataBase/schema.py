@@ -1,15 +1,39 @@
 from custom_types import PictureFile
 from custom_types import RealInterval
+from row import RowLayout
+
+# Відповідність типів полів їхнім назвам у збережених файлах
+TYPE_NAMES = {
+    int: "int",
+    float: "float",
+    str: "str",
+    "char": "char",
+    PictureFile: "picture",
+    RealInterval: "realInvl"
+}
+TYPES_BY_NAME = {name: data_type for data_type, name in TYPE_NAMES.items()}
+
 
 class Field:
-    def __init__(self, name, data_type):
+    __slots__ = ("name", "data_type", "column_id", "dictionary")
+
+    def __init__(self, name, data_type, column_id=None, dictionary=False):
         """
         Ініціалізація поля таблиці.
         :param name: Назва поля.
         :param data_type: Тип даних поля.
+        :param column_id: Сталий ідентифікатор колонки у сховищі
+                          (None - призначається схемою; не змінюється при перейменуванні).
+        :param dictionary: Словникове кодування (лише для str та char): кожне різне значення
+                           зберігається один раз, а рядки - цілими кодами.
+        :raises ValueError: Якщо словникове кодування задано для іншого типу.
         """
+        if dictionary and data_type not in (str, "char"):
+            raise ValueError(f"Словникове кодування можливе лише для колонок str та char, а не '{name}'.")
         self.name = name  # Назва поля
         self.data_type = data_type  # Тип даних поля
+        self.column_id = column_id  # Ідентифікатор колонки, за яким сховище зберігає значення
+        self.dictionary = dictionary  # True - значення зберігаються кодами словника
 
     def validate(self, value):
         """
@@ -26,24 +50,63 @@ class Field:
         else:
             return isinstance(value, self.data_type)
 
+    def checker(self):
+        """
+        Функція перевірки значення з наперед визначеним типом
+        (вибір гілки виконується один раз, а не для кожного значення).
+        :return: Функція, що приймає значення і повертає True/False.
+        """
+        if self.data_type == "char":
+            return lambda value: isinstance(value, str) and len(value) == 1
+        data_type = self.data_type
+        return lambda value: isinstance(value, data_type)
+
+    def encoder(self, blobs=None):
+        """
+        Функція перетворення значення у JSON-сумісний вигляд.
+        :param blobs: Сховище BlobStore; якщо задано, зображення зберігаються в ньому,
+                      а в рядок записується посилання.
+        :return: Функція або None, якщо значення зберігається як є.
+        """
+        if self.data_type is PictureFile:
+            return PictureFile.to_base64 if blobs is None else blobs.encode_picture
+        if self.data_type is RealInterval:
+            return RealInterval.to_dict
+        return None
+
+    def decoder(self, blobs=None):
+        """
+        Функція відновлення значення зі збереженого вигляду.
+        :param blobs: Сховище BlobStore для зображень, збережених посиланням.
+        :return: Функція або None, якщо значення зберігається як є.
+        """
+        if self.data_type is PictureFile:
+            return PictureFile.from_base64 if blobs is None else blobs.decode_picture
+        if self.data_type is RealInterval:
+            return RealInterval.from_dict
+        return None
+
+    @property
+    def type_name(self):
+        """
+        Назва типу поля для збереження.
+        """
+        return TYPE_NAMES.get(self.data_type, str(self.data_type))
+
     def to_dict(self):
         """
         Конвертація поля у словник для збереження.
         :return: Словник із параметрами поля.
         """
-        valid_types = {
-            int: "int",
-            float: "float",
-            str: "str",
-            "char": "char",
-            PictureFile: "picture",
-            RealInterval: "realInvl"
-        }
-        data_type_str = valid_types.get(self.data_type, str(self.data_type))
-        return {
+        data = {
             "name": self.name,
-            "data_type": data_type_str
+            "data_type": self.type_name
         }
+        if self.column_id is not None:
+            data["id"] = self.column_id
+        if self.dictionary:
+            data["dictionary"] = True
+        return data
 
     @staticmethod
     def from_dict(data):
@@ -53,28 +116,72 @@ class Field:
         :return: Об'єкт Field.
         """
         print(f"Відновлення поля: {data}")  # Відладочний друк
-        valid_types = {
-            "int": int,
-            "float": float,
-            "str": str,
-            "char": "char",
-            "picture": PictureFile,
-            "realInvl": RealInterval
-        }
-        field_type = valid_types.get(data["data_type"])
+        field_type = TYPES_BY_NAME.get(data["data_type"])
         if not field_type:
             raise ValueError(f"Невідомий тип даних: {data['data_type']}")
-        return Field(data["name"], field_type)
+        return Field(data["name"], field_type, data.get("id"), data.get("dictionary", False))
+
+
+class BatchValidationError(ValueError):
+    def __init__(self, errors):
+        """
+        Помилки валідації пакета рядків.
+        :param errors: Список пар (позиція рядка у пакеті, виняток).
+        """
+        self.errors = errors
+        details = "; ".join(f"рядок {position}: {error}" for position, error in errors[:10])
+        super().__init__(f"Помилки валідації у {len(errors)} рядках: {details}")
 
 
 class Schema:
-    def __init__(self, fields):
+    def __init__(self, fields, next_column_id=0):
         """
-        Ініціалізація схеми таблиці.
+        Ініціалізація схеми таблиці. Назви та порядок колонок визначає лише схема,
+        а сховище звертається до значень за сталими ідентифікаторами колонок,
+        тож перейменування та перестановка колонок не змінюють рядки.
         :param fields: Список об'єктів Field.
+        :param next_column_id: Найменший ідентифікатор для нових колонок.
         """
+        self.next_column_id = next_column_id  # Ідентифікатори не використовуються повторно
         self.fields = fields  # Список об'єктів Field
 
+    @property
+    def fields(self):
+        return self._fields
+
+    @fields.setter
+    def fields(self, fields):
+        """
+        Заміна списку полів; скомпільовані функції будуються заново.
+        Полям без ідентифікатора колонки призначаються нові ідентифікатори.
+        :param fields: Список об'єктів Field.
+        :raises ValueError: Якщо назви або ідентифікатори колонок повторюються.
+        """
+        for field in fields:
+            if field.column_id is not None:
+                self.next_column_id = max(self.next_column_id, field.column_id + 1)
+        for field in fields:
+            if field.column_id is None:
+                field.column_id = self.next_column_id
+                self.next_column_id += 1
+        if len({field.name for field in fields}) != len(fields):
+            raise ValueError("Назви колонок у схемі повинні бути унікальними.")
+        if len({field.column_id for field in fields}) != len(fields):
+            raise ValueError("Ідентифікатори колонок у схемі повинні бути унікальними.")
+        self._fields = fields
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Перекомпіляція функцій валідації та (де)серіалізації.
+        Потрібно викликати після зміни полів на місці (назв, типів, складу списку).
+        """
+        self.column_ids = {field.name: field.column_id for field in self.fields}  # {назва: ідентифікатор}
+        self.layout = RowLayout(field.name for field in self.fields)  # Спільний опис колонок рядків Row
+        self.validator = self.compile_validator()
+        self.serializer = self.compile_serializer()
+        self.deserializer = self.compile_deserializer()
+
     def validate(self, data):
         """
         Перевірка, чи відповідають дані схемі.
@@ -82,12 +189,120 @@ class Schema:
         :raises ValueError: Якщо в даних відсутнє поле.
         :raises TypeError: Якщо тип даних не відповідає схемі.
         """
+        self.validator(data)
+
+    def _check_fields(self, data):
+        """
+        Послідовна перевірка полів з тими ж повідомленнями про помилки, що й Schema.validate.
+        :param data: Дані для перевірки.
+        """
         for field in self.fields:
             if field.name not in data:
                 raise ValueError(f"Поле '{field.name}' відсутнє у даних.")
-            if not field.validate(data[field.name]):
+            if not field.checker()(data[field.name]):
                 raise TypeError(f"Поле '{field.name}' повинно бути типу {field.data_type}.")
 
+    def compile_validator(self):
+        """
+        Побудова функції валідації рядка для поточного набору полів.
+        Генерується один вираз з перевірками всіх полів; типи визначаються один раз при побудові.
+        Якщо перевірка не пройшла, повільний шлях знаходить перше невалідне поле.
+        :return: Функція validate(data) з тими ж винятками, що й Schema.validate.
+        """
+        namespace = {"_check_fields": self._check_fields}
+        checks = []
+        for i, field in enumerate(self.fields):
+            value = f"data[{field.name!r}]"
+            if field.data_type == "char":
+                checks.append(f"(isinstance({value}, str) and len({value}) == 1)")
+            else:
+                namespace[f"_type{i}"] = field.data_type
+                checks.append(f"isinstance({value}, _type{i})")
+        source = (
+            "def validate(data):\n"
+            "    try:\n"
+            f"        if {' and '.join(checks) or 'True'}:\n"
+            "            return\n"
+            "    except KeyError:\n"
+            "        pass\n"
+            "    _check_fields(data)\n"
+        )
+        exec(source, namespace)
+        return namespace["validate"]
+
+    def compile_column_mappers(self, column_ids, getters=None):
+        """
+        Побудова функцій перетворення рядка між словником за назвами колонок та кортежем
+        значень у сховищі, де значення розташовані за ідентифікаторами колонок column_ids.
+        Генерується один вираз-кортеж з постійними позиціями (швидше за цикл по колонках).
+        :param column_ids: Ідентифікатори колонок у порядку значень кортежів сховища
+                           (можуть містити колонки, яких уже немає у схемі).
+        :param getters: Словник {ідентифікатор: функція(values)} для колонок, значення яких
+                        читаються не напряму (значення за замовчуванням, зміна типу).
+        :return: Кортеж функцій (pack(data) -> кортеж сховища,
+                 unpack(values) -> кортеж значень у порядку полів схеми; None, якщо кортеж сховища вже такий).
+        """
+        getters = getters or {}
+        names = {field.column_id: field.name for field in self.fields}
+        positions = {column_id: position for position, column_id in enumerate(column_ids)}
+        namespace = {f"_get{column_id}": getter for column_id, getter in getters.items()}
+        to_values = "".join(f"data[{names[column_id]!r}], " if column_id in names else "None, "
+                            for column_id in column_ids)
+        from_values = "".join(f"_get{field.column_id}(values), " if field.column_id in getters
+                              else f"values[{positions[field.column_id]}], " for field in self.fields)
+        source = (
+            "def pack(data):\n"
+            f"    return ({to_values})\n"
+            "def unpack(values):\n"
+            f"    return ({from_values})\n"
+        )
+        exec(source, namespace)
+        in_order = not getters and list(column_ids) == [field.column_id for field in self.fields]
+        return namespace["pack"], None if in_order else namespace["unpack"]
+
+    def _compile_converter(self, converters):
+        """
+        Побудова функції, що копіює словник рядка і перетворює лише колонки з converters.
+        :param converters: Список пар (назва колонки, функція).
+        :return: Функція convert(data).
+        """
+        if not converters:
+            return dict
+
+        def convert(data):
+            result = dict(data)
+            for name, function in converters:
+                result[name] = function(result[name])
+            return result
+
+        return convert
+
+    def compile_serializer(self, blobs=None, dictionaries=None):
+        """
+        Побудова функції серіалізації даних рядка у JSON-сумісний словник.
+        :param blobs: Сховище BlobStore для зображень (None - base64 у рядку).
+        :param dictionaries: Словник {назва колонки: список різних значень}; значення
+                             цих колонок записуються номерами у списку (None - як є).
+        :return: Функція serialize(data).
+        """
+        converters = [(field.name, field.encoder(blobs)) for field in self.fields if field.encoder(blobs) is not None]
+        for name, values in (dictionaries or {}).items():
+            converters.append((name, {value: code for code, value in enumerate(values)}.__getitem__))
+        return self._compile_converter(converters)
+
+    def compile_deserializer(self, blobs=None, dictionaries=None):
+        """
+        Побудова функції відновлення даних рядка зі збереженого словника.
+        :param blobs: Сховище BlobStore для зображень, збережених посиланням.
+        :param dictionaries: Словник {назва колонки: список різних значень} для колонок,
+                             записаних кодами (рядки отримують спільні об'єкти зі списку).
+        :return: Функція deserialize(data).
+        """
+        converters = [(field.name, field.decoder(blobs)) for field in self.fields if field.decoder(blobs) is not None]
+        for name, values in (dictionaries or {}).items():
+            converters.append((name, values.__getitem__))
+        return self._compile_converter(converters)
+
     def has_field(self, field_name):
         """
         Перевірка наявності поля у схемі.
@@ -96,14 +311,29 @@ class Schema:
         """
         return any(field.name == field_name for field in self.fields)
 
+    def get_field(self, field_name):
+        """
+        Пошук поля за назвою.
+        :param field_name: Назва поля.
+        :return: Об'єкт Field.
+        :raises ValueError: Якщо поле відсутнє у схемі.
+        """
+        for field in self.fields:
+            if field.name == field_name:
+                return field
+        raise ValueError(f"Колонка '{field_name}' відсутня у схемі.")
+
     def to_dict(self):
         """
         Конвертація схеми у словник для збереження.
         :return: Словник із параметрами схеми.
         """
-        return {
+        data = {
             "fields": [field.to_dict() for field in self.fields]
         }
+        if self.next_column_id > max(self.column_ids.values(), default=-1) + 1:
+            data["next_column_id"] = self.next_column_id  # Після видалення колонок
+        return data
 
     @staticmethod
     def from_dict(data):
@@ -113,4 +343,4 @@ class Schema:
         :return: Об'єкт Schema.
         """
         fields = [Field.from_dict(field_data) for field_data in data["fields"]]
-        return Schema(fields)
+        return Schema(fields, data.get("next_column_id", 0))
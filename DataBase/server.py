@@ -0,0 +1,215 @@
+import argparse
+import asyncio
+import itertools
+import os
+import wal
+from database import Database
+from protocol import BATCH_SIZE, read_frame, write_frame, value_codecs, condition_codecs, error_message
+from schema import Schema
+
+
+class DatabaseServer:
+    def __init__(self, database, batch_size=BATCH_SIZE):
+        """
+        Доступ до бази даних через сокет. Запити одного з'єднання виконуються по черзі
+        в порядку надходження, але клієнт може надсилати їх, не чекаючи відповідей
+        (конвеєр); відповідь містить ідентифікатор запиту. Наступний запит читається
+        лише після того, як відповідь на попередній передано в сокет (writer.drain),
+        тож повільний клієнт гальмує власне з'єднання, а не накопичує відповіді в пам'яті сервера.
+        Обробники та читання результатів запитів виконуються в пулі потоків (таблиці
+        захищені власними блокуваннями), тож великий запит не зупиняє цикл подій
+        і не затримує інші з'єднання.
+        :param database: Об'єкт Database.
+        :param batch_size: Кількість рядків у кадрі потокового результату запиту.
+        """
+        self.database = database
+        self.batch_size = batch_size
+        self.handlers = {
+            "tables": self._tables,
+            "schema": self._schema,
+            "create_table": self._create_table,
+            "delete_table": self._delete_table,
+            "add_row": self._add_row,
+            "add_rows": self._add_rows,
+            "edit_row": self._edit_row,
+            "delete_row": self._delete_row,
+            "get_row": self._get_row,
+            "find": self._find,
+            "count": self._count
+        }
+
+    def _table(self, message):
+        name = message.get("table")
+        if name not in self.database.tables:
+            raise ValueError(f"Таблиця з іменем '{name}' не знайдена.")
+        return self.database.tables[name]
+
+    def _tables(self, message):
+        return sorted(self.database.tables)
+
+    def _schema(self, message):
+        return self._table(message).schema.to_dict()
+
+    def _create_table(self, message):
+        self.database.create_table(message["table"], Schema.from_dict(message["schema"]),
+                                   message.get("storage", "rows"))
+
+    def _delete_table(self, message):
+        self.database.delete_table(message["table"])
+
+    def _add_row(self, message):
+        table = self._table(message)
+        table.add_row(value_codecs(table.schema, encode=False)(message["data"]))
+
+    def _add_rows(self, message):
+        table = self._table(message)
+        decode = value_codecs(table.schema, encode=False)
+        table.add_rows([decode(data) for data in message["rows"]])
+
+    def _edit_row(self, message):
+        table = self._table(message)
+        table.edit_row(message["index"], value_codecs(table.schema, encode=False)(message["data"]))
+
+    def _delete_row(self, message):
+        self._table(message).delete_row(message["index"])
+
+    def _get_row(self, message):
+        table = self._table(message)
+        return value_codecs(table.schema, encode=True)(table.get_row(message["index"]).data)
+
+    def _find(self, message):
+        table = self._table(message)
+        column = message["column"]
+        return table.find(column, condition_codecs(table.schema, encode=False)(column, "==", message["value"]))
+
+    def _query(self, message):
+        """
+        Побудова запиту до таблиці з опису: where, select, order_by, limit, offset.
+        """
+        table = self._table(message)
+        decode = condition_codecs(table.schema, encode=False)
+        query = table.query()
+        for column, op, value in message.get("where", ()):
+            query.where(column, op, decode(column, op, value))
+        if message.get("select"):
+            query.select(*message["select"])
+        if message.get("order_by"):
+            query.order_by(message["order_by"], message.get("descending", False))
+        if message.get("limit") is not None:
+            query.limit(message["limit"])
+        if message.get("offset"):
+            query.offset(message["offset"])
+        return query
+
+    def _count(self, message):
+        return self._query(message).count()
+
+    async def _stream_query(self, request_id, message, writer):
+        """
+        Потокова відповідь на запит: кадри по batch_size рядків, останній кадр містить
+        поле "result" з кількістю рядків. Після кожного кадру сервер чекає, доки клієнт
+        прочитає дані (зворотний тиск), тож великий результат не копіюється в пам'ять цілком.
+        """
+        loop = asyncio.get_running_loop()
+        table = self._table(message)
+        encode = value_codecs(table.schema, encode=True)
+        rows = iter(await loop.run_in_executor(None, self._query, message))
+
+        def next_batch():
+            return [encode(row) for row in itertools.islice(rows, self.batch_size)]
+
+        count = 0
+        while True:
+            batch = await loop.run_in_executor(None, next_batch)
+            count += len(batch)
+            if len(batch) < self.batch_size:
+                break
+            write_frame(writer, {"id": request_id, "rows": batch})
+            await writer.drain()
+        write_frame(writer, {"id": request_id, "rows": batch, "result": count})
+
+    async def _dispatch(self, message, writer):
+        request_id = message.get("id")
+        op = message.get("op")
+        try:
+            if op == "query":
+                await self._stream_query(request_id, message, writer)
+                return
+            handler = self.handlers.get(op)
+            if handler is None:
+                raise ValueError(f"Невідома операція: {op}")
+            result = await asyncio.get_running_loop().run_in_executor(None, handler, message)
+        except Exception as error:  # Помилка запиту повертається клієнту, з'єднання лишається відкритим
+            write_frame(writer, error_message(request_id, error))
+            return
+        write_frame(writer, {"id": request_id, "result": result})
+
+    async def handle(self, reader, writer):
+        """
+        Обслуговування одного з'єднання (обробник для asyncio.start_server).
+        """
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message is None:
+                    break
+                await self._dispatch(message, writer)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as error:  # Пошкоджений або завеликий кадр - з'єднання закривається
+            write_frame(writer, error_message(None, error))
+        finally:
+            writer.close()
+
+
+async def serve(database, host="127.0.0.1", port=0, path=None, batch_size=BATCH_SIZE):
+    """
+    Запуск сервера бази даних.
+    :param database: Об'єкт Database.
+    :param host: Адреса для TCP.
+    :param port: Порт TCP (0 - будь-який вільний).
+    :param path: Шлях до Unix-сокета; якщо задано, TCP не використовується.
+    :param batch_size: Кількість рядків у кадрі потокового результату.
+    :return: Об'єкт asyncio.Server.
+    """
+    handler = DatabaseServer(database, batch_size).handle
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path)
+    return await asyncio.start_server(handler, host, port)
+
+
+def main():
+    """
+    Запуск сервера з командного рядка: база завантажується один раз, зміни
+    записуються в журнал, а при зупинці виконується контрольна точка.
+    """
+    parser = argparse.ArgumentParser(description="Сервер бази даних")
+    parser.add_argument("filename", help="Файл бази даних")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Шлях до Unix-сокета замість TCP")
+    arguments = parser.parse_args()
+
+    database = Database()
+    if os.path.exists(arguments.filename) or wal.segment_paths(arguments.filename):
+        database.load_from_disk(arguments.filename, log=True)
+    else:
+        database.open_log(arguments.filename)
+
+    async def run():
+        server = await serve(database, arguments.host, arguments.port, arguments.unix)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        database.checkpoint()
+        database.close_log()
+
+
+if __name__ == "__main__":
+    main()
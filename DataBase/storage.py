@@ -0,0 +1,1078 @@
+import copy
+from array import array
+from bisect import bisect_left, insort
+from functools import partial
+from itertools import compress, repeat
+from operator import itemgetter
+from row import Row
+from custom_types import RealInterval
+
+STORAGE_ROWS = "rows"
+STORAGE_COLUMNAR = "columnar"
+COMPACT_RATIO = 0.25  # Частка видалених слотів, після якої сховище ущільнюється
+COMPACT_MIN = 1024  # Менша кількість видалених слотів не ущільнюється
+
+
+class _Conversion:
+    def __init__(self, old_field, field, old, converter):
+        """
+        Стан поступового перетворення типу колонки: нові значення записуються
+        під новим ідентифікатором колонки, а ще не перетворені обчислюються зі старих під час читання.
+        :param old_field: Поле до зміни типу.
+        :param field: Поле нового типу.
+        :param old: Джерело старих значень (функція для рядкового сховища, колонка - для колонкового).
+        :param converter: Функція перетворення старого значення.
+        """
+        self.old_field = old_field
+        self.field = field
+        self.old = old  # Не змінюється після початку перетворення
+        self.converter = converter
+        self.check = field.checker()
+        self.done = 0  # Кількість оброблених слотів
+
+    def convert(self, value):
+        """
+        Перетворення одного значення з перевіркою нового типу.
+        :raises TypeError: Якщо результат не відповідає новому типу.
+        """
+        result = self.converter(value)
+        if not self.check(result):
+            raise TypeError(f"Значення колонки '{self.field.name}' повинно бути типу {self.field.data_type}.")
+        return result
+
+    def copy(self):
+        return copy.copy(self)
+
+
+class _Slots:
+    """
+    Спільна для сховищ нумерація рядків. Рядки займають слоти в порядку додавання;
+    кожен рядок отримує сталий ідентифікатор (зростаючий, не використовується повторно).
+    Видалення лише позначає слот (надгробок) за O(log n), а сховище ущільнюється,
+    коли видалених слотів стає більше за COMPACT_RATIO, тож зсув решти рядків
+    виконується рідко і його вартість розподіляється між видаленнями.
+    Позиція рядка (індекс) - номер серед живих рядків, як і раніше.
+    """
+
+    def _init_slots(self):
+        self.ids = array('q')  # Ідентифікатори рядків у слотах (зростають)
+        self.deleted = []  # Відсортовані номери видалених слотів
+        self.next_id = 0  # Ідентифікатор наступного доданого рядка
+        self.conversions = {}  # Незавершені зміни типу: {ідентифікатор нової колонки: _Conversion}
+        self.stale = False  # True, якщо рядки ще містять дані видалених колонок (прибирає ущільнення)
+
+    @property
+    def schema(self):
+        return self._schema
+
+    @schema.setter
+    def schema(self, schema):
+        """
+        Заміна схеми (перейменування, перестановка, зміна складу колонок).
+        """
+        self._schema = schema
+        self._refresh()
+
+    def __len__(self):
+        return len(self.ids) - len(self.deleted)
+
+    def _new_ids(self, count):
+        self.ids.extend(range(self.next_id, self.next_id + count))
+        self.next_id += count
+        return self.next_id - 1
+
+    def _slot(self, position):
+        """
+        Слот рядка за позицією серед живих рядків.
+        :raises IndexError: Якщо позиція поза межами.
+        """
+        length = len(self)
+        if position < 0:
+            position += length
+        if position < 0 or position >= length:
+            raise IndexError("Індекс рядка поза межами.")
+        deleted = self.deleted
+        # Кількість видалених слотів перед шуканим: живих слотів перед deleted[i] рівно deleted[i] - i
+        low, high = 0, len(deleted)
+        while low < high:
+            middle = (low + high) // 2
+            if deleted[middle] - middle <= position:
+                low = middle + 1
+            else:
+                high = middle
+        return position + low
+
+    def _slot_of(self, row_id):
+        """
+        Слот рядка за ідентифікатором.
+        :raises IndexError: Якщо рядка з таким ідентифікатором немає.
+        """
+        slot = bisect_left(self.ids, row_id)
+        if slot == len(self.ids) or self.ids[slot] != row_id or self._is_deleted(slot):
+            raise IndexError(f"Рядок з ідентифікатором {row_id} не знайдено.")
+        return slot
+
+    def has_id(self, row_id):
+        """
+        Чи є в сховищі живий рядок з таким ідентифікатором.
+        :param row_id: Ідентифікатор рядка.
+        """
+        slot = bisect_left(self.ids, row_id)
+        return slot < len(self.ids) and self.ids[slot] == row_id and not self._is_deleted(slot)
+
+    def _is_deleted(self, slot):
+        i = bisect_left(self.deleted, slot)
+        return i < len(self.deleted) and self.deleted[i] == slot
+
+    def ids_are_positions(self):
+        """
+        True, якщо ідентифікатори збігаються з позиціями рядків.
+        """
+        # Ідентифікатори строго зростають від нуля, тож достатньо перевірити останній
+        length = len(self)
+        return not length or self.row_id(length - 1) == length - 1
+
+    def row_id(self, position):
+        """
+        Ідентифікатор рядка за позицією.
+        :param position: Позиція рядка.
+        :return: Ідентифікатор.
+        """
+        return self.ids[self._slot(position)]
+
+    def position_of(self, row_id):
+        """
+        Поточна позиція рядка за ідентифікатором.
+        :param row_id: Ідентифікатор рядка.
+        :return: Позиція.
+        :raises IndexError: Якщо рядка з таким ідентифікатором немає.
+        """
+        slot = self._slot_of(row_id)
+        return slot - bisect_left(self.deleted, slot)
+
+    def positions(self, row_ids):
+        """
+        Позиції рядків за ідентифікаторами (порядок зберігається).
+        :param row_ids: Ідентифікатори живих рядків.
+        :return: Список позицій.
+        """
+        if self.ids_are_positions():
+            return list(row_ids)
+        ids, deleted = self.ids, self.deleted
+        result = []
+        for row_id in row_ids:
+            slot = bisect_left(ids, row_id)
+            result.append(slot - bisect_left(deleted, slot))
+        return result
+
+    def live_ids(self):
+        """
+        Ідентифікатори живих рядків у порядку позицій.
+        :return: Масив array('q').
+        """
+        return self.live(self.ids)
+
+    def _live_mask(self):
+        mask = bytearray(b"\x01") * len(self.ids)
+        for slot in self.deleted:
+            mask[slot] = 0
+        return mask
+
+    def live(self, values):
+        """
+        Значення лише живих слотів з послідовності, впорядкованої за слотами.
+        Без видалених рядків повертається сама послідовність (без копіювання).
+        :param values: Масив array або список значень слотів.
+        :return: Масив або список того ж типу.
+        """
+        if not self.deleted:
+            return values
+        live_values = compress(values, self._live_mask())
+        if isinstance(values, array):
+            return array(values.typecode, live_values)
+        return list(live_values)
+
+    def delete_ids(self, row_ids):
+        """
+        Видалення рядків за ідентифікаторами: вартість пропорційна кількості
+        видалених рядків (без зсуву решти до ущільнення).
+        :param row_ids: Ідентифікатори рядків.
+        :raises IndexError: Якщо рядка немає (тоді нічого не видаляється).
+        """
+        slots = sorted({self._slot_of(row_id) for row_id in row_ids})
+        for slot in slots:
+            self._release(slot)
+        if len(slots) == 1:
+            insort(self.deleted, slots[0])
+        else:
+            self.deleted.extend(slots)
+            self.deleted.sort()  # Злиття двох відсортованих послідовностей
+        if len(self.deleted) >= COMPACT_MIN and len(self.deleted) > COMPACT_RATIO * len(self.ids):
+            self.compact()
+
+    def delete(self, index):
+        """
+        Видалення рядка за позицією.
+        :param index: Позиція рядка.
+        """
+        self.delete_ids([self.row_id(index)])
+
+    def rollback(self, next_id):
+        """
+        Відкат незавершеного додавання: рядки з ідентифікаторами від next_id відкидаються.
+        :param next_id: Значення next_id до початку додавання.
+        """
+        slots = bisect_left(self.ids, next_id)
+        self._truncate_values(slots)
+        del self.ids[slots:]
+        self.next_id = next_id
+
+    def dictionary(self, name):
+        """
+        Різні значення колонки (для запису колонок зі словниковим кодуванням).
+        :param name: Назва колонки.
+        :return: Список значень.
+        """
+        encoded = self.dictionary_codes(name)
+        return encoded[0] if encoded is not None else list(dict.fromkeys(self.column(name)))
+
+    def compact(self):
+        """
+        Ущільнення: видалені слоти та дані видалених колонок прибираються,
+        ідентифікатори рядків не змінюються. Під час зміни типу колонки не виконується.
+        """
+        if (not self.deleted and not self.stale) or self.conversions:
+            return
+        mask = self._live_mask() if self.deleted else None
+        self._compact_values(mask)
+        if mask is not None:
+            self.ids = array('q', compress(self.ids, mask))
+            self.deleted = []
+        self.stale = False
+
+    def assign_ids(self, ids=None, next_id=None):
+        """
+        Відновлення збережених ідентифікаторів рядків після завантаження.
+        :param ids: Ідентифікатори рядків у порядку позицій (None - 0, 1, 2, ...).
+        :param next_id: Ідентифікатор наступного рядка.
+        :raises ValueError: Якщо ідентифікатори не зростають або їх кількість не збігається з рядками.
+        """
+        if ids is not None:
+            ids = array('q', ids)
+            if len(ids) != len(self.ids) or any(a >= b for a, b in zip(ids, ids[1:])):
+                raise ValueError("Ідентифікатори рядків повинні зростати і відповідати рядкам.")
+            self.ids = ids
+        self.next_id = max(next_id or 0, self.ids[-1] + 1 if self.ids else 0)
+
+    def _copy_slots(self, storage):
+        storage.ids = self.ids[:]
+        storage.deleted = list(self.deleted)
+        storage.next_id = self.next_id
+        storage.conversions = {column_id: conversion.copy() for column_id, conversion in self.conversions.items()}
+        storage.stale = self.stale
+        return storage
+
+
+def _get_default(position, default, values):
+    return values[position] if position < len(values) else default
+
+
+def _get_converted(position, conversion, values):
+    if position < len(values):
+        return values[position]
+    return conversion.convert(conversion.old(values))
+
+
+class RowStorage(_Slots):
+    def __init__(self, schema):
+        """
+        Рядкове сховище: значення кожного рядка зберігаються кортежем у порядку
+        ідентифікаторів колонок column_order. Об'єкти Row з назвами колонок створюються
+        при зверненні до рядка, тож перейменування та перестановка колонок не змінюють
+        збережені рядки. Колонка, додана до наявних рядків, не записується в них:
+        коротші кортежі отримують значення за замовчуванням під час читання, а дані
+        видалених колонок залишаються в кортежах до ущільнення.
+        :param schema: Об'єкт Schema таблиці.
+        """
+        self._rows = []  # Кортежі значень за слотами; None - видалений рядок
+        self.column_order = [field.column_id for field in schema.fields]  # Ідентифікатори колонок у порядку значень кортежів
+        self.defaults = {}  # Значення за замовчуванням колонок, яких немає в коротших кортежах: {ідентифікатор: значення}
+        self._init_slots()
+        self.schema = schema
+
+    def _refresh(self):
+        """
+        Побудова функцій перетворення рядків для поточної схеми та порядку значень у кортежах.
+        """
+        positions = {column_id: position for position, column_id in enumerate(self.column_order)}
+        getters = {}
+        for field in self._schema.fields:
+            column_id = field.column_id
+            if column_id in self.conversions:
+                getters[column_id] = partial(_get_converted, positions[column_id], self.conversions[column_id])
+            elif column_id in self.defaults:
+                getters[column_id] = partial(_get_default, positions[column_id], self.defaults[column_id])
+        self._positions = positions
+        self._getters = getters
+        self._pack, self._unpack = self._schema.compile_column_mappers(self.column_order, getters)
+        self._layout = self._schema.layout
+
+    def _row(self, values):
+        return Row(values if self._unpack is None else self._unpack(values), self._layout)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if not self.deleted and index >= 0:
+            return self._row(self._rows[index])
+        return self._row(self._rows[self._slot(index)])
+
+    def __iter__(self):
+        layout, unpack = self._layout, self._unpack
+        if unpack is None:
+            for values in self._rows:
+                if values is not None:
+                    yield Row(values, layout)
+        else:
+            for values in self._rows:
+                if values is not None:
+                    yield Row(unpack(values), layout)
+
+    def _values(self, data):
+        return self._pack(data)
+
+    def append(self, data):
+        """
+        Додавання рядка в кінець сховища.
+        :param data: Дані рядка у вигляді словника.
+        :return: Ідентифікатор рядка.
+        """
+        self._rows.append(self._pack(data))
+        return self._new_ids(1)
+
+    def replace(self, index, data):
+        """
+        Заміна рядка за індексом.
+        :param index: Індекс рядка.
+        :param data: Нові дані рядка.
+        """
+        self._rows[self._slot(index)] = self._pack(data)
+
+    def get_by_id(self, row_id):
+        """
+        Рядок за ідентифікатором.
+        :param row_id: Ідентифікатор рядка.
+        :return: Об'єкт Row.
+        """
+        return self._row(self._rows[self._slot_of(row_id)])
+
+    def replace_by_id(self, row_id, data):
+        """
+        Заміна рядка за ідентифікатором.
+        :param row_id: Ідентифікатор рядка.
+        :param data: Нові дані рядка.
+        """
+        self._rows[self._slot_of(row_id)] = self._pack(data)
+
+    def extend_columns(self, columns):
+        """
+        Масове додавання рядків з колонок значень (без валідації).
+        :param columns: Словник {назва колонки: послідовність значень}.
+        """
+        names = {column_id: name for name, column_id in self._schema.column_ids.items()}
+        sources = [columns[names[column_id]] if column_id in names else repeat(None)
+                   for column_id in self.column_order]
+        count = len(self._rows)
+        self._rows.extend(zip(*sources))
+        self._new_ids(len(self._rows) - count)
+
+    def _release(self, slot):
+        self._rows[slot] = None
+
+    def _truncate_values(self, slots):
+        del self._rows[slots:]
+
+    def _compact_values(self, mask):
+        rows = self._rows if mask is None else compress(self._rows, mask)
+        if self.stale:
+            # Кортежі переписуються лише з колонками схеми у її порядку
+            unpack = self._unpack
+            self._rows = [unpack(values) for values in rows] if unpack is not None else list(rows)
+            self.column_order = [field.column_id for field in self._schema.fields]
+            self.defaults = {}
+            self._refresh()
+        else:
+            self._rows = list(rows)
+
+    def _getter(self, name):
+        column_id = self._schema.column_ids[name]
+        return self._getters.get(column_id) or itemgetter(self._positions[column_id])
+
+    def get_value(self, index, name):
+        """
+        Значення однієї колонки рядка.
+        :param index: Індекс рядка.
+        :param name: Назва колонки.
+        """
+        slot = index if not self.deleted and index >= 0 else self._slot(index)
+        return self._getter(name)(self._rows[slot])
+
+    def column(self, name):
+        """
+        Значення однієї колонки у порядку рядків.
+        :param name: Назва колонки.
+        :return: Список значень.
+        """
+        rows = self._rows if not self.deleted else [values for values in self._rows if values is not None]
+        return list(map(self._getter(name), rows))
+
+    def dictionary_codes(self, name):
+        """
+        Рядкове сховище не зберігає коди: значення лежать у кортежах рядків.
+        :return: None.
+        """
+        return None
+
+    def equal_positions(self, name, values):
+        """
+        Пошук за кодами недоступний у рядковому сховищі.
+        :return: None.
+        """
+        return None
+
+    def recode(self, schema, field):
+        """
+        Зміна словникового кодування колонки: змінюється лише схема
+        (кодування впливає на збереження у файл).
+        """
+        self.schema = schema
+
+    def add_column(self, schema, field, default):
+        """
+        Додавання колонки без зміни наявних рядків.
+        :param schema: Нова схема з доданим полем.
+        :param field: Нове поле.
+        :param default: Значення колонки для наявних рядків.
+        """
+        self.column_order = self.column_order + [field.column_id]
+        if self._rows:
+            self.defaults[field.column_id] = default
+        self.schema = schema
+
+    def drop_column(self, schema, field):
+        """
+        Видалення колонки: значення залишаються в кортежах рядків до ущільнення.
+        :param schema: Нова схема без поля.
+        :param field: Видалене поле.
+        """
+        self.defaults.pop(field.column_id, None)
+        if self._rows:
+            self.stale = True
+        else:
+            self.column_order = [column_id for column_id in self.column_order if column_id != field.column_id]
+        self.schema = schema
+
+    def start_conversion(self, schema, old_field, field, converter):
+        """
+        Початок зміни типу колонки: нові значення дописуються в кортежі рядків пакетами
+        (convert_batch), а до того обчислюються зі старих під час читання.
+        :param schema: Нова схема з полем нового типу.
+        :param old_field: Поле до зміни типу.
+        :param field: Поле нового типу (з новим ідентифікатором колонки).
+        :param converter: Функція перетворення старого значення.
+        """
+        old = self._getters.get(old_field.column_id) or itemgetter(self._positions[old_field.column_id])
+        self.conversions[field.column_id] = _Conversion(old_field, field, old, converter)
+        self.column_order = self.column_order + [field.column_id]
+        self.schema = schema
+
+    def convert_batch(self, column_id, size):
+        """
+        Перетворення наступного пакета рядків: кортеж рядка замінюється новим,
+        доповненим значеннями за замовчуванням та перетвореним значенням.
+        :param column_id: Ідентифікатор нової колонки.
+        :param size: Кількість слотів у пакеті.
+        :return: True, якщо перетворено всі рядки.
+        """
+        conversion = self.conversions[column_id]
+        position = self._positions[column_id]
+        padding = tuple(self.defaults.get(other) for other in self.column_order[:position])
+        rows = self._rows
+        stop = min(conversion.done + size, len(rows))
+        for slot in range(conversion.done, stop):
+            values = rows[slot]
+            if values is not None and len(values) <= position:
+                rows[slot] = values + padding[len(values):] + (conversion.convert(conversion.old(values)),)
+        conversion.done = stop
+        return stop == len(rows)
+
+    def finish_conversion(self, column_id):
+        """
+        Завершення зміни типу після перетворення всіх рядків (старі значення прибирає ущільнення).
+        :param column_id: Ідентифікатор нової колонки.
+        """
+        conversion = self.conversions.pop(column_id)
+        self.defaults.pop(conversion.old_field.column_id, None)
+        self.stale = self.stale or bool(self._rows)
+        self._refresh()
+
+    def abort_conversion(self, schema, column_id):
+        """
+        Скасування зміни типу: повернення попередньої схеми, старі значення не змінювались.
+        :param schema: Схема до зміни типу.
+        :param column_id: Ідентифікатор нової колонки.
+        """
+        del self.conversions[column_id]
+        self.stale = self.stale or bool(self._rows)
+        self.schema = schema
+
+    def copy(self):
+        """
+        Копія сховища для копіювання під час запису: копіюється лише список,
+        кортежі рядків спільні (вони незмінні).
+        :return: Об'єкт RowStorage.
+        """
+        storage = RowStorage.__new__(RowStorage)
+        storage._rows = list(self._rows)
+        storage.column_order = list(self.column_order)
+        storage.defaults = dict(self.defaults)
+        self._copy_slots(storage)
+        storage.schema = self._schema
+        return storage
+
+
+class ObjectColumn:
+    EMPTY = None  # Значення для слотів видалених рядків
+
+    def __init__(self):
+        """
+        Колонка довільних Python-об'єктів (str, char, picture).
+        """
+        self.values = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, value):
+        self.values.append(value)
+
+    def extend(self, values):
+        self.values.extend(values)
+
+    def fill(self, value, count):
+        """
+        Додавання count однакових значень (без циклу на рівні Python).
+        """
+        self.extend([value] * count)
+
+    def get(self, index):
+        return self.values[index]
+
+    def set(self, index, value):
+        self.values[index] = value
+
+    def delete(self, index):
+        del self.values[index]
+
+    def truncate(self, length):
+        """
+        Відкидання значень після перших length (відкат додавання).
+        """
+        del self.values[length:]
+
+    def release(self, index):
+        """
+        Звільнення значення видаленого рядка (до ущільнення слот лишається).
+        """
+        self.values[index] = None
+
+    def keep(self, mask):
+        """
+        Залишення лише значень, позначених у mask (ущільнення).
+        :param mask: Послідовність 0/1 за слотами.
+        """
+        if isinstance(self.values, array):
+            self.values = array(self.values.typecode, compress(self.values, mask))
+        else:
+            self.values = list(compress(self.values, mask))
+
+    def copy(self):
+        column = self.__class__()
+        column.values = self.values[:]
+        return column
+
+
+class IntColumn(ObjectColumn):
+    EMPTY = 0
+
+    def __init__(self):
+        """
+        Колонка цілих чисел у масиві array('q').
+        """
+        self.values = array('q')
+
+    def release(self, index):
+        pass  # Числа не утримують пам'ять - значення лишається до ущільнення
+
+
+class FloatColumn(ObjectColumn):
+    EMPTY = 0.0
+
+    def __init__(self):
+        """
+        Колонка дійсних чисел у масиві array('d').
+        """
+        self.values = array('d')
+
+    def release(self, index):
+        pass
+
+
+class DictColumn:
+    EMPTY = ""
+
+    def __init__(self):
+        """
+        Колонка str або char зі словниковим кодуванням: кожне різне значення зберігається
+        один раз у словнику, а рядки - масивом цілих кодів (для категоріальних даних).
+        """
+        self.codes = array('i')  # Коди значень за слотами
+        self.dictionary = []  # Різні значення за кодами
+        self.lookup = {}  # {значення: код}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def encode(self, value):
+        """
+        Код значення; нове значення додається до словника.
+        """
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        return code
+
+    @property
+    def values(self):
+        return list(map(self.dictionary.__getitem__, self.codes))
+
+    def append(self, value):
+        self.codes.append(self.encode(value))
+
+    def extend(self, values):
+        lookup, encode = self.lookup, self.encode
+        self.codes.extend(array('i', [lookup[value] if value in lookup else encode(value) for value in values]))
+
+    def fill(self, value, count):
+        self.codes.extend(array('i', [self.encode(value)]) * count)
+
+    def get(self, index):
+        return self.dictionary[self.codes[index]]
+
+    def set(self, index, value):
+        self.codes[index] = self.encode(value)
+
+    def delete(self, index):
+        del self.codes[index]
+
+    def truncate(self, length):
+        del self.codes[length:]  # Значення словника без рядків не утворює групи і прибирається ущільненням
+
+    def release(self, index):
+        pass  # Код видаленого рядка не утримує окремого об'єкта
+
+    def keep(self, mask):
+        """
+        Залишення лише кодів, позначених у mask (ущільнення); значення словника,
+        що більше не використовуються, видаляються з перенумерацією кодів.
+        :param mask: Послідовність 0/1 за слотами.
+        """
+        codes = array('i', compress(self.codes, mask))
+        used = sorted(set(codes))
+        if len(used) < len(self.dictionary):
+            remap = [0] * len(self.dictionary)
+            for code, old in enumerate(used):
+                remap[old] = code
+            codes = array('i', map(remap.__getitem__, codes))
+            self.dictionary = [self.dictionary[old] for old in used]
+            self.lookup = {value: code for code, value in enumerate(self.dictionary)}
+        self.codes = codes
+
+    def copy(self):
+        column = DictColumn()
+        column.codes = self.codes[:]
+        column.dictionary = list(self.dictionary)
+        column.lookup = dict(self.lookup)
+        return column
+
+
+class IntervalColumn:
+    EMPTY = RealInterval(0.0, 0.0)
+
+    def __init__(self):
+        """
+        Колонка інтервалів: окремі масиви початків і кінців.
+        """
+        self.starts = array('d')
+        self.ends = array('d')
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def values(self):
+        return [RealInterval(start, end) for start, end in zip(self.starts, self.ends)]
+
+    def append(self, value):
+        self.starts.append(value.start)
+        self.ends.append(value.end)
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def fill(self, value, count):
+        self.starts.extend(array('d', [value.start]) * count)
+        self.ends.extend(array('d', [value.end]) * count)
+
+    def get(self, index):
+        return RealInterval(self.starts[index], self.ends[index])
+
+    def set(self, index, value):
+        self.starts[index] = value.start
+        self.ends[index] = value.end
+
+    def delete(self, index):
+        del self.starts[index]
+        del self.ends[index]
+
+    def truncate(self, length):
+        del self.starts[length:]
+        del self.ends[length:]
+
+    def release(self, index):
+        pass
+
+    def keep(self, mask):
+        self.starts = array('d', compress(self.starts, mask))
+        self.ends = array('d', compress(self.ends, mask))
+
+    def copy(self):
+        column = IntervalColumn()
+        column.starts = self.starts[:]
+        column.ends = self.ends[:]
+        return column
+
+
+def make_column(field):
+    """
+    Створення колонки відповідного типу для поля схеми.
+    :param field: Об'єкт Field.
+    :return: Об'єкт колонки.
+    """
+    if field.dictionary:
+        return DictColumn()
+    elif field.data_type is int:
+        return IntColumn()
+    elif field.data_type is float:
+        return FloatColumn()
+    elif field.data_type is RealInterval:
+        return IntervalColumn()
+    else:
+        return ObjectColumn()
+
+
+def _get_converted_slot(column, conversion, slot):
+    if slot < len(column):
+        return column.get(slot)
+    return conversion.convert(conversion.old.get(slot))
+
+
+class ColumnarStorage(_Slots):
+    def __init__(self, schema):
+        """
+        Колонкове сховище: кожне поле схеми зберігається окремою типізованою колонкою
+        за ідентифікатором колонки. Об'єкти Row створюються лише при зверненні до рядка.
+        :param schema: Об'єкт Schema таблиці.
+        """
+        self.columns = {field.column_id: make_column(field) for field in schema.fields}
+        self._init_slots()
+        self.schema = schema
+
+    def _refresh(self):
+        """
+        Побудова функцій читання значення за номером слота для колонок схеми
+        (для колонки, тип якої змінюється, ще не перетворені значення обчислюються зі старих).
+        """
+        getters = {}
+        for field in self._schema.fields:
+            column = self.columns[field.column_id]
+            conversion = self.conversions.get(field.column_id)
+            getters[field.column_id] = column.get if conversion is None else partial(_get_converted_slot, column, conversion)
+        self._getters = getters
+        self._row_getters = list(getters.values())  # У порядку полів схеми
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._row_view(self._slot(index))
+
+    def __iter__(self):
+        deleted = set(self.deleted)
+        for slot in range(len(self.ids)):
+            if slot not in deleted:
+                yield self._row_view(slot)
+
+    def _row_view(self, slot):
+        """
+        Побудова об'єкта Row для рядка за номером слота.
+        :param slot: Номер слота.
+        :return: Об'єкт Row.
+        """
+        return Row(tuple([getter(slot) for getter in self._row_getters]), self._schema.layout)
+
+    def append(self, data):
+        """
+        Додавання рядка в кінець усіх колонок.
+        :param data: Дані рядка у вигляді словника.
+        :return: Ідентифікатор рядка.
+        """
+        try:
+            for name, column_id in self._schema.column_ids.items():
+                self.columns[column_id].append(data[name])
+        except Exception:
+            # Відкат за будь-якої помилки, щоб колонки залишились однакової довжини
+            self._truncate_values(len(self.ids))
+            raise
+        return self._new_ids(1)
+
+    def replace(self, index, data):
+        """
+        Заміна значень рядка за індексом.
+        :param index: Індекс рядка.
+        :param data: Нові дані рядка.
+        """
+        self._set(self._slot(index), data)
+
+    def _set(self, slot, data):
+        for name, column_id in self._schema.column_ids.items():
+            self.columns[column_id].set(slot, data[name])
+
+    def get_by_id(self, row_id):
+        """
+        Рядок за ідентифікатором.
+        :param row_id: Ідентифікатор рядка.
+        :return: Об'єкт Row.
+        """
+        return self._row_view(self._slot_of(row_id))
+
+    def replace_by_id(self, row_id, data):
+        """
+        Заміна значень рядка за ідентифікатором.
+        :param row_id: Ідентифікатор рядка.
+        :param data: Нові дані рядка.
+        """
+        self._set(self._slot_of(row_id), data)
+
+    def extend_columns(self, columns):
+        """
+        Масове додавання рядків з колонок значень (без валідації).
+        :param columns: Словник {назва колонки: послідовність значень}.
+        """
+        count = None
+        for name, values in columns.items():
+            self.columns[self._schema.column_ids[name]].extend(values)
+            count = len(values)
+        if count:
+            self._new_ids(count)
+
+    def _release(self, slot):
+        for column in self.columns.values():
+            column.release(slot)
+
+    def _truncate_values(self, slots):
+        for column in self.columns.values():
+            column.truncate(slots)
+
+    def _compact_values(self, mask):
+        if mask is not None:
+            for column in self.columns.values():
+                column.keep(mask)
+
+    def get_value(self, index, name):
+        """
+        Значення однієї колонки рядка без побудови Row.
+        :param index: Індекс рядка.
+        :param name: Назва колонки.
+        """
+        return self._getters[self._schema.column_ids[name]](self._slot(index))
+
+    def column(self, name):
+        """
+        Значення однієї колонки без створення рядків.
+        Для int та float повертається масив array (без видалених рядків - сам масив колонки).
+        :param name: Назва колонки.
+        :return: Масив або список значень.
+        """
+        return self.live(self.raw_column(name).values)
+
+    def raw_column(self, name):
+        """
+        Об'єкт колонки за назвою (включно зі слотами видалених рядків, див. live).
+        Під час зміни типу колонки повертається тимчасова повністю перетворена копія.
+        :param name: Назва колонки.
+        :return: Об'єкт колонки (IntColumn, IntervalColumn, ...).
+        """
+        column_id = self._schema.column_ids[name]
+        if column_id not in self.conversions:
+            return self.columns[column_id]
+        column = self.columns[column_id].copy()
+        self._convert_slots(column, self.conversions[column_id], len(self.ids))
+        return column
+
+    def _convert_slots(self, column, conversion, stop):
+        """
+        Дописування в нову колонку перетворених значень слотів від її кінця до stop
+        (слоти видалених рядків отримують значення-заповнювач).
+        """
+        start = len(column)
+        dead = set(self.deleted[bisect_left(self.deleted, start):bisect_left(self.deleted, stop)])
+        old, convert, empty = conversion.old, conversion.convert, column.EMPTY
+        column.extend([empty if slot in dead else convert(old.get(slot)) for slot in range(start, stop)])
+
+    def dictionary_codes(self, name):
+        """
+        Словник і коди живих рядків колонки зі словниковим кодуванням.
+        :param name: Назва колонки.
+        :return: Кортеж (список значень, масив кодів) або None, якщо колонка не закодована.
+        """
+        column = self.raw_column(name)
+        if not isinstance(column, DictColumn):
+            return None
+        return list(column.dictionary), self.live(column.codes)
+
+    def equal_positions(self, name, values):
+        """
+        Позиції рядків, значення колонки яких входить у values, за порівнянням цілих кодів.
+        :param name: Назва колонки.
+        :param values: Значення для пошуку.
+        :return: Відсортований список позицій або None, якщо колонка не закодована.
+        """
+        column = self.raw_column(name)
+        if not isinstance(column, DictColumn):
+            return None
+        codes = {column.lookup[value] for value in values if value in column.lookup}
+        if not codes:
+            return []
+        match = codes.pop().__eq__ if len(codes) == 1 else codes.__contains__
+        slots = compress(range(len(column.codes)), map(match, column.codes))
+        if not self.deleted:
+            return list(slots)
+        deleted = set(self.deleted)
+        return self.positions([self.ids[slot] for slot in slots if slot not in deleted])
+
+    def recode(self, schema, field):
+        """
+        Увімкнення або вимкнення словникового кодування колонки (колонка будується заново).
+        :param schema: Нова схема.
+        :param field: Поле колонки з новим значенням dictionary.
+        """
+        self.compact()
+        column = make_column(field)
+        column.extend(self.columns[field.column_id].values)
+        self.columns[field.column_id] = column
+        self.schema = schema
+
+    def add_column(self, schema, field, default):
+        """
+        Додавання колонки, заповненої значенням за замовчуванням (заповнення масиву без циклу Python).
+        :param schema: Нова схема з доданим полем.
+        :param field: Нове поле.
+        :param default: Значення колонки для наявних рядків.
+        """
+        column = make_column(field)
+        column.fill(default, len(self.ids))
+        self.columns[field.column_id] = column
+        self.schema = schema
+
+    def drop_column(self, schema, field):
+        """
+        Видалення колонки разом з її масивом.
+        :param schema: Нова схема без поля.
+        :param field: Видалене поле.
+        """
+        del self.columns[field.column_id]
+        self.schema = schema
+
+    def start_conversion(self, schema, old_field, field, converter):
+        """
+        Початок зміни типу колонки: нова колонка заповнюється пакетами (convert_batch),
+        а значення ще не перетворених слотів обчислюються зі старої колонки під час читання.
+        :param schema: Нова схема з полем нового типу.
+        :param old_field: Поле до зміни типу.
+        :param field: Поле нового типу (з новим ідентифікатором колонки).
+        :param converter: Функція перетворення старого значення.
+        """
+        old = self.columns.pop(old_field.column_id)
+        self.conversions[field.column_id] = _Conversion(old_field, field, old, converter)
+        self.columns[field.column_id] = make_column(field)
+        self.schema = schema
+
+    def convert_batch(self, column_id, size):
+        """
+        Перетворення наступного пакета слотів.
+        :param column_id: Ідентифікатор нової колонки.
+        :param size: Кількість слотів у пакеті.
+        :return: True, якщо перетворено всі слоти.
+        """
+        conversion = self.conversions[column_id]
+        column = self.columns[column_id]
+        stop = min(len(column) + size, len(self.ids))
+        self._convert_slots(column, conversion, stop)
+        conversion.done = stop
+        return stop == len(self.ids)
+
+    def finish_conversion(self, column_id):
+        """
+        Завершення зміни типу: стара колонка звільняється.
+        :param column_id: Ідентифікатор нової колонки.
+        """
+        del self.conversions[column_id]
+        self._refresh()
+
+    def abort_conversion(self, schema, column_id):
+        """
+        Скасування зміни типу: повернення старої колонки та попередньої схеми.
+        :param schema: Схема до зміни типу.
+        :param column_id: Ідентифікатор нової колонки.
+        """
+        conversion = self.conversions.pop(column_id)
+        del self.columns[column_id]
+        self.columns[conversion.old_field.column_id] = conversion.old
+        self.schema = schema
+
+    def copy(self):
+        """
+        Копія сховища для копіювання під час запису (масиви колонок копіюються цілком).
+        :return: Об'єкт ColumnarStorage.
+        """
+        storage = ColumnarStorage.__new__(ColumnarStorage)
+        storage.columns = {column_id: column.copy() for column_id, column in self.columns.items()}
+        self._copy_slots(storage)
+        storage.schema = self._schema
+        return storage
+
+
+def make_storage(kind, schema):
+    """
+    Створення сховища рядків заданого виду.
+    :param kind: "rows" або "columnar".
+    :param schema: Об'єкт Schema таблиці.
+    :return: Об'єкт сховища.
+    """
+    if kind == STORAGE_ROWS:
+        return RowStorage(schema)
+    elif kind == STORAGE_COLUMNAR:
+        return ColumnarStorage(schema)
+    raise ValueError(f"Невідомий тип сховища: {kind}")
@@ -1,93 +1,881 @@
-from schema import Schema
-from row import Row
-from custom_types import PictureFile
+import functools
+import random
+import weakref
+from array import array
+from schema import Schema, Field, BatchValidationError, TYPE_NAMES
+from custom_types import RealInterval
+from storage import make_storage, STORAGE_ROWS
+from locks import RWLock
+from background import BackgroundTask, TaskCancelled
+from query import Query
+from indexes import make_index, index_key, INDEX_HASH, INDEX_SORTED, INDEX_INTERVAL
+
+VALIDATE_FULL = "full"
+VALIDATE_SAMPLE = "sample"
+VALIDATE_NONE = "none"
+SAMPLE_SIZE = 1000  # Кількість рядків для вибіркової валідації
+CONVERT_BATCH = 10_000  # Кількість рядків в одному кроці перетворення типу колонки
+DEFAULT_CONVERTERS = {int: int, float: float, str: str, "char": str}  # Перетворення за замовчуванням для alter_column_type
+
+
+def _mutation(method):
+    """
+    Декоратор методів, що змінюють таблицю: виконання під монопольним блокуванням
+    таблиці та копіювання сховища, якщо його ще використовує знімок.
+    Лічильник змін збільшується лише після успішного виконання.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.write():
+            self._prepare_write()
+            result = method(self, *args, **kwargs)
+            self.version += 1
+            return result
+    return wrapper
+
+
+def _reading(method):
+    """
+    Декоратор методів читання: виконання під спільним блокуванням таблиці
+    (одночасно з іншими читачами, але не під час зміни).
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class Table:
-    def __init__(self, name, schema):
+    def __init__(self, name, schema, storage=STORAGE_ROWS):
         """
         Ініціалізація таблиці з заданою схемою.
+        Методи таблиці безпечні для використання з кількох потоків: читання
+        (find, query, column, get_row, ...) виконуються одночасно, зміни - монопольно.
+        Ітерація по таблиці та результатах запиту виконується по знімку, зробленому
+        на її початку: зміни з інших потоків під час ітерації не видно і вони
+        не спричиняють пропусків чи IndexError. Пряме звернення до self.rows
+        такої гарантії не має. Кілька викликів читання, що мають бачити один і той самий
+        стан, потрібно обгорнути у with table.lock.read().
         :param name: Назва таблиці.
         :param schema: Об'єкт Schema.
+        :param storage: Тип сховища: "rows" (список Row) або "columnar" (типізовані колонки).
         """
         self.name = name  # Назва таблиці
         self.schema = schema  # Об'єкт Schema
-        self.rows = []  # Список рядків (Row)
+        self.storage = storage  # Тип сховища
+        self.rows = make_storage(storage, schema)  # Сховище рядків (Row)
+        self.indexes = {}  # Вторинні індекси: {(колонка, вид): індекс}
+        self.log = None  # Функція запису змін у журнал: log(назва таблиці, операція, поля) -> номер запису
+        self.lsn = 0  # Номер останнього запису журналу, врахованого в таблиці
+        self.lock = RWLock()  # Блокування читання/запису таблиці
+        self.read_only = False  # True для таблиць знімка
+        self.version = 0  # Лічильник змін (для виявлення змін переглядачами таблиці)
+        self._readers = weakref.WeakSet()  # Знімки, що спільно використовують поточне сховище
+        self._dictionaries = None  # Словники колонок знімка (обчислюються один раз)
+        self._conversion = None  # Незавершена зміна типу: (ідентифікатор нової колонки, старе поле, види індексів, стара схема)
+
+    def _prepare_write(self):
+        """
+        Підготовка до зміни: копіювання під час запису. Якщо сховище спільне
+        з живим знімком, таблиця отримує власну копію, а знімок лишається незмінним.
+        Незавершена зміна типу колонки спершу доводиться до кінця.
+        """
+        if self.read_only:
+            raise ValueError(f"Таблиця '{self.name}' у знімку доступна лише для читання.")
+        self._detach()
+        if self._conversion is not None:
+            while not self._convert_step(CONVERT_BATCH):
+                pass
+
+    def _detach(self):
+        """
+        Копіювання сховища, якщо його ще використовує знімок.
+        """
+        if self._readers:
+            self.rows = self.rows.copy()
+            self._readers = weakref.WeakSet()
+
+    def freeze(self):
+        """
+        Незмінна копія таблиці для читання без копіювання даних:
+        сховище спільне, доки таблиця не зміниться. Індекси у знімок не входять
+        (запити до знімка виконуються повним переглядом), зберігаються лише їхні описи.
+        :return: Об'єкт Table лише для читання.
+        """
+        with self.lock.read():
+            view = Table.__new__(Table)
+            view.__dict__.update(self.__dict__)
+            view.indexes = {}
+            view._index_definitions = self.index_definitions()
+            view._conversion = None
+            view._dictionaries = None
+            view.log = None
+            view.read_only = True
+            view.lock = RWLock()
+            view._readers = weakref.WeakSet()
+            self._readers.add(view)
+            return view
+
+    def _record(self, op, **fields):
+        """
+        Запис успішно виконаної зміни в журнал (якщо журнал підключено).
+        :param op: Назва операції.
+        :param fields: Параметри операції у JSON-сумісному вигляді.
+        """
+        if self.log is not None:
+            self.lsn = self.log(self.name, op, fields)
 
+    @_mutation
     def add_row(self, data):
         """
         Додавання рядка до таблиці після валідації.
         :param data: Дані для додавання у рядок.
+        :return: Сталий ідентифікатор доданого рядка.
+        """
+        self.schema.validator(data)  # Перевірка відповідності схемі
+        row_id = self.rows.append(data)
+        for (column, _), index in self.indexes.items():
+            index.insert(row_id, data[column])
+        self._record("add_row", data=self.schema.serializer(data))
+        return row_id
+
+    @_mutation
+    def add_rows(self, rows, validate=VALIDATE_FULL):
+        """
+        Пакетне додавання рядків. Якщо хоча б один рядок невалідний,
+        жоден рядок не додається, а всі помилки повертаються разом.
+        Індекси перебудовуються один раз після вставки.
+        :param rows: Ітерований набір словників з даними рядків.
+        :param validate: "full" - перевірити всі рядки, "sample" - випадкову вибірку,
+                         "none" - без перевірки (дані повинні бути гарантовано коректні).
+        :return: Кількість доданих рядків.
+        :raises BatchValidationError: Якщо валідація знайшла помилки.
         """
-        self.schema.validate(data)  # Перевірка відповідності схемі
-        self.rows.append(Row(data))
+        rows = list(rows)
+        if validate == VALIDATE_FULL:
+            checked = range(len(rows))
+        elif validate == VALIDATE_SAMPLE:
+            checked = sorted(random.sample(range(len(rows)), min(SAMPLE_SIZE, len(rows))))
+        elif validate == VALIDATE_NONE:
+            checked = ()
+        else:
+            raise ValueError(f"Невідомий режим валідації: {validate}")
 
+        validator = self.schema.validator
+        errors = []
+        for position in checked:
+            try:
+                validator(rows[position])
+            except (ValueError, TypeError) as error:
+                errors.append((position, error))
+        if errors:
+            raise BatchValidationError(errors)
+
+        append = self.rows.append
+        next_id = self.rows.next_id
+        try:
+            for data in rows:
+                append(data)
+        except Exception:
+            self.rows.rollback(next_id)  # Пакет додається повністю або не додається зовсім
+            raise
+        self.rebuild_indexes()
+        if self.log is not None:
+            serialize = self.schema.serializer
+            self._record("add_rows", rows=[serialize(data) for data in rows])
+        return len(rows)
+
+    def _check_index(self, index):
+        if index < 0 or index >= len(self.rows):
+            raise IndexError("Індекс рядка поза межами.")
+
+    def _check_id(self, row_id):
+        if not self.rows.has_id(row_id):
+            raise IndexError(f"Рядок з ідентифікатором {row_id} не знайдено.")
+
+    def _replace(self, row_id, data):
+        """
+        Заміна рядка з оновленням індексів (без перевірок і журналу).
+        """
+        if self.indexes:
+            old_row = self.rows.get_by_id(row_id)
+            for (column, _), column_index in self.indexes.items():
+                column_index.remove(row_id, old_row[column])
+                column_index.insert(row_id, data[column])
+        self.rows.replace_by_id(row_id, data)
+
+    def _remove(self, row_ids):
+        """
+        Видалення рядків з оновленням індексів (без перевірок і журналу).
+        Індекси зберігають ідентифікатори, тож записи інших рядків не змінюються,
+        а сховище лише позначає рядки видаленими: вартість пропорційна кількості видалених.
+        """
+        if self.indexes:
+            old_rows = [(row_id, self.rows.get_by_id(row_id)) for row_id in row_ids]
+            for (column, _), column_index in self.indexes.items():
+                column_index.remove_many([(row_id, row[column]) for row_id, row in old_rows])
+        self.rows.delete_ids(row_ids)
+
+    @_mutation
     def edit_row(self, index, data):
         """
         Редагування рядка за індексом.
         :param index: Індекс рядка.
         :param data: Нові дані для рядка.
         """
-        if index < 0 or index >= len(self.rows):
-            raise IndexError("Індекс рядка поза межами.")
-        self.schema.validate(data)  # Перевірка відповідності схемі
-        self.rows[index] = Row(data)
+        self._check_index(index)
+        self.schema.validator(data)  # Перевірка відповідності схемі
+        self._replace(self.rows.row_id(index), data)
+        self._record("edit_row", index=index, data=self.schema.serializer(data))
 
+    @_mutation
+    def edit_rows(self, updates):
+        """
+        Атомарне редагування кількох рядків: або змінюються всі, або жоден.
+        :param updates: Словник {індекс: нові дані} або список пар (індекс, дані).
+        :raises BatchValidationError: Якщо хоча б один рядок невалідний.
+        """
+        updates = list(updates.items()) if isinstance(updates, dict) else list(updates)
+        errors = []
+        for position, (index, data) in enumerate(updates):
+            try:
+                self._check_index(index)
+                self.schema.validator(data)
+            except (ValueError, TypeError, IndexError) as error:
+                errors.append((position, error))
+        if errors:
+            raise BatchValidationError(errors)
+        for index, data in updates:
+            self._replace(self.rows.row_id(index), data)
+        if self.log is not None:
+            serialize = self.schema.serializer
+            self._record("edit_rows", rows=[[index, serialize(data)] for index, data in updates])
+
+    @_mutation
     def delete_row(self, index):
         """
         Видалення рядка за індексом.
         :param index: Індекс рядка.
         """
-        if index < 0 or index >= len(self.rows):
-            raise IndexError("Індекс рядка поза межами.")
-        del self.rows[index]
+        self._check_index(index)
+        self._remove([self.rows.row_id(index)])
+        self._record("delete_row", index=index)
+
+    @_mutation
+    def delete_rows(self, indices):
+        """
+        Атомарне видалення кількох рядків (індекси - у нумерації до видалення).
+        :param indices: Ітерований набір індексів рядків.
+        :raises IndexError: Якщо хоча б один індекс поза межами (тоді нічого не видаляється).
+        """
+        indices = sorted(set(indices), reverse=True)
+        for index in indices:
+            self._check_index(index)
+        self._remove([self.rows.row_id(index) for index in indices])
+        self._record("delete_rows", indices=indices)
+
+    @_mutation
+    def edit_row_by_id(self, row_id, data):
+        """
+        Редагування рядка за сталим ідентифікатором.
+        :param row_id: Ідентифікатор рядка (результат add_row або row_id).
+        :param data: Нові дані для рядка.
+        :raises IndexError: Якщо рядка з таким ідентифікатором немає.
+        """
+        self._check_id(row_id)
+        self.schema.validator(data)
+        self._replace(row_id, data)
+        self._record("edit_row_id", id=row_id, data=self.schema.serializer(data))
+
+    @_mutation
+    def delete_row_by_id(self, row_id):
+        """
+        Видалення рядка за сталим ідентифікатором.
+        :param row_id: Ідентифікатор рядка.
+        :raises IndexError: Якщо рядка з таким ідентифікатором немає.
+        """
+        self._check_id(row_id)
+        self._remove([row_id])
+        self._record("delete_row_id", id=row_id)
+
+    @_mutation
+    def delete_rows_by_id(self, row_ids):
+        """
+        Атомарне видалення кількох рядків за ідентифікаторами.
+        Вартість пропорційна кількості видалених рядків, а не розміру таблиці.
+        :param row_ids: Ітерований набір ідентифікаторів.
+        :raises IndexError: Якщо хоча б одного рядка немає (тоді нічого не видаляється).
+        """
+        row_ids = sorted(set(row_ids))
+        for row_id in row_ids:
+            self._check_id(row_id)
+        self._remove(row_ids)
+        self._record("delete_rows_id", ids=row_ids)
+
+    @_reading
+    def get_row_by_id(self, row_id):
+        """
+        Рядок за сталим ідентифікатором.
+        :param row_id: Ідентифікатор рядка.
+        :return: Об'єкт Row.
+        :raises IndexError: Якщо рядка з таким ідентифікатором немає.
+        """
+        return self.rows.get_by_id(row_id)
+
+    @_reading
+    def row_id(self, index):
+        """
+        Сталий ідентифікатор рядка за поточною позицією.
+        :param index: Індекс рядка.
+        :return: Ідентифікатор рядка.
+        """
+        self._check_index(index)
+        return self.rows.row_id(index)
+
+    @_reading
+    def index_of(self, row_id):
+        """
+        Поточна позиція рядка за ідентифікатором.
+        :param row_id: Ідентифікатор рядка.
+        :return: Індекс рядка.
+        :raises IndexError: Якщо рядка з таким ідентифікатором немає.
+        """
+        return self.rows.position_of(row_id)
+
+    @_reading
+    def row_ids(self):
+        """
+        Ідентифікатори всіх рядків у порядку позицій.
+        :return: Список ідентифікаторів.
+        """
+        return list(self.rows.live_ids())
+
+    @_mutation
+    def compact(self):
+        """
+        Ущільнення сховища: звільнення слотів видалених рядків.
+        Виконується автоматично; ідентифікатори та позиції рядків не змінюються.
+        """
+        self.rows.compact()
+
+    @_reading
+    def get_row(self, index):
+        """
+        Рядок за індексом.
+        :param index: Індекс рядка.
+        :return: Об'єкт Row.
+        """
+        self._check_index(index)
+        return self.rows[index]
+
+    def __iter__(self):
+        """
+        Ітерація по рядках знімка таблиці, зробленого на початку ітерації.
+        Знімок утримується до кінця ітерації, тому зміни під час циклу його не зачіпають.
+        """
+        view = self.freeze()
+        yield from view.rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    @_reading
+    def column(self, name):
+        """
+        Значення колонки для швидкого повного перегляду.
+        :param name: Назва колонки.
+        :return: Масив (у колонковому сховищі) або список значень.
+        """
+        if not self.schema.has_field(name):
+            raise ValueError(f"Колонка '{name}' відсутня у схемі.")
+        return self.rows.column(name)
+
+    def query(self):
+        """
+        Початок побудови запиту: where/select/order_by/limit/offset.
+        :return: Об'єкт Query.
+        """
+        return Query(self)
+
+    @_mutation
+    def create_index(self, column, kind=INDEX_HASH):
+        """
+        Створення вторинного індексу на колонці.
+        :param column: Назва колонки.
+        :param kind: "hash" (пошук за рівністю) або "sorted" (запити за діапазоном).
+        :return: Об'єкт індексу.
+        """
+        index = make_index(self.schema.get_field(column), kind)
+        index.build(self.rows.column(column), self.rows.live_ids())
+        self.indexes[(column, kind)] = index
+        self._record("create_index", column=column, kind=kind)
+        return index
+
+    @_mutation
+    def drop_index(self, column, kind=INDEX_HASH):
+        """
+        Видалення вторинного індексу.
+        :param column: Назва колонки.
+        :param kind: Вид індексу.
+        """
+        if (column, kind) not in self.indexes:
+            raise ValueError(f"Індекс '{kind}' на колонці '{column}' не знайдено.")
+        del self.indexes[(column, kind)]
+        self._record("drop_index", column=column, kind=kind)
+
+    def rebuild_indexes(self):
+        """
+        Повна перебудова всіх індексів (наприклад, після завантаження рядків).
+        """
+        for (column, _), index in self.indexes.items():
+            index.build(self.rows.column(column), self.rows.live_ids())
+
+    @_reading
+    def find(self, column, value):
+        """
+        Позиції рядків, у яких значення колонки дорівнює value.
+        Використовує індекс, якщо він є, інакше - повний перегляд.
+        :param column: Назва колонки.
+        :param value: Шукане значення.
+        :return: Відсортований список індексів рядків.
+        """
+        for kind in (INDEX_HASH, INDEX_SORTED):
+            if (column, kind) in self.indexes:
+                return self.rows.positions(self.indexes[(column, kind)].lookup(value))
+        key = index_key(value)
+        return [position for position, current in enumerate(self.column(column)) if index_key(current) == key]
+
+    @_reading
+    def find_range(self, column, low=None, high=None, part=None):
+        """
+        Позиції рядків зі значенням колонки в межах [low, high].
+        :param column: Назва колонки.
+        :param low: Нижня межа (None - без обмеження).
+        :param high: Верхня межа (None - без обмеження).
+        :param part: Для колонок RealInterval - "start" або "end".
+        :return: Список індексів рядків у порядку зростання значень.
+        """
+        if (column, INDEX_SORTED) in self.indexes:
+            return self.rows.positions(self.indexes[(column, INDEX_SORTED)].range(low, high, part))
+        matches = []
+        for position, value in enumerate(self.column(column)):
+            key = getattr(value, part) if part else value
+            if (low is None or key >= low) and (high is None or key <= high):
+                matches.append((key, position))
+        matches.sort()
+        return [position for _, position in matches]
 
-    def to_dict(self):
+    @_reading
+    def to_dict(self, blobs=None, rows=True):
         """
         Конвертація таблиці у словник для збереження.
+        :param blobs: Сховище BlobStore; якщо задано, зображення записуються в нього,
+                      а рядки містять лише посилання на вміст.
+        :param rows: Якщо False, список рядків залишається порожнім (лише опис таблиці).
         :return: Словник із даними таблиці.
         """
-        return {
+        dictionaries = self.dictionaries()
+        if blobs is None and not dictionaries:
+            serialize = self.schema.serializer
+        else:
+            serialize = self.schema.compile_serializer(blobs, dictionaries)
+        data = {
             "name": self.name,
             "schema": self.schema.to_dict(),
-            "rows": [row.to_dict() for row in self.rows]
+            "storage": self.storage,
+            "indexes": self.index_definitions()
         }
+        if dictionaries:
+            data["dictionaries"] = dictionaries  # Перед рядками: потокове читання декодує рядки одразу
+        data["rows"] = [serialize(row.data) for row in self.rows] if rows else []
+        data.update(self.row_id_state())
+        if self.lsn:
+            data["lsn"] = self.lsn  # Для відтворення журналу лише після цього запису
+        return data
 
-    def rename_or_reorder_columns(self, new_order):
+    @_reading
+    def dictionaries(self):
         """
-        Перейменування та/або перестановка колонок таблиці.
-        :param new_order: Список нових назв колонок (у правильному порядку).
+        Словники колонок зі словниковим кодуванням: у файл записується словник,
+        а рядки містять номери значень у ньому.
+        :return: Словник {назва колонки: список різних значень}.
         """
-        if len(new_order) != len(self.schema.fields):
+        if self._dictionaries is not None:
+            return self._dictionaries
+        dictionaries = {field.name: self.rows.dictionary(field.name) for field in self.schema.fields if field.dictionary}
+        if self.read_only:
+            self._dictionaries = dictionaries  # Знімок не змінюється, а записується частинами
+        return dictionaries
+
+    @_reading
+    def dictionary_codes(self, name):
+        """
+        Словник і коди колонки зі словниковим кодуванням (для фільтрів і групування за кодами).
+        :param name: Назва колонки.
+        :return: Кортеж (список значень, масив кодів у порядку рядків) або None,
+                 якщо колонка не закодована.
+        """
+        if not self.schema.get_field(name).dictionary:
+            return None
+        encoded = self.rows.dictionary_codes(name)
+        if encoded is None:
+            # Рядкове сховище не зберігає коди: вони будуються за один перегляд колонки
+            lookup = {}
+            codes = array('i', [lookup.setdefault(value, len(lookup)) for value in self.rows.column(name)])
+            encoded = list(lookup), codes
+        return encoded
+
+    @_mutation
+    def set_dictionary_encoding(self, name, enabled=True):
+        """
+        Увімкнення або вимкнення словникового кодування колонки str або char.
+        У колонковому сховищі значення зберігаються кодами, і пошук за рівністю
+        та групування виконуються за кодами; в обох сховищах у файл записуються
+        словник і коди замість повторюваного тексту.
+        :param name: Назва колонки.
+        :param enabled: True - увімкнути, False - вимкнути.
+        :raises ValueError: Якщо колонка не типу str або char.
+        """
+        old_field = self.schema.get_field(name)
+        if old_field.dictionary == enabled:
+            return
+        field = Field(name, old_field.data_type, old_field.column_id, enabled)
+        schema = Schema([field if other is old_field else other for other in self.schema.fields],
+                        self.schema.next_column_id)
+        self.rows.recode(schema, field)
+        self.schema = schema
+        self._record("dictionary_encoding", column=name, enabled=enabled)
+
+    def row_id_state(self):
+        """
+        Стан ідентифікаторів рядків для збереження: "ids" - лише якщо вони
+        відрізняються від позицій (були видалення), "next_id" - якщо він більший за кількість рядків.
+        :return: Словник (порожній для таблиці без видалень).
+        """
+        state = {}
+        if self.rows.next_id != len(self.rows):
+            if not self.rows.ids_are_positions():
+                state["ids"] = list(self.rows.live_ids())
+            state["next_id"] = self.rows.next_id
+        return state
+
+    def _interval_index(self, column):
+        """
+        Індекс інтервалів колонки або None, якщо його не створено.
+        :param column: Назва колонки.
+        """
+        if self.schema.get_field(column).data_type is not RealInterval:
+            raise ValueError(f"Колонка '{column}' не є колонкою інтервалів.")
+        return self.indexes.get((column, INDEX_INTERVAL))
+
+    @_reading
+    def overlaps(self, column, low, high):
+        """
+        Позиції рядків, інтервал яких перетинається з [low, high].
+        :param column: Назва колонки типу RealInterval.
+        :param low: Початок запиту.
+        :param high: Кінець запиту.
+        :return: Відсортований список індексів рядків.
+        """
+        index = self._interval_index(column)
+        if index is not None:
+            return self.rows.positions(index.overlaps(low, high))
+        return [position for position, value in enumerate(self.rows.column(column))
+                if value.start <= high and value.end >= low and value.start <= value.end]
+
+    def contains_point(self, column, point):
+        """
+        Позиції рядків, інтервал яких містить точку.
+        :param column: Назва колонки типу RealInterval.
+        :param point: Точка.
+        :return: Відсортований список індексів рядків.
+        """
+        return self.overlaps(column, point, point)
+
+    @_reading
+    def stabbing_count(self, column, point):
+        """
+        Кількість рядків, інтервал яких містить точку.
+        :param column: Назва колонки типу RealInterval.
+        :param point: Точка.
+        :return: Кількість рядків.
+        """
+        index = self._interval_index(column)
+        if index is not None:
+            return index.stabbing_count(point)
+        return len(self.contains_point(column, point))
+
+    def index_definitions(self):
+        """
+        Опис індексів таблиці для збереження (самі індекси перебудовуються при завантаженні).
+        :return: Список словників {"column", "kind"}.
+        """
+        if self.read_only:
+            return list(self._index_definitions)
+        definitions = [{"column": column, "kind": kind} for column, kind in self.indexes]
+        if self._conversion is not None:
+            # Індекси колонки, тип якої змінюється, відновлюються після перетворення
+            _, old_field, kinds, _ = self._conversion
+            interval = self.schema.get_field(old_field.name).data_type is RealInterval
+            definitions.extend({"column": old_field.name, "kind": kind} for kind in kinds
+                               if interval or kind != INDEX_INTERVAL)
+        return definitions
+
+    @_mutation
+    def rename_or_reorder_columns(self, new_order, renames=None):
+        """
+        Перейменування та/або перестановка колонок таблиці. Змінюється лише схема:
+        сховище звертається до значень за сталими ідентифікаторами колонок,
+        тож рядки не переписуються, а індекси переносяться на нові назви.
+        :param new_order: Список поточних назв колонок у новому порядку.
+        :param renames: Словник {поточна назва: нова назва} (None - без перейменування).
+        """
+        renames = dict(renames or {})
+        fields = {field.name: field for field in self.schema.fields}
+        if len(new_order) != len(fields):
             raise ValueError("Кількість нових назв колонок повинна співпадати з поточною.")
 
         # Перевіряємо, що всі поточні назви присутні в новому порядку
-        current_names = [field.name for field in self.schema.fields]
-        if sorted(current_names) != sorted(new_order):
+        if set(new_order) != set(fields):
             raise ValueError("Новий порядок повинен включати всі поточні назви колонок.")
+        for old_name, new_name in renames.items():
+            if old_name not in fields:
+                raise ValueError(f"Колонка '{old_name}' відсутня у схемі.")
+            if not isinstance(new_name, str) or not new_name:
+                raise ValueError("Нова назва колонки повинна бути непорожнім рядком.")
+        final_names = [renames.get(name, name) for name in new_order]
+        if len(set(final_names)) != len(final_names):
+            raise ValueError("Нові назви колонок повинні бути унікальними.")
+
+        # Нові поля та схема замість зміни на місці: старі можуть належати знімку або іншій таблиці
+        self.schema = Schema([Field(renames.get(name, name), fields[name].data_type, fields[name].column_id,
+                                    fields[name].dictionary)
+                              for name in new_order], self.schema.next_column_id)
+        self.rows.schema = self.schema
+        indexes = {}
+        for (column, kind), index in self.indexes.items():
+            index.column = renames.get(column, column)
+            indexes[(index.column, kind)] = index
+        self.indexes = indexes
+        if renames:
+            self._record("reorder_columns", order=list(new_order), renames=renames)
+        else:
+            self._record("reorder_columns", order=list(new_order))
+
+    @_mutation
+    def add_column(self, field, default):
+        """
+        Додавання колонки до таблиці. Наявні рядки не переписуються: у рядковому сховищі
+        значення за замовчуванням підставляється під час читання і потрапляє в рядки
+        під час ущільнення, у колонковому - масив колонки заповнюється одним викликом.
+        :param field: Об'єкт Field нової колонки (ідентифікатор колонки призначає схема).
+        :param default: Значення колонки для наявних рядків.
+        :raises ValueError: Якщо колонка з такою назвою вже існує.
+        :raises TypeError: Якщо значення за замовчуванням не відповідає типу колонки.
+        """
+        if self.schema.has_field(field.name):
+            raise ValueError(f"Колонка '{field.name}' вже існує.")
+        if not field.checker()(default):
+            raise TypeError(f"Поле '{field.name}' повинно бути типу {field.data_type}.")
+        field = Field(field.name, field.data_type, dictionary=field.dictionary)
+        schema = Schema(self.schema.fields + [field], self.schema.next_column_id)
+        self.rows.add_column(schema, field, default)
+        self.schema = schema
+        encode = field.encoder()
+        self._record("add_column", field=field.to_dict(), default=encode(default) if encode else default)
+
+    @_mutation
+    def drop_column(self, name):
+        """
+        Видалення колонки разом з її індексами. Змінюється лише схема:
+        у рядковому сховищі значення звільняються під час ущільнення.
+        :param name: Назва колонки.
+        :raises ValueError: Якщо колонки немає або вона єдина в таблиці.
+        """
+        field = self.schema.get_field(name)
+        if len(self.schema.fields) == 1:
+            raise ValueError("Неможливо видалити єдину колонку таблиці.")
+        schema = Schema([other for other in self.schema.fields if other is not field], self.schema.next_column_id)
+        self.rows.drop_column(schema, field)
+        self.schema = schema
+        self.indexes = {key: index for key, index in self.indexes.items() if key[0] != name}
+        self._record("drop_column", column=name)
+
+    def alter_column_type(self, name, new_type, converter=None, background=True, batch_size=CONVERT_BATCH):
+        """
+        Зміна типу колонки. Схема змінюється одразу, а значення перетворюються пакетами
+        по batch_size рядків (кожен пакет - під блокуванням запису, тож таблицю можна читати
+        між пакетами); ще не перетворені значення перетворюються під час читання.
+        Зміна таблиці під час перетворення спершу завершує його. Індекси колонки
+        перебудовуються після завершення. Якщо перетворення не вдалося, зміна типу
+        скасовується і колонка залишається старого типу.
+        :param name: Назва колонки.
+        :param new_type: Новий тип (int, float, str, "char", PictureFile, RealInterval).
+        :param converter: Функція перетворення старого значення (None - перетворення за замовчуванням).
+        :param background: True - перетворювати у фоновому потоці, False - одразу.
+        :param batch_size: Кількість рядків в одному пакеті.
+        :return: Запущене BackgroundTask (або None, якщо background=False чи тип не змінюється).
+        :raises ValueError: Якщо тип невідомий, для нього немає перетворення за замовчуванням,
+                            власну функцію неможливо записати в журнал або перетворення не вдалося.
+        """
+        column_id = self._start_conversion(name, new_type, converter)
+        if column_id is None:
+            return None
+        if background:
+            return BackgroundTask(functools.partial(self._run_conversion, column_id, batch_size)).start()
+        with self.lock.write():
+            if self._pending(column_id):
+                self._detach()
+                while not self._convert_step(batch_size):
+                    pass
+        return None
+
+    @_mutation
+    def _start_conversion(self, name, new_type, converter):
+        """
+        Заміна поля колонки полем нового типу з новим ідентифікатором колонки.
+        :return: Ідентифікатор нової колонки (None, якщо тип не змінюється).
+        """
+        old_field = self.schema.get_field(name)
+        if new_type not in TYPE_NAMES:
+            raise ValueError(f"Невідомий тип даних: {new_type}")
+        if old_field.data_type == new_type:
+            return None
+        if converter is None:
+            if new_type not in DEFAULT_CONVERTERS:
+                raise ValueError(f"Для типу {new_type} потрібна функція перетворення.")
+            converter = DEFAULT_CONVERTERS[new_type]
+        elif self.log is not None:
+            raise ValueError("Власну функцію перетворення неможливо записати в журнал.")
+        field = Field(name, new_type, dictionary=old_field.dictionary and new_type in (str, "char"))
+        schema = Schema([field if other is old_field else other for other in self.schema.fields],
+                        self.schema.next_column_id)
+        kinds = [kind for column, kind in self.indexes if column == name]
+        for kind in kinds:
+            del self.indexes[(name, kind)]
+        self.rows.start_conversion(schema, old_field, field, converter)
+        self._conversion = (field.column_id, old_field, kinds, self.schema)
+        self.schema = schema
+        return field.column_id
+
+    def finish_conversion(self):
+        """
+        Завершення незавершеної зміни типу колонки в поточному потоці (див. alter_column_type).
+        Якщо перетворення не вдалося, зміна типу скасовується без винятку.
+        :return: True, якщо зміну типу завершено; False, якщо її скасовано або не було.
+        """
+        with self.lock.write():
+            if self._conversion is None:
+                return False
+            self._detach()
+            try:
+                while not self._convert_step(CONVERT_BATCH):
+                    pass
+            except ValueError:
+                return False
+            return True
 
-        # Застосовуємо новий порядок колонок
-        new_fields = []
-        for new_name in new_order:
-            for field in self.schema.fields:
-                if field.name == new_name:
-                    new_fields.append(field)
-                    break
-        self.schema.fields = new_fields
+    @property
+    def converting(self):
+        """
+        True, якщо зміна типу колонки ще не завершена.
+        """
+        return self._conversion is not None
+
+    def _pending(self, column_id):
+        return self._conversion is not None and self._conversion[0] == column_id
 
-        # Переставляємо дані у рядках таблиці
-        for row in self.rows:
-            row.data = {new_name: row.data[new_name] for new_name in new_order}
+    def _run_conversion(self, column_id, batch_size, progress):
+        """
+        Фонове перетворення: пакети під блокуванням запису, хід роботи - між пакетами.
+        Скасування завдання скасовує зміну типу.
+        """
+        while True:
+            with self.lock.write():
+                if not self._pending(column_id):
+                    return  # Перетворення вже завершила зміна таблиці
+                self._detach()
+                if self._convert_step(batch_size):
+                    return
+                done, total = self.rows.conversions[column_id].done, len(self.rows.ids)
+            try:
+                progress(done, total)
+            except TaskCancelled:
+                with self.lock.write():
+                    if self._pending(column_id):
+                        self._detach()
+                        self._abort_conversion()
+                raise
+
+    def _convert_step(self, batch_size):
+        """
+        Перетворення наступного пакета незавершеної зміни типу.
+        :return: True, якщо зміну типу завершено.
+        :raises ValueError: Якщо перетворення не вдалося (зміну типу скасовано).
+        """
+        column_id, old_field = self._conversion[:2]
+        try:
+            done = self.rows.convert_batch(column_id, batch_size)
+        except Exception as error:  # Функція перетворення може кинути будь-який виняток
+            self._abort_conversion()
+            raise ValueError(f"Не вдалося перетворити колонку '{old_field.name}': {error}. "
+                             f"Зміну типу скасовано.") from error
+        if done:
+            self._finish_conversion()
+        return done
+
+    def _finish_conversion(self):
+        """
+        Завершення зміни типу: відновлення індексів та запис у журнал
+        (журнал отримує лише завершені зміни типу).
+        """
+        column_id, old_field, kinds, _ = self._conversion
+        self._conversion = None
+        self.rows.finish_conversion(column_id)
+        field = self.schema.get_field(old_field.name)
+        for kind in kinds:
+            try:
+                index = make_index(field, kind)
+            except ValueError:
+                continue  # Індекс цього виду неможливий для нового типу
+            index.build(self.rows.column(field.name), self.rows.live_ids())
+            self.indexes[(field.name, kind)] = index
+        self._record("alter_column_type", column=field.name, type=field.type_name)
+
+    def _abort_conversion(self):
+        """
+        Скасування зміни типу: повернення старого поля та індексів.
+        """
+        column_id, old_field, kinds, schema = self._conversion
+        self._conversion = None
+        self.rows.abort_conversion(schema, column_id)
+        self.schema = schema
+        self.version += 1
+        for kind in kinds:
+            index = make_index(old_field, kind)
+            index.build(self.rows.column(old_field.name), self.rows.live_ids())
+            self.indexes[(old_field.name, kind)] = index
 
     @staticmethod
-    def from_dict(data):
+    def from_dict(data, blobs=None):
         """
         Створення таблиці зі словника.
         :param data: Словник із даними таблиці.
+        :param blobs: Сховище BlobStore для зображень, збережених посиланням.
         :return: Об'єкт Table.
         """
         schema = Schema.from_dict(data["schema"])
-        table = Table(data["name"], schema)
+        table = Table(data["name"], schema, data.get("storage", STORAGE_ROWS))
+        table.lsn = data.get("lsn", 0)
+        dictionaries = data.get("dictionaries")
+        if blobs is None and not dictionaries:
+            deserialize = schema.deserializer
+        else:
+            deserialize = schema.compile_deserializer(blobs, dictionaries)
         for row_data in data["rows"]:
-            table.rows.append(Row.from_dict(row_data))
+            table.rows.append(deserialize(row_data))
+        table.rows.assign_ids(data.get("ids"), data.get("next_id"))
+        for definition in data.get("indexes", []):
+            table.create_index(definition["column"], definition["kind"])
         return table
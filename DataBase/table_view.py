@@ -0,0 +1,151 @@
+from custom_types import PictureFile, RealInterval
+
+VISIBLE_ROWS = 30  # Кількість рядків у вікні перегляду
+PREFETCH_ROWS = 100  # Додаткові рядки, що готуються над і під вікном
+
+
+def format_value(value):
+    """
+    Представлення значення для відображення в таблиці.
+    :param value: Значення колонки.
+    :return: Текст або значення як є.
+    """
+    if isinstance(value, PictureFile):
+        return "Зображення збережено"  # Явне представлення для PictureFile
+    if isinstance(value, RealInterval):
+        return repr(value)
+    return value
+
+
+class RowWindow:
+    def __init__(self, table, height=VISIBLE_ROWS, prefetch=PREFETCH_ROWS):
+        """
+        Вікно перегляду великої таблиці: форматуються лише видимі рядки та запас
+        prefetch рядків навколо них, тож відкриття таблиці не залежить від її розміру.
+        Логіка не залежить від Tk; віджет лише показує visible_rows().
+        :param table: Об'єкт Table.
+        :param height: Кількість видимих рядків.
+        :param prefetch: Кількість рядків запасу з кожного боку вікна.
+        """
+        self.table = table
+        self.height = height
+        self.prefetch = prefetch
+        self.first = 0  # Індекс першого видимого рядка
+        self._cache_start = 0  # Індекс першого підготовленого рядка
+        self._cache = []  # Відформатовані рядки від _cache_start
+        self._cache_ids = []  # Ідентифікатори підготовлених рядків
+        self._version = table.version
+
+    @property
+    def total(self):
+        """
+        Кількість рядків таблиці.
+        """
+        return len(self.table)
+
+    @property
+    def columns(self):
+        """
+        Назви колонок у порядку схеми.
+        """
+        return [field.name for field in self.table.schema.fields]
+
+    def scroll_to(self, first):
+        """
+        Прокрутка вікна так, щоб рядок first був першим видимим (з обмеженням меж таблиці).
+        :param first: Індекс рядка.
+        :return: Фактичний індекс першого видимого рядка.
+        """
+        self.first = max(0, min(first, self.total - self.height))
+        return self.first
+
+    def scroll_by(self, count):
+        """
+        Прокрутка на count рядків (від'ємне значення - вгору).
+        :return: Індекс першого видимого рядка.
+        """
+        return self.scroll_to(self.first + count)
+
+    def moveto(self, fraction):
+        """
+        Прокрутка до частки таблиці (для смуги прокрутки).
+        :param fraction: Число від 0 до 1.
+        :return: Індекс першого видимого рядка.
+        """
+        return self.scroll_to(int(fraction * self.total))
+
+    def fraction(self):
+        """
+        Видима частина таблиці для смуги прокрутки.
+        :return: Кортеж (початок, кінець) у частках від 0 до 1.
+        """
+        total = self.total
+        if not total:
+            return 0.0, 1.0
+        return self.first / total, min(1.0, (self.first + self.height) / total)
+
+    def jump_to(self, index):
+        """
+        Перехід до рядка: вікно прокручується так, щоб рядок був видимим.
+        :param index: Індекс рядка.
+        :return: Позиція рядка у вікні.
+        :raises IndexError: Якщо індекс поза межами таблиці.
+        """
+        if not 0 <= index < self.total:
+            raise IndexError("Індекс рядка поза межами таблиці.")
+        if not self.first <= index < self.first + self.height:
+            self.scroll_to(index - self.height // 2)
+        return index - self.first
+
+    def row_index(self, position):
+        """
+        Індекс рядка таблиці за позицією у вікні.
+        :param position: Позиція у вікні (0 - перший видимий рядок).
+        :return: Індекс рядка.
+        """
+        return self.first + position
+
+    def row_id(self, position):
+        """
+        Сталий ідентифікатор показаного рядка за позицією у вікні. На відміну від
+        індексу, він вказує на той самий рядок, навіть якщо таблиця змінилась після показу.
+        :param position: Позиція у вікні (0 - перший видимий рядок).
+        :return: Ідентифікатор рядка.
+        """
+        return self._cache_ids[self.first - self._cache_start + position]
+
+    def refresh(self):
+        """
+        Перевірка змін таблиці: підготовлені рядки відкидаються, а вікно
+        залишається в межах таблиці після видалення рядків.
+        :return: True, якщо таблиця змінилась.
+        """
+        if self.table.version == self._version:
+            return False
+        self._version = self.table.version
+        self._cache = []
+        self.scroll_to(self.first)
+        return True
+
+    def visible_rows(self):
+        """
+        Відформатовані видимі рядки. Рядки читаються з таблиці лише тоді, коли
+        вікно виходить за межі підготовленого запасу.
+        :return: Список списків значень.
+        """
+        self.refresh()
+        stop = min(self.first + self.height, self.total)
+        if not (self._cache_start <= self.first and stop <= self._cache_start + len(self._cache)):
+            self._load(max(0, self.first - self.prefetch), stop + self.prefetch)
+        offset = self.first - self._cache_start
+        return self._cache[offset:offset + stop - self.first]
+
+    def _load(self, start, stop):
+        columns = self.columns
+        with self.table.lock.read():
+            stop = min(stop, len(self.table.rows))
+            rows = [self.table.rows[index].data for index in range(start, stop)]
+            self._cache_ids = [self.table.rows.row_id(index) for index in range(start, stop)]
+            self._version = self.table.version
+        self._cache_start = start
+        self._cache = [[format_value(data[name]) for name in columns] for data in rows]
@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from background import BackgroundTask, TaskCancelled
+from database import Database
+from schema import Schema, Field
+from custom_types import RealInterval
+
+class TestBackgroundTask(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Ініціалізація бази даних з двома таблицями.
+        """
+        self.db = Database()
+        schema = Schema([Field("id", int), Field("name", str), Field("interval", RealInterval)])
+        for name in ("a", "b"):
+            self.db.create_table(name, schema)
+            self.db.tables[name].add_rows(
+                [{"id": i, "name": f"ім'я {i}", "interval": RealInterval(i, i + 1)} for i in range(100)])
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "db.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_load_with_progress(self):
+        """
+        Тест для перевірки збереження та завантаження у фоновому потоці з повідомленнями про хід.
+        """
+        reports = []
+
+        def save(progress):
+            self.db.save_to_disk(self.filename, progress=lambda done, total: (reports.append((done, total)),
+                                                                              progress(done, total)))
+
+        task = BackgroundTask(save).start()
+        self.assertTrue(task.wait(5))
+        self.assertIsNone(task.error)
+        self.assertEqual(reports[-1], (2, 2))
+        self.assertEqual(task.fraction(), 1.0)
+
+        def load(progress):
+            database = Database()
+            database.load_from_disk(self.filename, progress=progress)
+            return database
+
+        task = BackgroundTask(load).start()
+        self.assertTrue(task.wait(5))
+        self.assertEqual(task.result.tables["b"].to_dict(), self.db.tables["b"].to_dict())
+        self.assertEqual(task.fraction(), 1.0)
+
+    def test_cancel_keeps_previous_file(self):
+        """
+        Тест для перевірки, що скасоване збереження не змінює попередній файл і не лишає тимчасових файлів.
+        """
+        self.db.save_to_disk(self.filename)
+        with open(self.filename) as file:
+            before = file.read()
+        self.db.tables["a"].add_row({"id": -1, "name": "новий", "interval": RealInterval(0, 1)})
+        started = threading.Event()
+
+        def save(progress):
+            def report(done, total):
+                started.set()
+                task.cancel()
+                progress(done, total)
+
+            self.db.save_to_disk(self.filename, progress=report)
+
+        task = BackgroundTask(save)
+        task.start()
+        self.assertTrue(task.wait(5))
+        self.assertTrue(started.is_set())
+        self.assertTrue(task.cancelled)
+        self.assertIsInstance(task.error, TaskCancelled)
+        with open(self.filename) as file:
+            self.assertEqual(file.read(), before)
+        self.assertEqual(os.listdir(self.directory.name), ["db.json"])
+
+    def test_load_pretty_printed_file(self):
+        """
+        Тест для перевірки завантаження файлів, збережених попередньою версією інтерфейсу
+        (з відступами та без екранування не-ASCII символів).
+        """
+        data = {name: table.to_dict() for name, table in self.db.tables.items()}
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=4, ensure_ascii=False)
+        database = Database()
+        database.load_from_disk(self.filename, progress=lambda done, total: None)
+        self.assertEqual(database.tables["a"].get_row(5).data["name"], "ім'я 5")
+
+if __name__ == "__main__":
+    unittest.main()
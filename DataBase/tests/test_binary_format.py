@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+import binary_format
+from database import Database
+from schema import Schema, Field
+from custom_types import PictureFile, RealInterval
+
+class TestBinaryFormat(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Ініціалізація бази даних з усіма типами полів.
+        """
+        self.db = Database()
+        self.schema = Schema([
+            Field("id", int),
+            Field("score", float),
+            Field("name", str),
+            Field("grade", "char"),
+            Field("photo", PictureFile),
+            Field("interval", RealInterval)
+        ])
+        self.picture = PictureFile(base64_data="R0lGODdhAQABAIABAAAAAP///ywAAAAAAQABAAACAUwAOw==")
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _fill(self, table):
+        table.add_row({"id": 1, "score": 1.5, "name": "Тест", "grade": "A",
+                       "photo": self.picture, "interval": RealInterval(1.0, 5.0)})
+        table.add_row({"id": -2, "score": 0.25, "name": "", "grade": "ї",
+                       "photo": PictureFile(data=b"\x00\x01"), "interval": RealInterval(-1.0, 2.5)})
+
+    def test_round_trip_all_types(self):
+        """
+        Тест для перевірки збереження та завантаження всіх типів у бінарному форматі.
+        """
+        for storage in ("rows", "columnar"):
+            self.db.create_table(storage, self.schema, storage=storage)
+            self._fill(self.db.tables[storage])
+        filename = os.path.join(self.directory.name, "db.ldb")
+        self.db.save_to_disk(filename)
+        self.assertTrue(binary_format.is_binary_file(filename))
+
+        new_db = Database()
+        new_db.load_from_disk(filename)
+        for storage in ("rows", "columnar"):
+            table = new_db.tables[storage]
+            self.assertEqual(table.storage, storage)
+            self.assertEqual(len(table.rows), 2)
+            first, second = table.rows[0].data, table.rows[1].data
+            self.assertEqual(first["id"], 1)
+            self.assertEqual(first["score"], 1.5)
+            self.assertEqual(first["name"], "Тест")
+            self.assertEqual(second["grade"], "ї")
+            self.assertEqual(first["photo"].data, self.picture.data)
+            self.assertEqual(second["photo"].data, b"\x00\x01")
+            self.assertEqual((second["interval"].start, second["interval"].end), (-1.0, 2.5))
+
+    def test_import_json(self):
+        """
+        Тест для перевірки завантаження існуючого JSON-файлу.
+        """
+        self.db.create_table("Test", self.schema)
+        self._fill(self.db.tables["Test"])
+        filename = os.path.join(self.directory.name, "db.json")
+        self.db.save_to_disk(filename)
+        self.assertFalse(binary_format.is_binary_file(filename))
+        new_db = Database()
+        new_db.load_from_disk(filename)
+        self.assertEqual(new_db.tables["Test"].rows[0].data["name"], "Тест")
+
+    def test_lazy_load(self):
+        """
+        Тест для перевірки лінивого завантаження через mmap.
+        """
+        for name in ("First", "Second"):
+            self.db.create_table(name, self.schema)
+            self._fill(self.db.tables[name])
+        filename = os.path.join(self.directory.name, "db.ldb")
+        self.db.save_to_disk(filename)
+
+        new_db = Database()
+        new_db.load_from_disk(filename, lazy=True)
+        self.assertEqual(sorted(new_db.tables), ["First", "Second"])
+        self.assertFalse(new_db.tables.is_loaded("First"))
+        photo = new_db.tables["First"].rows[0].data["photo"]
+        self.assertTrue(new_db.tables.is_loaded("First"))
+        self.assertFalse(new_db.tables.is_loaded("Second"))
+        self.assertIsInstance(photo.view, memoryview)
+        self.assertEqual(photo.data, self.picture.data)
+
+        # Перезапис того самого файлу після лінивого відкриття
+        new_db.save_to_disk(filename)
+        reloaded = Database()
+        reloaded.load_from_disk(filename)
+        self.assertEqual(len(reloaded.tables["Second"].rows), 2)
+
+if __name__ == "__main__":
+    unittest.main()
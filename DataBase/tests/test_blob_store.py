@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+import unittest
+from blob_store import BlobStore, blob_directory
+from database import Database
+from schema import Schema, Field
+from custom_types import PictureFile
+
+class TestBlobStore(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Ініціалізація бази даних з повторюваними зображеннями.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.db = Database()
+        self.db.create_table("Photos", Schema([Field("id", int), Field("photo", PictureFile)]))
+        self.thumbnails = [PictureFile(data=bytes([i]) * 32) for i in range(3)]
+        for i in range(30):
+            self.db.tables["Photos"].add_row({"id": i, "photo": self.thumbnails[i % 3]})
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_put_deduplicates(self):
+        """
+        Тест для перевірки, що однаковий вміст зберігається один раз.
+        """
+        store = BlobStore(os.path.join(self.directory.name, "store"))
+        first = store.put(b"same")
+        second = store.put_picture(PictureFile(data=b"same"))
+        self.assertEqual(first, second)
+        self.assertIn(first, store)
+        self.assertEqual(list(store.digests()), [first])
+        self.assertEqual(store.read(first), b"same")
+
+    def test_json_round_trip(self):
+        """
+        Тест для перевірки збереження посилань у JSON та лінивого читання зображень.
+        """
+        filename = os.path.join(self.directory.name, "db.json")
+        self.db.save_to_disk(filename, blobs=True)
+        with open(filename) as file:
+            rows = json.load(file)["Photos"]["rows"]
+        self.assertEqual(rows[0]["photo"], {"blob": self.thumbnails[0].digest})
+        self.assertEqual(len(list(BlobStore(blob_directory(filename)).digests())), 3)
+
+        loaded = Database()
+        loaded.load_from_disk(filename)
+        picture = loaded.tables["Photos"].rows[4].data["photo"]
+        self.assertIsNotNone(picture.blob)
+        self.assertEqual(picture.data, self.thumbnails[1].data)
+        rows = list(Database.iter_rows(filename, "Photos"))
+        self.assertEqual(rows[5].data["photo"].data, self.thumbnails[2].data)
+
+    def test_binary_round_trip_with_mmap(self):
+        """
+        Тест для перевірки бінарного формату зі сховищем і відображенням у пам'ять.
+        """
+        filename = os.path.join(self.directory.name, "db.ldb")
+        self.db.save_to_disk(filename, blobs=True)
+        loaded = Database()
+        loaded.load_from_disk(filename, lazy=True)
+        picture = loaded.tables["Photos"].rows[2].data["photo"]
+        self.assertEqual(picture.view.tobytes(), self.thumbnails[2].data)
+        # Повторне збереження у той самий файл не переписує сховище
+        loaded.tables["Photos"].delete_row(0)
+        loaded.save_to_disk(filename, blobs=True)
+        self.assertEqual(len(list(BlobStore(blob_directory(filename)).digests())), 3)
+
+    def test_garbage_collection(self):
+        """
+        Тест для перевірки видалення зображень, на які немає посилань.
+        """
+        filename = os.path.join(self.directory.name, "db.json")
+        self.db.save_to_disk(filename, blobs=True)
+        table = self.db.tables["Photos"]
+        for i in range(len(table.rows)):
+            if table.rows[i].data["photo"] is self.thumbnails[0]:
+                table.edit_row(i, {"id": i, "photo": self.thumbnails[1]})
+        self.db.save_to_disk(filename, blobs=True)
+        digests = set(BlobStore(blob_directory(filename)).digests())
+        self.assertEqual(digests, {self.thumbnails[1].digest, self.thumbnails[2].digest})
+
+    def test_old_files_still_load(self):
+        """
+        Тест для перевірки завантаження файлів із зображеннями у base64.
+        """
+        filename = os.path.join(self.directory.name, "db.json")
+        self.db.save_to_disk(filename)
+        loaded = Database()
+        loaded.load_from_disk(filename)
+        picture = loaded.tables["Photos"].rows[1].data["photo"]
+        self.assertIsNone(picture.blob)
+        self.assertEqual(picture.data, self.thumbnails[1].data)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from cache import LRUCache, picture_cache
+from blob_store import BlobStore
+from custom_types import PictureFile
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_eviction_by_budget(self):
+        """
+        Тест для перевірки витіснення найдавніше використаних записів за бюджетом у байтах.
+        """
+        cache = LRUCache(10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        self.assertEqual(cache.get("a"), b"1234")  # "a" стає найновішим
+        cache.put("c", b"1234")
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertEqual(cache.size, 8)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_counters_and_oversized(self):
+        """
+        Тест для перевірки лічильників та записів, більших за бюджет.
+        """
+        cache = LRUCache(4)
+        self.assertIsNone(cache.get("x"))
+        cache.put("x", b"too large")
+        self.assertNotIn("x", cache)
+        self.assertEqual(cache.get_or_create("y", lambda: b"ok"), b"ok")
+        self.assertEqual(cache.get_or_create("y", lambda: b"new"), b"ok")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 2, 1))
+        cache.resize(1)
+        self.assertEqual(len(cache), 0)
+
+    def test_picture_bytes_cached(self):
+        """
+        Тест для перевірки, що байти зображення зі сховища читаються з диска один раз,
+        а однакові base64-дані декодуються в один спільний об'єкт.
+        """
+        picture_cache.clear()
+        with tempfile.TemporaryDirectory() as directory:
+            store = BlobStore(os.path.join(directory, "store"))
+            digest = store.put(b"picture bytes")
+            self.assertEqual(store.picture(digest).data, b"picture bytes")
+            os.remove(store.path(digest))
+            self.assertEqual(store.picture(digest).data, b"picture bytes")
+        text = PictureFile(data=bytes(range(256)) * 8).to_base64()
+        self.assertIs(PictureFile.from_base64(text).data, PictureFile.from_base64(text).data)
+        self.assertEqual(picture_cache.stats()["hits"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
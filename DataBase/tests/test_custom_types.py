@@ -1,3 +1,4 @@
+import pickle
 import unittest
 from custom_types import PictureFile, RealInterval
 
@@ -11,6 +12,26 @@ class TestCustomTypes(unittest.TestCase):
         decoded_picture = PictureFile.from_base64(encoded)
         self.assertEqual(picture.data, decoded_picture.data)
 
+    def test_picture_file_from_buffer(self):
+        """Тест для перевірки зображення поверх memoryview без копіювання."""
+        buffer = bytearray(b"\x89PNG-data")
+        picture = PictureFile.from_buffer(memoryview(buffer)[1:4])
+        self.assertEqual(picture.view.tobytes(), b"PNG")
+        self.assertEqual(picture.data, b"PNG")
+        buffer[1:4] = b"XYZ"
+        self.assertEqual(picture.data, b"PNG")  # Після першого читання дані скопійовано
+
+    def test_picture_file_equality(self):
+        """
+        Тест для перевірки рівності зображень за вмістом.
+        """
+        picture = PictureFile(data=b"abc")
+        copy = PictureFile.from_buffer(memoryview(b"abc"))
+        self.assertEqual(picture, copy)
+        self.assertEqual(hash(picture), hash(copy))
+        self.assertNotEqual(picture, PictureFile(data=b"abd"))
+        self.assertEqual(PictureFile.from_base64(picture.to_base64()), picture)
+
     def test_real_interval_creation(self):
         """Тест для перевірки створення інтервалу."""
         interval = RealInterval(1.0, 5.0)
@@ -26,5 +47,20 @@ class TestCustomTypes(unittest.TestCase):
         self.assertEqual(restored_interval.start, 2.0)
         self.assertEqual(restored_interval.end, 6.0)
 
+    def test_real_interval_value_type(self):
+        """Тест для перевірки незмінності, хешування та порівняння інтервалів."""
+        interval = RealInterval(1, 2)
+        with self.assertRaises(AttributeError):
+            interval.start = 5.0
+        with self.assertRaises(AttributeError):
+            interval.extra = 1
+        self.assertEqual(interval, RealInterval(1.0, 2.0))
+        self.assertNotEqual(interval, (1.0, 2.0))
+        self.assertEqual(len({interval, RealInterval(1, 2), RealInterval(1, 3)}), 2)
+        self.assertEqual(sorted([RealInterval(2, 3), RealInterval(1, 4), interval]),
+                         [interval, RealInterval(1, 4), RealInterval(2, 3)])
+        self.assertEqual(pickle.loads(pickle.dumps(interval)), interval)
+        self.assertFalse(hasattr(PictureFile(data=b"x"), "__dict__"))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import random
+from indexes import HashIndex, SortedIndex, IntervalIndex, make_index
+from schema import Field
+from custom_types import PictureFile, RealInterval
+
+class TestIndexes(unittest.TestCase):
+
+    def test_hash_index(self):
+        """
+        Тест для перевірки хеш-індексу: видалення не змінює ідентифікатори інших рядків.
+        """
+        index = HashIndex(Field("name", str))
+        index.build(["a", "b", "a", "c"], [10, 11, 12, 13])
+        self.assertEqual(index.lookup("a"), [10, 12])
+        index.remove(11, "b")
+        self.assertEqual(index.lookup("a"), [10, 12])
+        self.assertEqual(index.lookup("c"), [13])
+        self.assertEqual(index.lookup("b"), [])
+
+    def test_sorted_index_range(self):
+        """
+        Тест для перевірки запитів за діапазоном.
+        """
+        index = SortedIndex(Field("score", float))
+        index.build([5.0, 1.0, 3.0])
+        index.insert(3, 2.0)
+        self.assertEqual(index.range(1.5, 3.0), [3, 2])
+        self.assertEqual(index.range(low=3.0, include_low=False), [0])
+        index.insert(4, 3.0)
+        index.remove(2, 3.0)  # Рівні ключі впорядковані за ідентифікатором
+        index.insert(1, 3.0)
+        self.assertEqual(index.range(3.0, 3.0), [1, 4])
+
+    def test_sorted_interval_parts(self):
+        """
+        Тест для перевірки впорядкування інтервалів за початком і кінцем.
+        """
+        index = SortedIndex(Field("interval", RealInterval))
+        index.build([RealInterval(0, 10), RealInterval(2, 3), RealInterval(5, 6)])
+        self.assertEqual(index.range(1, 6, part="start"), [1, 2])
+        self.assertEqual(index.range(high=6, part="end"), [1, 2])
+        self.assertEqual(index.lookup(RealInterval(2, 3)), [1])
+        with self.assertRaises(ValueError):
+            index.range(1, 2)
+
+    def test_interval_index_matches_scan(self):
+        """
+        Тест для перевірки індексу інтервалів проти повного перегляду після вставок і видалень.
+        """
+        rng = random.Random(1)
+        values = {}
+        for row_id in range(300):
+            start = rng.uniform(0, 100)
+            values[row_id] = RealInterval(start, start + rng.uniform(0, 10))
+        index = IntervalIndex(Field("interval", RealInterval))
+        index.build([values[row_id] for row_id in range(200)])
+        for row_id in range(200, 300):
+            index.insert(row_id, values[row_id])
+        for row_id in (250, 10, 0):
+            index.remove(row_id, values.pop(row_id))
+
+        for low, high in ((-5, 0), (10, 12), (50, 50), (0, 200), (120, 130)):
+            expected = [i for i, v in values.items() if v.start <= high and v.end >= low]
+            self.assertEqual(index.overlaps(low, high), expected)
+        for point in (3.0, 42.5, 99.9):
+            expected = [i for i, v in values.items() if v.start <= point <= v.end]
+            self.assertEqual(index.contains_point(point), expected)
+            self.assertEqual(index.stabbing_count(point), len(expected))
+
+    def test_make_index_errors(self):
+        """
+        Тест для перевірки недопустимих індексів.
+        """
+        with self.assertRaises(ValueError):
+            make_index(Field("photo", PictureFile), "hash")
+        with self.assertRaises(ValueError):
+            make_index(Field("id", int), "btree")
+        with self.assertRaises(ValueError):
+            make_index(Field("id", int), "interval")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import json_stream
+from database import Database
+from schema import Schema, Field
+from custom_types import PictureFile, RealInterval
+
+class TestJsonStream(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Ініціалізація бази даних з двома таблицями.
+        """
+        self.db = Database()
+        schema = Schema([
+            Field("id", int),
+            Field("name", str),
+            Field("interval", RealInterval)
+        ])
+        for name in ("First", "Second"):
+            self.db.create_table(name, schema)
+            for i in range(50):
+                self.db.tables[name].add_row({"id": i * 1000, "name": f"{name} {i}",
+                                              "interval": RealInterval(i, i + 0.5)})
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "db.json")
+        self.db.save_to_disk(self.filename)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_iter_tables_small_chunks(self):
+        """
+        Тест для перевірки потокового розбору з дуже малими порціями читання.
+        """
+        with open(self.filename, 'r') as file:
+            tables = dict(json_stream.iter_tables(file, chunk_size=7))
+        self.assertEqual(list(tables), ["First", "Second"])
+        self.assertEqual(len(tables["Second"].rows), 50)
+        self.assertEqual(tables["Second"].rows[49].data["id"], 49000)
+        self.assertEqual(tables["First"].rows[3].data["interval"].end, 3.5)
+
+    def test_rows_before_schema(self):
+        """
+        Тест для перевірки таблиці, у якій рядки записані перед схемою.
+        """
+        text = json.dumps({"T": {"rows": [{"id": 1}], "name": "T",
+                                 "schema": {"fields": [{"name": "id", "data_type": "int"}]}}})
+        tables = dict(json_stream.iter_tables(io.StringIO(text), chunk_size=3))
+        self.assertEqual(tables["T"].rows[0].data["id"], 1)
+
+    def test_iter_rows(self):
+        """
+        Тест для перевірки перегляду рядків однієї таблиці.
+        """
+        names = [row.data["name"] for row in Database.iter_rows(self.filename, "Second")]
+        self.assertEqual(len(names), 50)
+        self.assertEqual(names[0], "Second 0")
+        with self.assertRaises(ValueError):
+            list(json_stream.iter_rows(self.filename, "Missing"))
+
+    def test_iter_rows_utf8(self):
+        """
+        Тест для перевірки перегляду рядків файлу з текстом у UTF-8 (незалежно від локалі).
+        """
+        text = json.dumps({"T": {"name": "T", "schema": {"fields": [{"name": "name", "data_type": "str"}]},
+                                 "rows": [{"name": "Привіт, ґанок"}]}}, ensure_ascii=False)
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            file.write(text)
+        self.assertEqual([row["name"] for row in json_stream.iter_rows(self.filename, "T")], ["Привіт, ґанок"])
+
+    def test_types_from_schema(self):
+        """
+        Тест для перевірки, що типи значень визначає схема, а не вміст:
+        рядок "/9j/..." лишається рядком, а PNG-зображення відновлюється як PictureFile.
+        """
+        db = Database()
+        db.create_table("Files", Schema([Field("note", str), Field("photo", PictureFile)]))
+        png = PictureFile(data=b"\x89PNG\r\n\x1a\n" + b"\x00" * 8)
+        db.tables["Files"].add_row({"note": "/9j/not a picture", "photo": png})
+        filename = os.path.join(self.directory.name, "files.json")
+        db.save_to_disk(filename)
+
+        loaded = Database()
+        loaded.load_from_disk(filename)
+        for row in (loaded.tables["Files"].rows[0], next(Database.iter_rows(filename, "Files"))):
+            self.assertEqual(row.data["note"], "/9j/not a picture")
+            self.assertIsInstance(row.data["photo"], PictureFile)
+            self.assertEqual(row.data["photo"].data, png.data)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import threading
+import time
+import unittest
+from locks import RWLock
+from table import Table
+from schema import Schema, Field
+
+class TestRWLock(unittest.TestCase):
+
+    def test_readers_share_writer_excludes(self):
+        """
+        Тест для перевірки одночасного читання та монопольного запису.
+        """
+        lock = RWLock()
+        inside = []
+        both_inside = threading.Event()
+        release = threading.Event()
+
+        def reader():
+            with lock.read():
+                inside.append(1)
+                if len(inside) == 2:
+                    both_inside.set()
+                release.wait(5)
+
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in readers:
+            thread.start()
+        self.assertTrue(both_inside.wait(5))
+
+        acquired = threading.Event()
+
+        def writer():
+            with lock.write():
+                acquired.set()
+
+        writer_thread = threading.Thread(target=writer)
+        writer_thread.start()
+        time.sleep(0.05)
+        self.assertFalse(acquired.is_set())  # Запис чекає, доки читають
+        release.set()
+        self.assertTrue(acquired.wait(5))
+        for thread in readers + [writer_thread]:
+            thread.join()
+
+    def test_reentrancy(self):
+        """
+        Тест для перевірки повторного входу та заборони переходу від читання до запису.
+        """
+        lock = RWLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with lock.read():
+                with self.assertRaises(RuntimeError):
+                    lock.acquire_write()
+
+    def test_reader_not_starved_by_writer(self):
+        """
+        Тест для перевірки, що читач отримує доступ між записами потоку, який пише без перерви.
+        """
+        lock = RWLock()
+        stop = threading.Event()
+
+        def writer():
+            while not stop.is_set():
+                with lock.write():
+                    time.sleep(0.001)
+
+        writer_thread = threading.Thread(target=writer)
+        writer_thread.start()
+        try:
+            start = time.perf_counter()
+            for _ in range(20):
+                with lock.read():
+                    pass
+            self.assertLess(time.perf_counter() - start, 2)
+        finally:
+            stop.set()
+            writer_thread.join()
+
+class TestTableConcurrency(unittest.TestCase):
+
+    def test_readers_during_deletes(self):
+        """
+        Тест для перевірки читання таблиці, з якої інший потік видаляє та додає рядки.
+        """
+        table = Table("T", Schema([Field("id", int), Field("even", int)]))
+        table.add_rows([{"id": i, "even": i % 2} for i in range(2000)])
+        table.create_index("even")
+        errors = []
+        stop = threading.Event()
+
+        def reader():
+            try:
+                while not stop.is_set():
+                    ids = [row.data["id"] for row in table]
+                    if ids != sorted(ids):
+                        errors.append("порядок")
+                    for row in table.query().where("even", "==", 0).limit(50):
+                        if row["id"] % 2:
+                            errors.append(row)
+                    with table.lock.read():  # Кілька читань як одна узгоджена операція
+                        if len(table.find("even", 1)) + len(table.find("even", 0)) != len(table):
+                            errors.append("індекс")
+            except Exception as error:  # Будь-який виняток у читача - помилка тесту
+                errors.append(error)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(300):
+            table.delete_row(0)
+            table.add_row({"id": 2000 + i, "even": i % 2})
+        table.delete_rows(range(0, 100, 3))
+        stop.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_iteration_is_snapshot(self):
+        """
+        Тест для перевірки, що зміни таблиці під час ітерації не видно в циклі.
+        """
+        for storage in ("rows", "columnar"):
+            with self.subTest(storage=storage):
+                table = Table("T", Schema([Field("id", int), Field("s", str)]), storage=storage)
+                table.add_rows([{"id": i, "s": str(i)} for i in range(5)])
+                seen = []
+                for row in table:
+                    seen.append(row.data)
+                    if row["id"] == 1:
+                        table.edit_row(4, {"id": 40, "s": "x"})
+                        table.delete_row(3)
+                        table.add_row({"id": 5, "s": "5"})
+                self.assertEqual(seen, [{"id": i, "s": str(i)} for i in range(5)])
+                self.assertEqual([row["id"] for row in table], [0, 1, 2, 40, 5])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import parallel_io
+from blob_store import BlobStore, blob_directory
+from database import Database
+from schema import Schema, Field
+from custom_types import RealInterval, PictureFile
+from cache import picture_cache
+
+class TestParallelSave(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Ініціалізація бази даних з рядковою та колонковою таблицями з усіма типами колонок.
+        """
+        self.db = Database()
+        schema = Schema([Field("id", int), Field("score", float), Field("name", str),
+                         Field("interval", RealInterval), Field("picture", PictureFile),
+                         Field("tag", "char", dictionary=True)])
+        for storage in ("rows", "columnar"):
+            self.db.create_table(storage, schema, storage)
+            self.db.tables[storage].add_rows([
+                {"id": i, "score": i / 2, "name": f"ім'я {i}", "interval": RealInterval(i, i + 1),
+                 "picture": PictureFile(data=bytes([i % 3]) * 10), "tag": "xyz"[i % 3]} for i in range(10)])
+            self.db.tables[storage].create_index("id")
+        self.db.create_table("empty", Schema([Field("id", int)]))
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _read(self, name):
+        with open(os.path.join(self.directory.name, name), 'rb') as file:
+            return file.read()
+
+    def test_same_bytes_as_sequential(self):
+        """
+        Тест для перевірки, що паралельний запис дає той самий файл, що й послідовний,
+        для обох форматів, з кількома частинами на таблицю.
+        """
+        with mock.patch.object(parallel_io, "CHUNK_ROWS", 3):
+            for extension in (".json", ".ldb"):
+                sequential = os.path.join(self.directory.name, "sequential" + extension)
+                parallel = os.path.join(self.directory.name, "parallel" + extension)
+                self.db.save_to_disk(sequential)
+                self.db.save_to_disk(parallel, workers=2)
+                self.assertEqual(self._read("sequential" + extension), self._read("parallel" + extension))
+                loaded = Database()
+                loaded.load_from_disk(parallel)
+                self.assertEqual(loaded.tables["rows"].to_dict(), self.db.tables["rows"].to_dict())
+
+    def test_blobs_referenced_from_workers(self):
+        """
+        Тест для перевірки, що зображення, записані виконавцями у сховище,
+        не видаляються збиранням сміття після паралельного запису.
+        """
+        for extension in (".json", ".ldb"):
+            filename = os.path.join(self.directory.name, "db" + extension)
+            self.db.save_to_disk(filename, blobs=True, workers=2)
+            self.assertEqual(len(list(BlobStore(blob_directory(filename)).digests())), 3)
+            loaded = Database()
+            loaded.load_from_disk(filename)
+            self.assertEqual(loaded.tables["columnar"].get_row(4).data["picture"].data, bytes([1]) * 10)
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "fork недоступний")
+    def test_lock_held_by_other_thread(self):
+        """
+        Тест для перевірки, що виконавці не зависають на блокуванні кешу зображень,
+        яке в момент fork утримував інший потік.
+        """
+        filename = os.path.join(self.directory.name, "db.json")
+        self.db.save_to_disk(filename, blobs=True)
+        loaded = Database()
+        loaded.load_from_disk(filename)  # Байти зображень читаються зі сховища через кеш
+        picture_cache.clear()
+        held, release = threading.Event(), threading.Event()
+
+        def hold():
+            with picture_cache._lock:
+                held.set()
+                release.wait()
+
+        holder = threading.Thread(target=hold, daemon=True)
+        holder.start()
+        held.wait()
+        saver = threading.Thread(target=loaded.save_to_disk, daemon=True,
+                                 args=(os.path.join(self.directory.name, "copy.json"),), kwargs={"workers": 2})
+        try:
+            saver.start()
+            saver.join(30)
+            self.assertFalse(saver.is_alive())
+        finally:
+            release.set()
+            holder.join()
+        copy = Database()
+        copy.load_from_disk(os.path.join(self.directory.name, "copy.json"))
+        self.assertEqual(copy.tables["rows"].get_row(4).data["picture"].data, bytes([1]) * 10)
+
+if __name__ == "__main__":
+    unittest.main()
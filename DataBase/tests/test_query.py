@@ -0,0 +1,85 @@
+import unittest
+from table import Table
+from schema import Schema, Field
+from custom_types import RealInterval
+
+class TestQuery(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Ініціалізація таблиці для тестів.
+        """
+        schema = Schema([
+            Field("id", int),
+            Field("group", str),
+            Field("interval", RealInterval)
+        ])
+        self.table = Table("TestTable", schema, storage="columnar")
+        for i in range(20):
+            self.table.add_row({"id": i, "group": "abc"[i % 3], "interval": RealInterval(i, i + 3)})
+
+    def test_filter_project(self):
+        """
+        Тест для перевірки фільтрації та вибірки колонок.
+        """
+        result = self.table.query().where("group", "==", "a").where("id", ">", 5).select("id").all()
+        self.assertEqual(result, [{"id": 6}, {"id": 9}, {"id": 12}, {"id": 15}, {"id": 18}])
+        result = self.table.query().where(lambda row: row["id"] % 10 == 0).select("group").all()
+        self.assertEqual(result, [{"group": "a"}, {"group": "b"}])
+
+    def test_order_limit_offset(self):
+        """
+        Тест для перевірки сортування з лімітом і зміщенням.
+        """
+        query = self.table.query().order_by("id", descending=True).offset(2).limit(3).select("id")
+        self.assertEqual([row["id"] for row in query], [17, 16, 15])
+        query = self.table.query().where("group", "in", ("b", "c")).order_by("interval.end").limit(2)
+        self.assertEqual([row["id"] for row in query], [1, 2])
+        self.assertEqual(self.table.query().offset(18).count(), 2)
+
+    def test_index_pushdown(self):
+        """
+        Тест для перевірки однакових результатів з індексами та без них.
+        """
+        queries = [
+            lambda: self.table.query().where("group", "==", "b").where("id", "<", 10),
+            lambda: self.table.query().where("id", ">=", 15),
+            lambda: self.table.query().where("interval.start", "<", 4),
+            lambda: self.table.query().where("interval", "overlaps", (4.5, 5.5)),
+            lambda: self.table.query().where("interval", "contains", 7.0).where("group", "!=", "a"),
+        ]
+        expected = [[row["id"] for row in build()] for build in queries]
+        self.table.create_index("group", "hash")
+        self.table.create_index("id", "sorted")
+        self.table.create_index("interval", "sorted")
+        self.table.create_index("interval", "interval")
+        self.assertEqual([[row["id"] for row in build()] for build in queries], expected)
+        self.assertEqual(expected[3], [2, 3, 4, 5])
+
+    def test_lazy_streaming(self):
+        """
+        Тест для перевірки, що великий результат читається зі знімка по одному рядку.
+        """
+        self.table.add_rows([{"id": i, "group": "d", "interval": RealInterval(0, 1)} for i in range(20, 3000)])
+        checked = []
+        rows = iter(self.table.query().where(lambda data: checked.append(data["id"]) is None).select("id"))
+        self.assertEqual(next(rows), {"id": 0})
+        self.assertEqual(len(checked), 1)
+        self.table.delete_rows(range(10))
+        self.table.add_row({"id": -1, "group": "a", "interval": RealInterval(0, 1)})
+        self.assertEqual([row["id"] for row in rows], list(range(1, 3000)))
+        self.assertEqual(len(self.table.query().where("group", "==", "d").limit(5).all()), 5)
+
+    def test_invalid_query(self):
+        """
+        Тест для перевірки помилок побудови запиту.
+        """
+        with self.assertRaises(ValueError):
+            self.table.query().where("missing", "==", 1)
+        with self.assertRaises(ValueError):
+            self.table.query().where("id", "~", 1)
+        with self.assertRaises(ValueError):
+            self.table.query().order_by("interval.middle")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
+import tracemalloc
 import unittest
+import storage
 from row import Row
-from custom_types import RealInterval
+from schema import Schema, Field
+from custom_types import PictureFile, RealInterval
 
 class TestRow(unittest.TestCase):
 
@@ -28,5 +31,77 @@ class TestRow(unittest.TestCase):
         self.assertEqual(row.data["id"], 123)
         self.assertEqual(row.data["value"], "Example")
 
+    def test_row_from_dict_with_schema(self):
+        """
+        Тест для перевірки відновлення рядка за схемою без вгадування типів.
+        """
+        schema = Schema([Field("text", str), Field("photo", PictureFile), Field("interval", RealInterval)])
+        photo = PictureFile(data=b"\x89PNG")
+        serialized = Row({"text": "/9j/abc", "photo": photo, "interval": RealInterval(1, 2)}).to_dict()
+        row = Row.from_dict(serialized, schema)
+        self.assertEqual(row.data["text"], "/9j/abc")
+        self.assertEqual(row.data["photo"].data, b"\x89PNG")
+        self.assertEqual(row.data["interval"].end, 2)
+
+    def test_positional_row(self):
+        """
+        Тест для перевірки рядка з позиційними значеннями та спільним описом колонок схеми.
+        """
+        schema = Schema([Field("id", int), Field("name", str)])
+        row = Row((7, "a"), schema.layout)
+        self.assertEqual(row["name"], "a")
+        self.assertEqual(row.get("missing", 0), 0)
+        self.assertEqual(list(row), ["id", "name"])
+        self.assertEqual(dict(row), {"id": 7, "name": "a"})
+        self.assertEqual(row.data, {"id": 7, "name": "a"})
+        self.assertEqual(row, Row({"id": 7, "name": "a"}))
+        self.assertIs(Row({"id": 1, "name": "b"}).layout, Row({"id": 2, "name": "c"}).layout)
+        self.assertFalse(hasattr(row, "__dict__"))
+        self.assertFalse(hasattr(Field("x", int), "__dict__"))
+
+    def test_memory_footprint(self):
+        """
+        Тест пам'яті (tracemalloc) для 10 000 рядків з колонкою інтервалів: рядки сховища
+        та об'єкти Row займають значно менше, ніж словники з об'єктами з __dict__.
+        Вимірювання на великих таблицях - benchmarks/bench_memory.py.
+        """
+        count = 10_000
+        schema = Schema([Field("id", int), Field("interval", RealInterval)])
+
+        class DictInterval:  # Інтервал з __dict__ (попереднє представлення)
+            def __init__(self, start, end):
+                self.start = float(start)
+                self.end = float(end)
+
+        class DictRow:  # Рядок зі словником за назвами колонок
+            def __init__(self, data):
+                self.data = data
+
+        def allocated(function):
+            tracemalloc.start()
+            try:
+                result = function()
+                return tracemalloc.get_traced_memory()[0], result
+            finally:
+                tracemalloc.stop()
+
+        legacy, result = allocated(lambda: [DictRow({"id": i, "interval": DictInterval(i, i + 1)})
+                                            for i in range(count)])
+        del result
+        rows, result = allocated(lambda: [Row((i, RealInterval(i, i + 1)), schema.layout) for i in range(count)])
+        self.assertEqual(result[-1]["interval"], RealInterval(count - 1, count))
+        del result
+        stored, result = allocated(lambda: self._storage(schema, count))
+        self.assertEqual(len(result), count)
+        del result
+        self.assertLess(rows, legacy * 0.6)
+        self.assertLess(stored, legacy * 0.6)
+
+    @staticmethod
+    def _storage(schema, count):
+        rows = storage.RowStorage(schema)
+        rows.extend_columns({"id": range(count), "interval": [RealInterval(i, i + 1) for i in range(count)]})
+        return rows
+
 if __name__ == "__main__":
     unittest.main()
@@ -25,6 +25,33 @@ class TestSchema(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.schema.validate(invalid_data)
 
+    def test_compiled_validator(self):
+        """
+        Тест для перевірки скомпільованого валідатора.
+        """
+        validate = Schema(self.fields + [Field("grade", "char")]).compile_validator()
+        validate({"id": 1, "name": "Test", "interval": RealInterval(1.0, 5.0), "grade": "A"})
+        with self.assertRaises(TypeError):
+            validate({"id": 1, "name": "Test", "interval": RealInterval(1.0, 5.0), "grade": "AB"})
+        with self.assertRaises(ValueError):
+            validate({"id": 1, "name": "Test"})
+
+    def test_compiled_codecs_invalidation(self):
+        """
+        Тест для перевірки перекомпіляції функцій після зміни полів.
+        """
+        data = {"id": 1, "name": "Test", "interval": RealInterval(1.0, 5.0)}
+        serialized = self.schema.serializer(data)
+        self.assertEqual(serialized["interval"], {"start": 1.0, "end": 5.0})
+        self.assertEqual(self.schema.deserializer(serialized)["interval"].end, 5.0)
+
+        self.schema.fields = self.fields[:2]
+        self.assertIs(self.schema.serializer(data)["interval"], data["interval"])
+        self.fields[0].name = "key"
+        self.schema.invalidate()
+        with self.assertRaises(ValueError):
+            self.schema.validate(data)
+
     def test_schema_serialization(self):
         """
         Тест для перевірки серіалізації схеми.
@@ -33,5 +60,20 @@ class TestSchema(unittest.TestCase):
         deserialized_schema = Schema.from_dict(serialized)
         self.assertEqual(len(deserialized_schema.fields), len(self.schema.fields))
 
+    def test_column_ids(self):
+        """
+        Тест для перевірки призначення та збереження ідентифікаторів колонок.
+        """
+        self.assertEqual([field.column_id for field in self.schema.fields], list(range(len(self.fields))))
+        schema = Schema([Field("b", int, 5), Field("a", str)], next_column_id=3)
+        self.assertEqual(schema.column_ids, {"b": 5, "a": 6})
+        restored = Schema.from_dict(Schema([Field("x", int, 2)], next_column_id=7).to_dict())
+        self.assertEqual(restored.column_ids, {"x": 2})
+        self.assertEqual(restored.next_column_id, 7)
+        with self.assertRaises(ValueError):
+            Schema([Field("a", int, 1), Field("b", int, 1)])
+        with self.assertRaises(ValueError):
+            Schema([Field("a", int), Field("a", str)])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import unittest
+from client import Client
+from database import Database
+from schema import Schema, Field
+from server import serve
+from custom_types import RealInterval, PictureFile
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """
+        Запуск сервера з порожньою базою на вільному порту та підключення клієнта.
+        """
+        self.database = Database()
+        self.server = await serve(self.database, port=0, batch_size=3)
+        port = self.server.sockets[0].getsockname()[1]
+        self.client = await Client(port=port, pool_size=2).connect()
+        self.schema = Schema([Field("id", int), Field("name", str),
+                              Field("interval", RealInterval), Field("picture", PictureFile)])
+        await self.client.create_table("t", self.schema)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _row(self, i):
+        return {"id": i, "name": f"n{i}", "interval": RealInterval(i, i + 1), "picture": PictureFile(data=bytes([i]))}
+
+    async def test_row_operations(self):
+        """
+        Тест для перевірки додавання, редагування, видалення та читання рядків з типами схеми.
+        """
+        await self.client.add_row("t", self._row(0))
+        await self.client.add_rows("t", [self._row(i) for i in range(1, 5)])
+        await self.client.edit_row("t", 1, self._row(10))
+        await self.client.delete_row("t", 2)
+        row = await self.client.get_row("t", 1)
+        self.assertEqual((row["id"], row["interval"].end, row["picture"].data), (10, 11.0, bytes([10])))
+        self.assertEqual([row.data["id"] for row in self.database.tables["t"].rows], [0, 10, 3, 4])
+        self.assertEqual(await self.client.find("t", "id", 3), [2])
+        self.assertEqual(await self.client.tables(), ["t"])
+
+    async def test_errors(self):
+        """
+        Тест для перевірки, що помилки запиту повертаються клієнту, а з'єднання працює далі.
+        """
+        with self.assertRaises(IndexError):
+            await self.client.get_row("t", 5)
+        with self.assertRaises(ValueError):
+            await self.client.create_table("t", self.schema)
+        with self.assertRaises(ValueError):
+            await self.client.count("missing")
+        self.assertEqual(await self.client.count("t"), 0)
+        with self.assertRaises(TypeError):  # Значення, яке не кодується в JSON, не залишає запиту без відповіді
+            await self.client._request("find", table="t", column="id", value=object())
+        self.assertEqual([connection.load for connection in self.client.connections], [0, 0])
+
+    async def test_pipelined_requests(self):
+        """
+        Тест для перевірки конвеєра: багато одночасних запитів через пул з'єднань.
+        """
+        await asyncio.gather(*(self.client.add_row("t", self._row(i)) for i in range(100)))
+        counts = await asyncio.gather(*(self.client.count("t", [("id", "<", i)]) for i in range(100)))
+        self.assertEqual(counts, list(range(100)))
+
+    async def test_streaming_query(self):
+        """
+        Тест для перевірки потокового результату кількома кадрами та дочитування
+        після залишеного незавершеним запиту.
+        """
+        await self.client.add_rows("t", [self._row(i) for i in range(20)])
+        rows = [row async for row in self.client.query("t", [("id", ">=", 5)], select=["id", "interval"],
+                                                        order_by="id", descending=True, limit=10)]
+        self.assertEqual([row["id"] for row in rows], list(range(19, 9, -1)))
+        self.assertEqual(rows[0]["interval"].start, 19.0)
+        stream = self.client.query("t")
+        self.assertEqual((await stream.__anext__())["id"], 0)
+        await stream.aclose()
+        self.assertEqual(len([row async for row in self.client.query("t")]), 20)
+
+    async def test_requests_during_stream(self):
+        """
+        Тест для перевірки запитів, надісланих під час читання потокового результату
+        (з одним з'єднанням у пулі відповідь не повинна чекати на потік).
+        """
+        port = self.server.sockets[0].getsockname()[1]
+        async with Client(port=port, pool_size=1) as client:
+            await client.add_rows("t", [self._row(i) for i in range(100)])
+
+            async def read():
+                ids = []
+                async for row in client.query("t"):
+                    ids.append(row["id"])
+                    if row["id"] % 25 == 0:
+                        ids.append(await client.count("t", [("id", "<", row["id"])]))
+                        async for inner in client.query("t", [("id", "==", row["id"])]):
+                            ids.append(inner["id"])
+                return ids
+
+            ids = await asyncio.wait_for(read(), 10)
+            self.assertEqual(len(ids), 108)
+            self.assertEqual(ids[:4], [0, 0, 0, 1])
+            self.assertLessEqual(len(client._stream_connections), 1)
+
+    async def test_conditions_in_schema_types(self):
+        """
+        Тест для перевірки пошуку та умов зі значеннями RealInterval і PictureFile
+        (повним переглядом і через індекс).
+        """
+        await self.client.add_rows("t", [self._row(i) for i in range(6)])
+        interval, picture = RealInterval(2, 3), PictureFile(data=bytes([2]))
+        for indexed in (False, True):
+            with self.subTest(indexed=indexed):
+                if indexed:
+                    self.database.tables["t"].create_index("interval", "hash")
+                self.assertEqual(await self.client.find("t", "interval", interval), [2])
+                self.assertEqual(await self.client.find("t", "picture", picture), [2])
+                self.assertEqual(await self.client.count("t", [("interval", "==", interval)]), 1)
+                self.assertEqual(await self.client.count("t", [("interval", "in", [interval, RealInterval(4, 5)]),
+                                                              ("picture", "!=", picture)]), 1)
+                rows = [row async for row in self.client.query("t", [("picture", "==", picture),
+                                                                     ("interval", "overlaps", (2.5, 9)),
+                                                                     ("interval", "contains", 2.5),
+                                                                     ("interval.start", ">=", 2)])]
+                self.assertEqual([(row["id"], row["interval"]) for row in rows], [(2, interval)])
+
+    async def test_blocked_request_does_not_stall_server(self):
+        """
+        Тест для перевірки, що запит, який чекає на блокування таблиці, не зупиняє
+        обробку запитів інших з'єднань.
+        """
+        locked, release = threading.Event(), threading.Event()
+
+        def hold():
+            with self.database.tables["t"].lock.write():
+                locked.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        locked.wait()
+        try:
+            count = asyncio.ensure_future(self.client.count("t"))
+            await asyncio.sleep(0.05)
+            self.assertEqual(await asyncio.wait_for(self.client.tables(), 2), ["t"])
+            self.assertFalse(count.done())
+        finally:
+            release.set()
+        self.assertEqual(await count, 0)
+        holder.join()
+
+if __name__ == "__main__":
+    unittest.main()
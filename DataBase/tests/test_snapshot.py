@@ -0,0 +1,107 @@
+import gc
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from database import Database
+from schema import Schema, Field
+from custom_types import RealInterval
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Ініціалізація бази даних з рядковою та колонковою таблицями.
+        """
+        self.db = Database()
+        schema = Schema([Field("id", int), Field("name", str), Field("interval", RealInterval)])
+        for storage in ("rows", "columnar"):
+            self.db.create_table(storage, schema, storage)
+            self.db.tables[storage].add_rows(
+                [{"id": i, "name": f"n{i}", "interval": RealInterval(i, i + 1)} for i in range(10)])
+            self.db.tables[storage].create_index("id")
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "db.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_snapshot_isolation(self):
+        """
+        Тест для перевірки, що зміни після знімка не видно у знімку.
+        """
+        snapshot = self.db.snapshot()
+        for storage in ("rows", "columnar"):
+            table = self.db.tables[storage]
+            table.add_row({"id": 10, "name": "new", "interval": RealInterval(0, 1)})
+            table.edit_row(0, {"id": 100, "name": "edited", "interval": RealInterval(5, 6)})
+            table.delete_row(1)
+            table.rename_or_reorder_columns(["name", "id", "interval"])
+
+            frozen = snapshot.tables[storage]
+            self.assertEqual(len(frozen.rows), 10)
+            self.assertEqual(frozen.rows[0].data["id"], 0)
+            self.assertEqual(list(frozen.rows[1].data), ["id", "name", "interval"])
+            self.assertEqual([row["id"] for row in frozen.query().where("id", ">=", 8).all()], [8, 9])
+            self.assertEqual(table.find("id", 100), [0])
+            self.assertEqual(list(table.rows[1].data), ["name", "id", "interval"])
+            with self.assertRaises(ValueError):
+                frozen.add_row({"id": 1, "name": "x", "interval": RealInterval(0, 1)})
+
+    def test_no_copy_without_live_snapshot(self):
+        """
+        Тест для перевірки, що сховище не копіюється, якщо знімок уже не використовується.
+        """
+        table = self.db.tables["rows"]
+        rows = table.rows
+        snapshot = self.db.snapshot()
+        del snapshot
+        gc.collect()
+        table.delete_row(0)
+        self.assertIs(table.rows, rows)
+
+    def test_background_save_during_ingestion(self):
+        """
+        Тест для перевірки збереження у фоні, поки інший потік додає рядки.
+        """
+        stop = threading.Event()
+
+        def writer():
+            i = 1000
+            while not stop.is_set():
+                self.db.tables["rows"].add_row({"id": i, "name": "w", "interval": RealInterval(0, 1)})
+                i += 1
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            saver = self.db.save_to_disk(self.filename, background=True)
+            saver.join()
+        finally:
+            stop.set()
+            thread.join()
+        loaded = Database()
+        loaded.load_from_disk(self.filename)
+        ids = [row.data["id"] for row in loaded.tables["rows"].rows]
+        self.assertEqual(ids[:10], list(range(10)))
+        self.assertEqual(ids[10:], list(range(1000, 1000 + len(ids) - 10)))
+        self.assertEqual(loaded.tables["rows"].index_definitions(), [{"column": "id", "kind": "hash"}])
+
+    def test_atomic_save(self):
+        """
+        Тест для перевірки, що невдалий запис не пошкоджує попередній файл і не лишає тимчасових файлів.
+        """
+        self.db.save_to_disk(self.filename)
+        with open(self.filename) as file:
+            original = file.read()
+        self.db.tables["rows"].delete_row(0)
+        with mock.patch("json.dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.db.save_to_disk(self.filename)
+        with open(self.filename) as file:
+            self.assertEqual(file.read(), original)
+        self.assertEqual(os.listdir(self.directory.name), ["db.json"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+from array import array
+from storage import ColumnarStorage, RowStorage, make_storage
+from schema import Schema, Field
+from custom_types import RealInterval
+
+class TestStorage(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Ініціалізація схеми для тестів.
+        """
+        self.schema = Schema([
+            Field("id", int),
+            Field("score", float),
+            Field("name", str),
+            Field("interval", RealInterval)
+        ])
+
+    def test_columnar_typed_columns(self):
+        """
+        Тест для перевірки типів колонок у колонковому сховищі.
+        """
+        storage = ColumnarStorage(self.schema)
+        storage.append({"id": 1, "score": 2.5, "name": "A", "interval": RealInterval(1.0, 5.0)})
+        storage.append({"id": 2, "score": 3.5, "name": "B", "interval": RealInterval(2.0, 6.0)})
+        self.assertIsInstance(storage.column("id"), array)
+        self.assertEqual(storage.column("id").typecode, "q")
+        self.assertEqual(storage.column("score").typecode, "d")
+        self.assertEqual(sum(storage.column("score")), 6.0)
+        self.assertEqual(list(storage.raw_column("interval").ends), [5.0, 6.0])
+
+    def test_columnar_row_views(self):
+        """
+        Тест для перевірки редагування, видалення та побудови рядків.
+        """
+        storage = ColumnarStorage(self.schema)
+        for i in range(3):
+            storage.append({"id": i, "score": float(i), "name": str(i), "interval": RealInterval(i, i + 1)})
+        storage.replace(1, {"id": 10, "score": 1.5, "name": "X", "interval": RealInterval(0.0, 1.0)})
+        storage.delete(0)
+        self.assertEqual(len(storage), 2)
+        self.assertEqual(storage[0].data["id"], 10)
+        self.assertEqual(storage[-1].data["name"], "2")
+        self.assertEqual(storage[0].data["interval"].end, 1.0)
+        with self.assertRaises(IndexError):
+            storage[2]
+
+    def test_failed_append_rolls_back(self):
+        """
+        Тест для перевірки відкату рядка, який не вдалося дописати в усі колонки.
+        """
+        for storage in (RowStorage(self.schema), ColumnarStorage(self.schema)):
+            storage.append({"id": 1, "score": 1.0, "name": "A", "interval": RealInterval(0.0, 1.0)})
+            next_id = storage.next_id
+            with self.assertRaises(KeyError):
+                storage.append({"id": 2, "score": 2.0})
+            storage.append({"id": 3, "score": 3.0, "name": "C", "interval": RealInterval(1.0, 2.0)})
+            storage.append({"id": 4, "score": 4.0, "name": "D", "interval": RealInterval(2.0, 3.0)})
+            storage.rollback(next_id)
+            self.assertEqual([row["id"] for row in storage], [1])
+            self.assertEqual(storage.next_id, next_id)
+            if isinstance(storage, ColumnarStorage):
+                self.assertEqual({len(column) for column in storage.columns.values()}, {1})
+
+    def test_tombstones_and_compaction(self):
+        """
+        Тест для перевірки сталих ідентифікаторів, позначення видалених рядків та ущільнення.
+        """
+        for kind in ("rows", "columnar"):
+            storage = make_storage(kind, self.schema)
+            for i in range(10):
+                self.assertEqual(storage.append(
+                    {"id": i, "score": float(i), "name": str(i), "interval": RealInterval(i, i + 1)}), i)
+            storage.delete_ids([2, 5, 6])
+            storage.delete(0)
+            self.assertEqual(len(storage), 6)
+            self.assertEqual(list(storage.live_ids()), [1, 3, 4, 7, 8, 9])
+            self.assertEqual([row.data["id"] for row in storage], [1, 3, 4, 7, 8, 9])
+            self.assertEqual(list(storage.column("id")), [1, 3, 4, 7, 8, 9])
+            self.assertEqual(storage[3].data["name"], "7")
+            self.assertEqual(storage.position_of(7), 3)
+            self.assertEqual(storage.positions([9, 1]), [5, 0])
+            with self.assertRaises(IndexError):
+                storage.get_by_id(5)
+            with self.assertRaises(IndexError):
+                storage.delete_ids([3, 5])  # Нічого не видаляється
+            self.assertEqual(len(storage), 6)
+            snapshot = storage.copy()
+            storage.compact()
+            self.assertEqual(storage.deleted, [])
+            self.assertEqual(list(storage.live_ids()), [1, 3, 4, 7, 8, 9])
+            self.assertEqual(storage.get_by_id(8).data["score"], 8.0)
+            self.assertEqual(storage.append(
+                {"id": 10, "score": 0.0, "name": "", "interval": RealInterval(0, 1)}), 10)
+            self.assertEqual(len(snapshot), 6)  # Копія не змінилась
+            self.assertEqual(snapshot[5].data["id"], 9)
+
+    def test_dictionary_column(self):
+        """
+        Тест для перевірки колонки зі словниковим кодуванням, пошуку за кодами та ущільнення.
+        """
+        schema = Schema([Field("id", int), Field("status", str, dictionary=True)])
+        storage = ColumnarStorage(schema)
+        storage.extend_columns({"id": range(6), "status": ["new", "done", "new", "failed", "new", "done"]})
+        column = storage.raw_column("status")
+        self.assertEqual(column.dictionary, ["new", "done", "failed"])
+        self.assertEqual(list(column.codes), [0, 1, 0, 2, 0, 1])
+        self.assertIs(storage[0].data["status"], storage[2].data["status"])
+        self.assertEqual(storage.equal_positions("status", ["new"]), [0, 2, 4])
+        self.assertEqual(storage.equal_positions("status", ["failed", "done"]), [1, 3, 5])
+        self.assertEqual(storage.equal_positions("status", ["missing"]), [])
+        self.assertIsNone(storage.equal_positions("id", [1]))
+        storage.delete_ids([0, 3])
+        self.assertEqual(storage.equal_positions("status", ["new"]), [1, 2])
+        storage.compact()
+        self.assertEqual(storage.raw_column("status").dictionary, ["new", "done"])
+        self.assertEqual(storage.column("status"), ["done", "new", "new", "done"])
+        dictionary, codes = storage.dictionary_codes("status")
+        self.assertEqual([dictionary[code] for code in codes], ["done", "new", "new", "done"])
+        with self.assertRaises(ValueError):
+            Field("id", int, dictionary=True)
+
+    def test_make_storage(self):
+        """
+        Тест для перевірки вибору сховища.
+        """
+        self.assertIsInstance(make_storage("rows", self.schema), RowStorage)
+        self.assertIsInstance(make_storage("columnar", self.schema), ColumnarStorage)
+        with self.assertRaises(ValueError):
+            make_storage("unknown", self.schema)
+
+if __name__ == "__main__":
+    unittest.main()
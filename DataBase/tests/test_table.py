@@ -1,6 +1,10 @@
+import os
+import tempfile
 import unittest
+import storage
+from database import Database
 from table import Table
-from schema import Schema, Field
+from schema import Schema, Field, BatchValidationError
 from custom_types import RealInterval
 
 class TestTable(unittest.TestCase):
@@ -34,5 +38,361 @@ class TestTable(unittest.TestCase):
         self.table.rename_or_reorder_columns(["name", "interval", "id"])
         self.assertEqual(list(self.table.rows[0].data.keys()), ["name", "interval", "id"])
 
+    def test_rename_columns(self):
+        """
+        Тест для перевірки перейменування колонок без переписування рядків, з індексами та збереженням.
+        """
+        for kind in ("rows", "columnar"):
+            db = Database()
+            db.create_table("T", Schema([Field("id", int), Field("name", str), Field("interval", RealInterval)]), kind)
+            table = db.tables["T"]
+            table.add_rows([{"id": i, "name": f"n{i}", "interval": RealInterval(i, i + 1)} for i in range(5)])
+            table.create_index("name")
+            table.create_index("id", "sorted")
+            stored = table.rows._rows[0] if kind == "rows" else table.rows.columns[1]
+            table.rename_or_reorder_columns(["name", "id", "interval"], {"name": "title", "id": "key"})
+            self.assertIs(table.rows._rows[0] if kind == "rows" else table.rows.columns[1], stored)
+            self.assertEqual(list(table.rows[2].data), ["title", "key", "interval"])
+            self.assertEqual(table.rows[2].data["title"], "n2")
+            self.assertEqual(table.find("title", "n3"), [3])
+            self.assertEqual(table.find_range("key", 1, 2), [1, 2])
+            self.assertEqual(set(table.indexes), {("title", "hash"), ("key", "sorted")})
+            self.assertEqual([row["key"] for row in table.query().where("title", "==", "n4")], [4])
+            with self.assertRaises(ValueError):
+                table.find("name", "n3")
+            with self.assertRaises(ValueError):
+                table.rename_or_reorder_columns(["title", "key", "interval"], {"title": "key"})
+            table.add_row({"title": "new", "key": 9, "interval": RealInterval(0, 1)})
+            with tempfile.TemporaryDirectory() as directory:
+                for filename in ("db.json", "db.ldb"):
+                    path = os.path.join(directory, filename)
+                    db.save_to_disk(path)
+                    loaded = Database()
+                    loaded.load_from_disk(path)
+                    copy = loaded.tables["T"]
+                    self.assertEqual([field.name for field in copy.schema.fields], ["title", "key", "interval"])
+                    self.assertEqual(copy.schema.column_ids, table.schema.column_ids)
+                    self.assertEqual(copy.find("title", "new"), [5])
+                    self.assertEqual(list(copy.get_row(0).data.items())[:2], [("title", "n0"), ("key", 0)])
+
+    def test_add_and_drop_columns(self):
+        """
+        Тест для перевірки додавання та видалення колонок без переписування рядків і їх збереження.
+        """
+        for kind in ("rows", "columnar"):
+            db = Database()
+            db.create_table("T", Schema([Field("id", int), Field("name", str)]), kind)
+            table = db.tables["T"]
+            table.add_rows([{"id": i, "name": f"n{i}"} for i in range(6)])
+            table.create_index("name")
+            table.delete_row(1)
+            table.add_column(Field("score", float), 0.5)
+            self.assertEqual(table.get_row(0).data, {"id": 0, "name": "n0", "score": 0.5})
+            self.assertEqual(list(table.column("score")), [0.5] * 5)
+            table.add_row({"id": 9, "name": "n9", "score": 2.0})
+            self.assertEqual([row["score"] for row in table.query().where("score", ">", 1)], [2.0])
+            with self.assertRaises(ValueError):
+                table.add_column(Field("id", int), 0)
+            with self.assertRaises(TypeError):
+                table.add_column(Field("flag", int), "x")
+
+            table.drop_column("name")
+            self.assertEqual(list(table.get_row(1).data), ["id", "score"])
+            self.assertEqual(table.indexes, {})
+            with self.assertRaises(ValueError):
+                table.column("name")
+            table.add_column(Field("name", "char"), "z")  # Нова колонка з тією ж назвою - інші дані
+            self.assertEqual(table.get_row(0).data["name"], "z")
+            with tempfile.TemporaryDirectory() as directory:
+                for filename in ("db.json", "db.ldb"):
+                    path = os.path.join(directory, filename)
+                    db.save_to_disk(path)
+                    loaded = Database()
+                    loaded.load_from_disk(path)
+                    copy = loaded.tables["T"]
+                    self.assertEqual([row.data for row in copy], [row.data for row in table])
+            table.compact()
+            if kind == "rows":
+                self.assertEqual(table.rows._rows[0], (0, 0.5, "z"))
+            self.assertEqual(table.get_row(2).data, {"id": 3, "score": 0.5, "name": "z"})
+
+    def test_alter_column_type(self):
+        """
+        Тест для перевірки зміни типу колонки пакетами, читання під час перетворення та скасування.
+        """
+        for kind in ("rows", "columnar"):
+            table = Table("T", Schema([Field("id", int), Field("price", str)]), kind)
+            table.add_rows([{"id": i, "price": str(i * 10)} for i in range(50)])
+            table.create_index("price", "sorted")
+            table.delete_row(3)
+            self.assertIsNone(table.alter_column_type("price", str))
+            task = table.alter_column_type("price", int, background=False)
+            self.assertIsNone(task)
+            self.assertEqual(table.schema.get_field("price").data_type, int)
+            self.assertEqual(table.find_range("price", 20, 50), [2, 3, 4])
+            self.assertEqual(list(table.column("price"))[:3], [0, 10, 20])
+
+            # Пакети по 7 рядків: читання між пакетами бачить уже новий тип
+            task = table.alter_column_type("price", float, batch_size=7)
+            snapshot = table.freeze()
+            self.assertEqual(table.get_row(48).data["price"], 490.0)
+            task.wait()
+            self.assertIsNone(task.error)
+            self.assertEqual(list(table.column("price"))[-1], 490.0)
+            self.assertEqual(snapshot.get_row(48).data["price"], 490.0)
+            self.assertEqual(table.find_range("price", 485), [48])
+
+            # Зміна таблиці під час перетворення спершу завершує його
+            table._start_conversion("price", str, lambda value: f"{value:.1f}")
+            table.add_row({"id": 99, "price": "1.0"})
+            self.assertEqual(table.get_row(0).data["price"], "0.0")
+            self.assertIsNone(table._conversion)
+
+            # Невдале перетворення повертає старий тип
+            table._start_conversion("price", "char", lambda value: value)
+            with self.assertRaises(ValueError):
+                table.delete_row(0)
+            self.assertEqual(table.schema.get_field("price").data_type, str)
+            self.assertEqual(table.get_row(1).data["price"], "10.0")
+            self.assertEqual(len(table), 50)
+            self.assertEqual(table.find("price", "490.0"), [48])
+
+    def test_dictionary_encoding(self):
+        """
+        Тест для перевірки словникового кодування колонки: запити, збереження словника з кодами
+        у файлах обох форматів і вимкнення кодування.
+        """
+        for kind in ("rows", "columnar"):
+            db = Database()
+            db.create_table("T", Schema([Field("id", int), Field("country", "char"), Field("status", str)]), kind)
+            table = db.tables["T"]
+            table.add_rows([{"id": i, "country": "UAPL"[i % 4], "status": ("open", "closed")[i % 3 == 0]}
+                            for i in range(30)])
+            table.set_dictionary_encoding("status")
+            table.set_dictionary_encoding("country")
+            with self.assertRaises(ValueError):
+                table.set_dictionary_encoding("id")
+            table.delete_row(1)
+            self.assertEqual([row["id"] for row in table.query().where("status", "==", "closed").limit(3)], [0, 3, 6])
+            self.assertEqual(table.query().where("country", "in", ["U", "P"]).count(), 15)
+            self.assertEqual(table.query().where("status", "==", "missing").count(), 0)
+            dictionaries = table.dictionaries()
+            self.assertEqual(sorted(dictionaries["country"]), ["A", "L", "P", "U"])
+            saved = table.to_dict()["rows"][1]
+            self.assertEqual((dictionaries["country"][saved["country"]], dictionaries["status"][saved["status"]]),
+                             ("P", "open"))
+            table.rename_or_reorder_columns(["status", "id", "country"], {"status": "state"})
+            self.assertTrue(table.schema.get_field("state").dictionary)
+            with tempfile.TemporaryDirectory() as directory:
+                for filename in ("db.json", "db.ldb"):
+                    path = os.path.join(directory, filename)
+                    db.save_to_disk(path)
+                    loaded = Database()
+                    loaded.load_from_disk(path)
+                    copy = loaded.tables["T"]
+                    self.assertTrue(copy.schema.get_field("country").dictionary)
+                    self.assertEqual([row.data for row in copy], [row.data for row in table])
+                    self.assertIs(copy.get_row(0)["state"], copy.get_row(2)["state"])
+            table.set_dictionary_encoding("state", False)
+            self.assertEqual(list(table.dictionaries()), ["country"])
+            self.assertEqual(table.get_row(0)["state"], "closed")
+
+    def test_columnar_table(self):
+        """
+        Тест для перевірки таблиці з колонковим сховищем.
+        """
+        table = Table("Columnar", self.schema, storage="columnar")
+        table.add_row({"id": 1, "name": "A", "interval": RealInterval(1.0, 5.0)})
+        table.add_row({"id": 2, "name": "B", "interval": RealInterval(2.0, 6.0)})
+        table.edit_row(0, {"id": 3, "name": "C", "interval": RealInterval(0.0, 1.0)})
+        table.delete_row(1)
+        self.assertEqual(len(table.rows), 1)
+        self.assertEqual(list(table.column("id")), [3])
+        table.rename_or_reorder_columns(["name", "interval", "id"])
+        self.assertEqual(list(table.rows[0].data.keys()), ["name", "interval", "id"])
+        restored = Table.from_dict(table.to_dict())
+        self.assertEqual(restored.storage, "columnar")
+        self.assertEqual(restored.rows[0].data["name"], "C")
+
+    def test_index_maintenance(self):
+        """
+        Тест для перевірки індексів під час додавання, редагування та видалення рядків.
+        """
+        for storage in ("rows", "columnar"):
+            table = Table("Indexed", self.schema, storage=storage)
+            for i in range(5):
+                table.add_row({"id": i, "name": "even" if i % 2 == 0 else "odd",
+                               "interval": RealInterval(i, i + 1)})
+            table.create_index("name", "hash")
+            table.create_index("id", "sorted")
+            table.create_index("interval", "sorted")
+            table.delete_row(0)
+            table.edit_row(1, {"id": 20, "name": "odd", "interval": RealInterval(0.5, 1.0)})
+            table.add_row({"id": 7, "name": "even", "interval": RealInterval(7, 8)})
+            self.assertEqual(table.find("name", "even"), [3, 4])
+            self.assertEqual(table.find("name", "odd"), [0, 1, 2])
+            self.assertEqual(table.find_range("id", 3, 10), [2, 3, 4])
+            self.assertEqual(table.find_range("interval", high=1.0, part="end"), [1])
+
+            table.rename_or_reorder_columns(["name", "interval", "id"])
+            restored = Table.from_dict(table.to_dict())
+            self.assertEqual(set(restored.indexes), set(table.indexes))
+            self.assertEqual(restored.find("name", "even"), [3, 4])
+            table.drop_index("name", "hash")
+            self.assertEqual(table.find("name", "even"), [3, 4])
+
+    def test_interval_queries(self):
+        """
+        Тест для перевірки запитів до інтервалів з індексом і без нього.
+        """
+        for i in range(6):
+            self.table.add_row({"id": i, "name": str(i), "interval": RealInterval(i, i + 2)})
+        expected = self.table.overlaps("interval", 2.5, 3.0)
+        self.assertEqual(expected, [1, 2, 3])
+        self.table.create_index("interval", "interval")
+        self.assertEqual(self.table.overlaps("interval", 2.5, 3.0), expected)
+        self.table.delete_row(0)
+        self.assertEqual(self.table.contains_point("interval", 3.0), [0, 1, 2])
+        self.assertEqual(self.table.stabbing_count("interval", 3.0), 3)
+        with self.assertRaises(ValueError):
+            self.table.overlaps("id", 0, 1)
+
+    def test_add_rows(self):
+        """
+        Тест для перевірки пакетного додавання рядків.
+        """
+        self.table.create_index("id", "hash")
+        rows = [{"id": i, "name": str(i), "interval": RealInterval(i, i + 1)} for i in range(100)]
+        self.assertEqual(self.table.add_rows(iter(rows)), 100)
+        self.assertEqual(len(self.table.rows), 100)
+        self.assertEqual(self.table.find("id", 42), [42])
+        self.table.add_rows(rows[:10], validate="sample")
+        self.table.add_rows(rows[:10], validate="none")
+        self.assertEqual(self.table.find("id", 5), [5, 105, 115])
+
+    def test_version_counts_successful_changes(self):
+        """
+        Тест для перевірки, що відхилена зміна не збільшує лічильник змін таблиці.
+        """
+        version = self.table.version
+        with self.assertRaises(TypeError):
+            self.table.add_row({"id": "1", "name": "A", "interval": RealInterval(0, 1)})
+        self.assertEqual(self.table.version, version)
+        self.table.add_row({"id": 1, "name": "A", "interval": RealInterval(0, 1)})
+        with self.assertRaises(IndexError):
+            self.table.edit_row(5, {"id": 2, "name": "B", "interval": RealInterval(0, 1)})
+        self.assertEqual(self.table.version, version + 1)
+
+    def test_add_rows_collects_errors(self):
+        """
+        Тест для перевірки збору помилок з позиціями рядків.
+        """
+        rows = [
+            {"id": 1, "name": "A", "interval": RealInterval(1.0, 2.0)},
+            {"id": "2", "name": "B", "interval": RealInterval(1.0, 2.0)},
+            {"id": 3, "interval": RealInterval(1.0, 2.0)}
+        ]
+        with self.assertRaises(BatchValidationError) as context:
+            self.table.add_rows(rows)
+        self.assertEqual([position for position, _ in context.exception.errors], [1, 2])
+        self.assertIsInstance(context.exception.errors[0][1], TypeError)
+        self.assertEqual(len(self.table.rows), 0)
+        with self.assertRaises(ValueError):
+            self.table.add_rows(rows, validate="partial")
+        for storage in ("rows", "columnar"):
+            table = Table("T", self.table.schema, storage=storage)
+            table.add_row(rows[0])
+            with self.assertRaises(KeyError):  # Без валідації рядок без колонки падає під час вставки
+                table.add_rows([rows[0], rows[0], rows[2]], validate="none")
+            self.assertEqual(len(table), 1)
+            self.assertEqual(table.add_row(rows[0]), 1)
+
+    def test_multi_row_operations_are_atomic(self):
+        """
+        Тест для перевірки атомарного редагування та видалення кількох рядків.
+        """
+        self.table.create_index("id", "sorted")
+        self.table.add_rows([{"id": i, "name": str(i), "interval": RealInterval(i, i + 1)} for i in range(6)])
+        with self.assertRaises(BatchValidationError):
+            self.table.edit_rows({0: {"id": 10, "name": "a", "interval": RealInterval(0, 1)},
+                                  9: {"id": 11, "name": "b", "interval": RealInterval(0, 1)}})
+        self.assertEqual(self.table.get_row(0).data["id"], 0)
+        self.table.edit_rows([(0, {"id": 10, "name": "a", "interval": RealInterval(0, 1)}),
+                              (5, {"id": 15, "name": "b", "interval": RealInterval(0, 1)})])
+        with self.assertRaises(IndexError):
+            self.table.delete_rows([1, 6])
+        self.assertEqual(len(self.table), 6)
+        self.table.delete_rows([3, 1, 3])
+        self.assertEqual([row.data["id"] for row in self.table], [10, 2, 4, 15])
+        self.assertEqual(self.table.find_range("id", 4, 20), [2, 0, 3])
+
+    def test_row_ids(self):
+        """
+        Тест для перевірки сталих ідентифікаторів рядків та операцій за ідентифікатором.
+        """
+        self.table.create_index("id")
+        self.table.create_index("interval", "interval")
+        row_ids = [self.table.add_row({"id": i, "name": str(i), "interval": RealInterval(i, i + 1)})
+                   for i in range(6)]
+        self.assertEqual(row_ids, list(range(6)))
+        self.table.delete_row(0)
+        self.table.delete_row_by_id(3)
+        self.assertEqual(self.table.row_ids(), [1, 2, 4, 5])
+        self.assertEqual(self.table.get_row_by_id(4).data["id"], 4)
+        self.assertEqual(self.table.index_of(4), 2)
+        self.assertEqual(self.table.row_id(0), 1)
+        self.table.edit_row_by_id(4, {"id": 40, "name": "x", "interval": RealInterval(0, 1)})
+        self.assertEqual(self.table.find("id", 40), [2])
+        self.assertEqual(self.table.find("id", 5), [3])
+        self.assertEqual(self.table.overlaps("interval", 0, 1.5), [0, 2])
+        self.assertEqual([row["id"] for row in self.table.query().where("id", "==", 2)], [2])
+        with self.assertRaises(IndexError):
+            self.table.get_row_by_id(3)
+        with self.assertRaises(IndexError):
+            self.table.delete_rows_by_id([1, 3])
+        self.assertEqual(len(self.table), 4)
+        self.table.delete_rows_by_id([1, 5])
+        self.table.compact()
+        self.assertEqual(self.table.row_ids(), [2, 4])
+        self.assertEqual(self.table.add_row({"id": 6, "name": "", "interval": RealInterval(0, 1)}), 6)
+        self.assertEqual(self.table.find("id", 6), [2])
+
+    def test_mass_delete_compacts(self):
+        """
+        Тест для перевірки масового видалення з автоматичним ущільненням та індексами.
+        """
+        table = Table("Big", Schema([Field("id", int), Field("even", int)]), "columnar")
+        table.add_rows([{"id": i, "even": i % 2} for i in range(3 * storage.COMPACT_MIN)])
+        table.create_index("even")
+        table.delete_rows_by_id(range(0, len(table), 2))
+        self.assertEqual(table.rows.deleted, [])  # Ущільнено автоматично
+        self.assertEqual(table.find("even", 0), [])
+        self.assertEqual(len(table.find("even", 1)), len(table))
+        self.assertEqual(table.get_row(1).data["id"], 3)
+        self.assertEqual(table.index_of(5), 2)
+
+    def test_row_ids_persist(self):
+        """
+        Тест для перевірки збереження ідентифікаторів рядків у JSON та бінарному форматі.
+        """
+        for kind in ("rows", "columnar"):
+            db = Database()
+            db.create_table("T", self.table.schema, kind)
+            table = db.tables["T"]
+            table.add_rows([{"id": i, "name": str(i), "interval": RealInterval(i, i + 1)} for i in range(5)])
+            table.create_index("id", "sorted")
+            table.delete_rows_by_id([0, 3, 4])
+            with tempfile.TemporaryDirectory() as directory:
+                for filename in ("db.json", "db.ldb"):
+                    path = os.path.join(directory, filename)
+                    db.save_to_disk(path)
+                    for lazy in (False, True):
+                        loaded = Database()
+                        loaded.load_from_disk(path, lazy=lazy)
+                        copy = loaded.tables["T"]
+                        self.assertEqual(copy.row_ids(), [1, 2])
+                        self.assertEqual(copy.find_range("id", 2), [1])
+                        self.assertEqual(copy.add_row({"id": 9, "name": "", "interval": RealInterval(0, 1)}), 5)
+
 if __name__ == "__main__":
     unittest.main()
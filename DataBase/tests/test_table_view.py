@@ -0,0 +1,85 @@
+import time
+import unittest
+from table import Table
+from table_view import RowWindow
+from schema import Schema, Field
+from custom_types import RealInterval, PictureFile
+
+class TestRowWindow(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Ініціалізація таблиці на 1000 рядків і вікна на 10 рядків.
+        """
+        self.table = Table("t", Schema([Field("id", int), Field("interval", RealInterval), Field("picture", PictureFile)]))
+        self.table.add_rows([{"id": i, "interval": RealInterval(i, i + 1), "picture": PictureFile(data=b"x")}
+                             for i in range(1000)])
+        self.window = RowWindow(self.table, height=10, prefetch=5)
+
+    def test_visible_rows_and_scrolling(self):
+        """
+        Тест для перевірки видимих рядків, прокрутки з обмеженням меж і частки для смуги прокрутки.
+        """
+        self.assertEqual(self.window.visible_rows()[0], [0, "0.0 - 1.0", "Зображення збережено"])
+        self.window.scroll_by(-5)
+        self.assertEqual(self.window.first, 0)
+        self.window.moveto(0.5)
+        self.assertEqual([row[0] for row in self.window.visible_rows()], list(range(500, 510)))
+        self.assertEqual(self.window.fraction(), (0.5, 0.51))
+        self.window.scroll_to(5000)
+        self.assertEqual(self.window.first, 990)
+        self.assertEqual(len(self.window.visible_rows()), 10)
+
+    def test_only_window_is_formatted(self):
+        """
+        Тест для перевірки, що форматуються лише видимі рядки та запас,
+        а прокрутка в межах запасу не читає таблицю повторно.
+        """
+        self.window.scroll_to(100)
+        self.window.visible_rows()
+        self.assertEqual(len(self.window._cache), 20)
+        cache = self.window._cache
+        self.window.scroll_by(3)
+        self.window.visible_rows()
+        self.assertIs(self.window._cache, cache)
+
+    def test_jump_to(self):
+        """
+        Тест для перевірки переходу до рядка та позиції рядка у вікні.
+        """
+        position = self.window.jump_to(700)
+        self.assertEqual(self.window.row_index(position), 700)
+        self.assertEqual(self.window.visible_rows()[position][0], 700)
+        row_id = self.window.row_id(position)
+        self.table.delete_row(0)  # Ідентифікатор показаного рядка не зсувається
+        self.assertEqual(self.table.get_row_by_id(row_id).data["id"], 700)
+        self.assertEqual(self.window.jump_to(702), position + 2)  # Уже видимий рядок - без прокрутки
+        with self.assertRaises(IndexError):
+            self.window.jump_to(1000)
+
+    def test_follows_table_changes(self):
+        """
+        Тест для перевірки оновлення вікна після додавання, редагування та видалення рядків.
+        """
+        self.window.scroll_to(990)
+        self.window.visible_rows()
+        self.table.edit_row(995, {"id": -1, "interval": RealInterval(0, 0), "picture": PictureFile(data=b"y")})
+        self.assertEqual(self.window.visible_rows()[5][0], -1)
+        self.table.delete_rows(list(range(900, 1000)))
+        self.assertTrue(self.window.refresh())
+        self.assertEqual(self.window.first, 890)
+        self.assertEqual(self.window.visible_rows()[-1][0], 899)
+        self.assertFalse(self.window.refresh())
+
+    def test_open_is_independent_of_size(self):
+        """
+        Тест для перевірки, що перше відображення великої таблиці не перебирає всі рядки.
+        """
+        self.table.add_rows([{"id": i, "interval": RealInterval(0, 1), "picture": PictureFile(data=b"x")}
+                             for i in range(200_000)])
+        start = time.perf_counter()
+        RowWindow(self.table).visible_rows()
+        self.assertLess(time.perf_counter() - start, 0.05)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import vectorized
+from table import Table
+from schema import Schema, Field
+from custom_types import RealInterval
+
+MODES = [False, True] if vectorized.HAS_NUMPY else [False]
+
+class TestVectorized(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Ініціалізація таблиць з обома типами сховища.
+        """
+        schema = Schema([
+            Field("id", int),
+            Field("score", float),
+            Field("group", str),
+            Field("interval", RealInterval)
+        ])
+        self.tables = []
+        for storage in ("rows", "columnar"):
+            table = Table(storage, schema, storage=storage)
+            for i in range(10):
+                table.add_row({"id": i, "score": i * 0.5, "group": "ab"[i % 2],
+                               "interval": RealInterval(i, i + 1 + i % 3)})
+            self.tables.append(table)
+
+    def test_aggregates(self):
+        """
+        Тест для перевірки агрегатів у чистому Python та у NumPy.
+        """
+        for table in self.tables:
+            for use_numpy in MODES:
+                self.assertEqual(vectorized.aggregate(table, "id", "sum", use_numpy=use_numpy), 45)
+                self.assertAlmostEqual(vectorized.aggregate(table, "score", "mean", use_numpy=use_numpy), 2.25)
+                self.assertEqual(vectorized.aggregate(table, "id", "max", use_numpy=use_numpy), 9)
+                self.assertEqual(vectorized.aggregate(table, "interval", "min", part="end",
+                                                      use_numpy=use_numpy), 1.0)
+                self.assertEqual(vectorized.aggregate(table, "interval", "sum", part="length",
+                                                      use_numpy=use_numpy), 19.0)
+                self.assertEqual(vectorized.aggregate(table, "id", "count", use_numpy=use_numpy), 10)
+
+    def test_filter_histogram_group_by(self):
+        """
+        Тест для перевірки фільтрів, гістограми та групування.
+        """
+        for table in self.tables:
+            for use_numpy in MODES:
+                self.assertEqual(vectorized.filter_positions(table, "score", ">=", 3.5, use_numpy=use_numpy),
+                                 [7, 8, 9])
+                counts, edges = vectorized.histogram(table, "id", bins=3, use_numpy=use_numpy)
+                self.assertEqual(counts, [3, 3, 4])
+                self.assertEqual(len(edges), 4)
+                self.assertEqual(vectorized.group_by(table, "group", "id", "sum", use_numpy=use_numpy),
+                                 {"a": 20, "b": 25})
+                self.assertEqual(vectorized.group_by(table, "group", "interval", "max", part="start",
+                                                     use_numpy=use_numpy), {"a": 8.0, "b": 9.0})
+
+    def test_group_min_max(self):
+        """
+        Тест для перевірки min/max груп, що не містять першого значення колонки.
+        """
+        schema = Schema([Field("key", str), Field("value", int), Field("negative", float)])
+        for storage in ("rows", "columnar"):
+            table = Table("T", schema, storage=storage)
+            for key, value in [("a", 5), ("b", 10), ("b", 12), ("a", 7)]:
+                table.add_row({"key": key, "value": value, "negative": -float(value)})
+            for use_numpy in MODES:
+                self.assertEqual(vectorized.group_by(table, "key", "value", "min", use_numpy=use_numpy),
+                                 {"a": 5, "b": 10})
+                self.assertEqual(vectorized.group_by(table, "key", "negative", "max", use_numpy=use_numpy),
+                                 {"a": -5.0, "b": -10.0})
+
+    @unittest.skipUnless(vectorized.HAS_NUMPY, "NumPy не встановлено")
+    def test_column_array_is_copy(self):
+        """
+        Тест для перевірки, що масив колонки не заважає додаванню рядків.
+        """
+        table = self.tables[1]
+        ids = vectorized.column_array(table, "id")
+        table.add_row({"id": 10, "score": 5.0, "group": "a", "interval": RealInterval(0, 1)})
+        self.assertEqual(len(ids), 10)
+        self.assertEqual(len(vectorized.column_array(table, "id")), 11)
+
+    def test_dictionary_codes(self):
+        """
+        Тест для перевірки фільтрів і групування за кодами колонки зі словниковим кодуванням.
+        """
+        for table in self.tables:
+            table.set_dictionary_encoding("group")
+            table.delete_row(0)
+            for use_numpy in MODES:
+                self.assertEqual(vectorized.filter_positions(table, "group", "==", "b", use_numpy=use_numpy),
+                                 [0, 2, 4, 6, 8])
+                self.assertEqual(vectorized.filter_positions(table, "group", "!=", "z", use_numpy=use_numpy),
+                                 list(range(9)))
+                self.assertEqual(vectorized.group_by(table, "group", "id", "sum", use_numpy=use_numpy),
+                                 {"a": 20, "b": 25})
+            table.compact()  # Значення "a" з видаленого рядка лишається у словнику до ущільнення
+            table.edit_row(0, {"id": 1, "score": 0.5, "group": "c", "interval": RealInterval(1, 2)})
+            for use_numpy in MODES:
+                self.assertEqual(vectorized.group_by(table, "group", "id", "count", use_numpy=use_numpy),
+                                 {"a": 4, "b": 4, "c": 1})
+
+    def test_invalid_columns(self):
+        """
+        Тест для перевірки помилок для нечислових колонок.
+        """
+        table = self.tables[0]
+        with self.assertRaises(ValueError):
+            vectorized.aggregate(table, "group", "sum", use_numpy=False)
+        with self.assertRaises(ValueError):
+            vectorized.aggregate(table, "interval", "sum", use_numpy=False)
+        with self.assertRaises(ValueError):
+            vectorized.aggregate(table, "id", "median", use_numpy=False)
+
+if __name__ == "__main__":
+    unittest.main()
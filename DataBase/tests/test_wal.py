@@ -0,0 +1,220 @@
+import os
+import tempfile
+import unittest
+import wal
+from database import Database
+from schema import Schema, Field
+from custom_types import RealInterval
+
+class TestWriteAheadLog(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Ініціалізація бази даних з підключеним журналом.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "db.json")
+        self.schema = Schema([Field("id", int), Field("name", str), Field("interval", RealInterval)])
+        self.db = Database()
+        self.db.open_log(self.filename, sync_interval=None)
+
+    def tearDown(self):
+        self.db.close_log()
+        self.directory.cleanup()
+
+    def _fill(self):
+        self.db.create_table("T", self.schema)
+        table = self.db.tables["T"]
+        for i in range(5):
+            table.add_row({"id": i, "name": f"n{i}", "interval": RealInterval(i, i + 1)})
+        table.add_rows([{"id": 10, "name": "batch", "interval": RealInterval(0, 1)}])
+        table.edit_row(1, {"id": 100, "name": "edited", "interval": RealInterval(2, 3)})
+        table.delete_row(0)
+        table.add_rows([{"id": 20, "name": "x", "interval": RealInterval(0, 1)},
+                        {"id": 21, "name": "y", "interval": RealInterval(0, 1)}])
+        table.edit_rows({5: {"id": 30, "name": "z", "interval": RealInterval(0, 1)}})
+        table.delete_rows([5, 6])
+        table.create_index("id")
+        table.rename_or_reorder_columns(["name", "id", "interval"])
+        self.db.create_table("Temp", self.schema)
+        self.db.delete_table("Temp")
+
+    def _load(self):
+        db = Database()
+        db.load_from_disk(self.filename)
+        return db
+
+    def _ids(self, db):
+        return [row.data["id"] for row in db.tables["T"].rows]
+
+    def test_recovery_without_main_file(self):
+        """
+        Тест для перевірки відтворення всіх операцій з журналу після збою (основного файлу ще немає).
+        """
+        self._fill()
+        self.db.log.sync()
+        loaded = self._load()
+        self.assertEqual(list(loaded.tables), ["T"])
+        self.assertEqual(self._ids(loaded), [100, 2, 3, 4, 10])
+        table = loaded.tables["T"]
+        self.assertEqual([field.name for field in table.schema.fields], ["name", "id", "interval"])
+        self.assertEqual(table.find("id", 3), [2])
+        self.assertEqual(table.rows[0].data["interval"].end, 3.0)
+
+    def test_checkpoint_and_idempotent_replay(self):
+        """
+        Тест для перевірки контрольної точки: враховані сегменти видаляються,
+        а записи, які вже є у файлі бази, не застосовуються повторно.
+        """
+        self._fill()
+        self.db.checkpoint()
+        self.assertEqual(len(wal.segment_paths(self.filename)), 1)  # Лише новий порожній сегмент
+        self.db.tables["T"].add_row({"name": "after", "id": 7, "interval": RealInterval(0, 0)})
+        self.db.log.sync()
+        self.assertEqual(self._ids(self._load()), [100, 2, 3, 4, 10, 7])
+        # Повне збереження при наявному журналі: відтворення не дублює рядки
+        self.db.save_to_disk(self.filename)
+        self.assertEqual(self._ids(self._load()), [100, 2, 3, 4, 10, 7])
+
+    def test_background_checkpoint_binary(self):
+        """
+        Тест для перевірки фонової контрольної точки у бінарному форматі.
+        """
+        self.db.close_log()
+        filename = os.path.join(self.directory.name, "db.ldb")
+        self.db.open_log(filename, sync_interval=None)
+        self._fill()
+        thread = self.db.checkpoint(background=True)
+        self.db.tables["T"].delete_row(0)  # Зміни під час запису потрапляють у новий сегмент
+        self.db.wait_checkpoint()
+        self.assertFalse(thread.is_alive())
+        self.db.log.sync()
+        loaded = Database()
+        loaded.load_from_disk(filename)
+        self.assertEqual([row.data["id"] for row in loaded.tables["T"].rows], [2, 3, 4, 10])
+
+    def test_checkpoint_lazy_database(self):
+        """
+        Тест для перевірки контрольної точки бази даних, завантаженої з відображенням файлу в пам'ять.
+        """
+        self.db.close_log()
+        filename = os.path.join(self.directory.name, "db.ldb")
+        self.db.open_log(filename, sync_interval=None)
+        self._fill()
+        self.db.create_table("Other", self.schema)
+        self.db.tables["Other"].add_row({"id": 7, "name": "o", "interval": RealInterval(0, 1)})
+        self.db.checkpoint()
+        self.db.close_log()
+        db = Database()
+        db.load_from_disk(filename, lazy=True, log=True)
+        db.tables["T"].delete_row(0)
+        db.checkpoint()
+        self.assertEqual(db.tables._maps, [])  # Таблиці декодовано, файл більше не відображено
+        self.assertEqual(db.tables["Other"].get_row(0).data["id"], 7)
+        db.close_log()
+        loaded = Database()
+        loaded.load_from_disk(filename)
+        self.assertEqual([row.data["id"] for row in loaded.tables["T"].rows], [2, 3, 4, 10])
+
+    def test_torn_tail_is_ignored(self):
+        """
+        Тест для перевірки, що обірваний останній запис журналу ігнорується.
+        """
+        self._fill()
+        self.db.log.sync()
+        with open(wal.segment_paths(self.filename)[-1], 'ab') as file:
+            file.write(b'{"op": "delete_row", "tab')
+        self.assertEqual(self._ids(self._load()), [100, 2, 3, 4, 10])
+
+    def test_group_commit(self):
+        """
+        Тест для перевірки групового fsync.
+        """
+        self.db.close_log()
+        self.db.open_log(self.filename, sync_every=10, sync_interval=None)
+        self.db.create_table("T", self.schema)
+        for i in range(24):
+            self.db.tables["T"].add_row({"id": i, "name": "", "interval": RealInterval(0, 1)})
+        self.assertEqual(self.db.log.syncs, 2)
+        self.assertEqual(self.db.log.pending, 5)
+
+    def test_load_and_continue_logging(self):
+        """
+        Тест для перевірки продовження журналу після завантаження з відтворенням.
+        """
+        self._fill()
+        self.db.close_log()
+        db = Database()
+        db.load_from_disk(self.filename, log=True)
+        db.tables["T"].delete_row(0)
+        db.close_log()
+        self.assertEqual(self._ids(self._load()), [2, 3, 4, 10])
+
+    def test_replay_by_row_id(self):
+        """
+        Тест для перевірки відтворення операцій за ідентифікатором рядка.
+        """
+        self._fill()
+        table = self.db.tables["T"]
+        row_id = table.row_id(1)
+        table.edit_row_by_id(row_id, {"name": "by id", "id": 200, "interval": RealInterval(0, 1)})
+        table.delete_row_by_id(table.row_id(0))
+        table.delete_rows_by_id([table.row_id(2)])
+        self.db.log.sync()
+        loaded = self._load().tables["T"]
+        self.assertEqual(self._ids(self._load()), [200, 3, 10])
+        self.assertEqual(loaded.row_ids(), table.row_ids())
+        self.assertEqual(loaded.get_row_by_id(row_id).data["name"], "by id")
+
+    def test_replay_rename(self):
+        """
+        Тест для перевірки відтворення перейменування колонок з журналу.
+        """
+        self._fill()
+        self.db.tables["T"].rename_or_reorder_columns(["id", "name", "interval"], {"name": "title"})
+        self.db.log.sync()
+        loaded = self._load().tables["T"]
+        self.assertEqual([field.name for field in loaded.schema.fields], ["id", "title", "interval"])
+        self.assertEqual(loaded.get_row(0).data["title"], "edited")
+        self.assertEqual(loaded.find("id", 3), [2])
+
+    def test_replay_schema_changes(self):
+        """
+        Тест для перевірки відтворення додавання, видалення колонок та зміни типу з журналу.
+        """
+        self._fill()
+        table = self.db.tables["T"]
+        table.add_column(Field("span", RealInterval), RealInterval(1, 2))
+        table.drop_column("name")
+        table.alter_column_type("id", str, background=False)
+        table.set_dictionary_encoding("id")
+        with self.assertRaises(ValueError):
+            table.alter_column_type("id", int, converter=int)  # Функцію неможливо записати в журнал
+        self.db.log.sync()
+        loaded = self._load().tables["T"]
+        self.assertEqual([field.name for field in loaded.schema.fields], ["id", "interval", "span"])
+        self.assertEqual(loaded.schema.column_ids, table.schema.column_ids)
+        self.assertEqual(loaded.get_row(0).data["id"], "100")
+        self.assertEqual(loaded.get_row(0).data["span"].start, 1)
+        self.assertEqual(loaded.find("id", "3"), [2])
+        self.assertTrue(loaded.schema.get_field("id").dictionary)
+
+    def test_checkpoint_during_type_conversion(self):
+        """
+        Тест для перевірки, що контрольна точка не записує тип колонки, зміну якого
+        ще не завершено: невдале перетворення скасовує її і у файлі, і в таблиці.
+        """
+        self._fill()
+        table = self.db.tables["T"]
+        table.add_row({"id": 40, "name": "x", "interval": RealInterval(0, 1)})
+        table._start_conversion("name", int, None)  # Перетворення розпочато, але ще не виконано
+        self.db.checkpoint()
+        self.assertFalse(table.converting)
+        self.assertIs(table.schema.get_field("name").data_type, str)
+        self.db.log.sync()
+        loaded = self._load().tables["T"]
+        self.assertIs(loaded.schema.get_field("name").data_type, str)
+        self.assertEqual(loaded.get_row(len(loaded) - 1).data["name"], "x")
+
+if __name__ == "__main__":
+    unittest.main()
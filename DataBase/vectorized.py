@@ -0,0 +1,271 @@
+import math
+import operator
+from array import array
+from custom_types import RealInterval
+from storage import ColumnarStorage
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необов'язковий: без нього працює чистий Python
+    np = None
+
+HAS_NUMPY = np is not None
+
+AGGREGATES = ("sum", "mean", "min", "max", "count")
+INTERVAL_PARTS = ("start", "end", "length")
+
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge
+}
+
+
+def _use_numpy(use_numpy):
+    """
+    Вибір режиму виконання.
+    :param use_numpy: None - NumPy, якщо встановлено; True - обов'язково NumPy; False - чистий Python.
+    :return: True, якщо використовується NumPy.
+    """
+    if use_numpy is None:
+        return HAS_NUMPY
+    if use_numpy and not HAS_NUMPY:
+        raise ImportError("Для векторизованого режиму потрібен пакет numpy.")
+    return use_numpy
+
+
+def numeric_values(table, column, part=None):
+    """
+    Числові значення колонки без побудови рядків.
+    Для колонкового сховища повертаються самі масиви array.
+    :param table: Об'єкт Table.
+    :param column: Назва колонки типу int, float або RealInterval.
+    :param part: Для інтервалів - "start", "end" або "length".
+    :return: Масив array або список чисел.
+    """
+    field = table.schema.get_field(column)
+    if field.data_type is RealInterval:
+        if part not in INTERVAL_PARTS:
+            raise ValueError(f"Для колонки '{column}' потрібно вказати частину: {INTERVAL_PARTS}.")
+        if isinstance(table.rows, ColumnarStorage):
+            column_data = table.rows.raw_column(column)
+            starts, ends = table.rows.live(column_data.starts), table.rows.live(column_data.ends)
+        else:
+            values = table.rows.column(column)
+            starts = array('d', [value.start for value in values])
+            ends = array('d', [value.end for value in values])
+        if part == "start":
+            return starts
+        if part == "end":
+            return ends
+        return array('d', [end - start for start, end in zip(starts, ends)])
+    if field.data_type not in (int, float):
+        raise ValueError(f"Колонка '{column}' не є числовою.")
+    if part is not None:
+        raise ValueError(f"Колонка '{column}' не має частин.")
+    return table.column(column)
+
+
+def _copy_array(values, dtype=None):
+    """
+    Копія масиву array як ndarray. Представлення без копіювання утримувало б буфер
+    живого сховища, і наступне додавання рядка до колонки завершилося б BufferError.
+    Викликається під блокуванням читання таблиці.
+    """
+    return np.frombuffer(values, dtype=dtype or values.typecode).copy()
+
+
+def column_array(table, column, part=None):
+    """
+    Числова колонка як ndarray (завжди власна копія, знята під блокуванням читання).
+    :param table: Об'єкт Table.
+    :param column: Назва колонки.
+    :param part: Для інтервалів - "start", "end" або "length".
+    :return: Об'єкт numpy.ndarray.
+    """
+    _use_numpy(True)
+    with table.lock.read():
+        field = table.schema.get_field(column)
+        if field.data_type is RealInterval and part == "length":
+            return column_array(table, column, "end") - column_array(table, column, "start")
+        values = numeric_values(table, column, part)
+        dtype = np.int64 if field.data_type is int else np.float64
+        if isinstance(values, array):
+            return _copy_array(values, dtype)
+        return np.array(values, dtype=dtype)
+
+
+def aggregate(table, column, func, part=None, use_numpy=None):
+    """
+    Агрегат числової колонки.
+    :param table: Об'єкт Table.
+    :param column: Назва колонки.
+    :param func: "sum", "mean", "min", "max" або "count".
+    :param part: Для інтервалів - "start", "end" або "length".
+    :param use_numpy: Режим виконання (див. _use_numpy).
+    :return: Число (None для mean/min/max порожньої колонки).
+    """
+    if func not in AGGREGATES:
+        raise ValueError(f"Невідома агрегатна функція: {func}")
+    if _use_numpy(use_numpy):
+        values = column_array(table, column, part)
+        if func == "count":
+            return int(values.size)
+        if values.size == 0:
+            return 0 if func == "sum" else None
+        return getattr(values, func)().item()
+    values = numeric_values(table, column, part)
+    if func == "count":
+        return len(values)
+    if func == "sum":
+        return math.fsum(values) if isinstance(values, array) and values.typecode == 'd' else sum(values)
+    if len(values) == 0:
+        return None
+    if func == "mean":
+        return math.fsum(values) / len(values)
+    return min(values) if func == "min" else max(values)
+
+
+def histogram(table, column, bins=10, part=None, use_numpy=None):
+    """
+    Гістограма числової колонки з рівними інтервалами.
+    :param table: Об'єкт Table.
+    :param column: Назва колонки.
+    :param bins: Кількість інтервалів.
+    :param part: Для інтервалів - "start", "end" або "length".
+    :param use_numpy: Режим виконання.
+    :return: Кортеж (кількості, межі) - списки довжиною bins та bins + 1.
+    """
+    if _use_numpy(use_numpy):
+        counts, edges = np.histogram(column_array(table, column, part), bins=bins)
+        return counts.tolist(), edges.tolist()
+    values = numeric_values(table, column, part)
+    low, high = (min(values), max(values)) if len(values) else (0.0, 1.0)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    width = (high - low) / bins
+    edges = [low + width * i for i in range(bins)] + [high]
+    counts = [0] * bins
+    for value in values:
+        counts[min(int((value - low) / width), bins - 1)] += 1
+    return counts, edges
+
+
+def filter_mask(table, column, op, value, part=None, use_numpy=None):
+    """
+    Булева маска рядків, що задовольняють порівняння.
+    :param table: Об'єкт Table.
+    :param column: Назва колонки.
+    :param op: Оператор: ==, !=, <, <=, >, >=.
+    :param value: Значення для порівняння.
+    :param part: Для інтервалів - "start", "end" або "length".
+    :param use_numpy: Режим виконання.
+    :return: numpy-масив bool або список bool.
+    """
+    if op not in COMPARISONS:
+        raise ValueError(f"Невідомий оператор: {op}")
+    encoded = table.dictionary_codes(column) if op in ("==", "!=") and part is None else None
+    if encoded is not None:
+        # Колонка зі словниковим кодуванням: порівняння коду замість рядків
+        dictionary, codes = encoded
+        code = dictionary.index(value) if value in dictionary else -1
+        if _use_numpy(use_numpy):
+            with table.lock.read():
+                codes = _copy_array(codes)
+            return COMPARISONS[op](codes, code)
+        return list(map(code.__eq__ if op == "==" else code.__ne__, codes))
+    if _use_numpy(use_numpy):
+        return COMPARISONS[op](column_array(table, column, part), value)
+    compare = COMPARISONS[op]
+    return [compare(current, value) for current in numeric_values(table, column, part)]
+
+
+def filter_positions(table, column, op, value, part=None, use_numpy=None):
+    """
+    Позиції рядків, що задовольняють порівняння.
+    :return: Список індексів рядків.
+    """
+    mask = filter_mask(table, column, op, value, part, use_numpy)
+    if _use_numpy(use_numpy):
+        return np.flatnonzero(mask).tolist()
+    return [position for position, matched in enumerate(mask) if matched]
+
+
+def group_by(table, key_column, value_column, func, part=None, use_numpy=None):
+    """
+    Агрегат числової колонки в розрізі значень іншої колонки.
+    :param table: Об'єкт Table.
+    :param key_column: Колонка групування.
+    :param value_column: Числова колонка для агрегату.
+    :param func: "sum", "mean", "min", "max" або "count".
+    :param part: Для інтервалів у value_column - "start", "end" або "length".
+    :param use_numpy: Режим виконання.
+    :return: Словник {значення ключа: агрегат}.
+    """
+    if func not in AGGREGATES:
+        raise ValueError(f"Невідома агрегатна функція: {func}")
+    if _use_numpy(use_numpy):
+        with table.lock.read():  # Ключі та значення з одного стану таблиці
+            encoded = table.dictionary_codes(key_column)
+            keys = table.column(key_column) if encoded is None else encoded[1]
+            if isinstance(keys, array):
+                keys = _copy_array(keys)
+            values = column_array(table, value_column, part)
+        if encoded is not None:
+            # Коди словника вже є номерами груп
+            inverse = keys.astype(np.intp)
+            unique = encoded[0]
+        elif isinstance(keys, np.ndarray):
+            unique, inverse = np.unique(keys, return_inverse=True)
+            unique = unique.tolist()
+            inverse = inverse.reshape(-1)
+        else:
+            # Нечислові ключі кодуються словником - швидше, ніж сортування рядків у np.unique
+            codes = {}
+            inverse = np.fromiter((codes.setdefault(key, len(codes)) for key in keys),
+                                  dtype=np.intp, count=len(keys))
+            unique = list(codes)
+        counts = np.bincount(inverse, minlength=len(unique))
+        if func == "count":
+            result = counts
+        elif func == "sum" and values.dtype.kind == "i":
+            # Цілі суми без переходу до float
+            result = np.zeros(len(unique), dtype=values.dtype)
+            np.add.at(result, inverse, values)
+        elif func in ("sum", "mean"):
+            result = np.bincount(inverse, weights=values, minlength=len(unique))
+            if func == "mean":
+                result = result / counts
+        else:
+            reducer = np.minimum if func == "min" else np.maximum
+            # Початкове значення - нейтральний елемент операції, а не довільне значення колонки
+            limits = np.iinfo(values.dtype) if values.dtype.kind == "i" else None
+            if func == "min":
+                initial = np.inf if limits is None else limits.max
+            else:
+                initial = -np.inf if limits is None else limits.min
+            result = np.full(len(unique), initial, dtype=values.dtype)
+            reducer.at(result, inverse, values)
+        # Значення словника без жодного рядка не утворюють групи
+        return {key: value.item() for key, value, count in zip(unique, result, counts) if count}
+    encoded = table.dictionary_codes(key_column)
+    keys = table.column(key_column) if encoded is None else encoded[1]
+    values = numeric_values(table, value_column, part)
+    groups = {}
+    for key, value in zip(keys, values):
+        groups.setdefault(key, []).append(value)
+    if func == "count":
+        result = {key: len(group) for key, group in groups.items()}
+    elif func == "sum":
+        result = {key: sum(group) for key, group in groups.items()}
+    elif func == "mean":
+        result = {key: sum(group) / len(group) for key, group in groups.items()}
+    else:
+        reducer = min if func == "min" else max
+        result = {key: reducer(group) for key, group in groups.items()}
+    if encoded is not None:
+        return {encoded[0][code]: value for code, value in result.items()}
+    return result
@@ -0,0 +1,225 @@
+import glob
+import json
+import os
+import threading
+from schema import Schema, Field, TYPES_BY_NAME
+from table import Table, VALIDATE_NONE
+
+WAL_SUFFIX = ".wal."  # Сегменти журналу: <файл бази>.wal.<номер>
+SYNC_EVERY = 256  # Кількість записів, після якої виконується fsync
+SYNC_INTERVAL = 0.05  # Максимальна затримка fsync для записів, що накопичились, секунд
+
+
+def segment_paths(filename):
+    """
+    Сегменти журналу бази даних у порядку запису.
+    :param filename: Ім'я файлу бази даних.
+    :return: Список шляхів.
+    """
+    paths = []
+    for path in glob.glob(glob.escape(filename + WAL_SUFFIX) + "*"):
+        number = path[len(filename + WAL_SUFFIX):]
+        if number.isdigit():
+            paths.append((int(number), path))
+    return [path for _, path in sorted(paths)]
+
+
+def read_records(path):
+    """
+    Читання записів сегмента. Неповний останній рядок (обірваний запис під час збою) ігнорується.
+    :param path: Шлях до сегмента.
+    :return: Генератор словників-записів.
+    :raises ValueError: Якщо пошкоджено запис не в кінці сегмента.
+    """
+    with open(path, 'rb') as file:
+        lines = file.read().split(b"\n")
+    for number, line in enumerate(lines):
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            if number == len(lines) - 1:
+                return
+            raise ValueError(f"Пошкоджений запис журналу {path}, рядок {number + 1}.")
+
+
+def apply_record(tables, record):
+    """
+    Застосування запису журналу до таблиць. Записи, вже враховані у файлі бази
+    (номер запису не більший за номер таблиці), пропускаються, тож відтворення
+    можна повторювати безпечно.
+    :param tables: Словник {назва: Table}.
+    :param record: Словник-запис.
+    """
+    lsn, op, name = record["lsn"], record["op"], record["table"]
+    if op == "create_table":
+        if name not in tables:
+            table = Table(name, Schema.from_dict(record["schema"]), record["storage"])
+            table.lsn = lsn
+            tables[name] = table
+        return
+    table = tables.get(name)
+    if table is None or table.lsn >= lsn:
+        return
+    if op == "delete_table":
+        del tables[name]
+        return
+    deserialize = table.schema.deserializer
+    if op == "add_row":
+        table.add_row(deserialize(record["data"]))
+    elif op == "add_rows":
+        table.add_rows([deserialize(data) for data in record["rows"]], VALIDATE_NONE)
+    elif op == "edit_row":
+        table.edit_row(record["index"], deserialize(record["data"]))
+    elif op == "edit_rows":
+        table.edit_rows([(index, deserialize(data)) for index, data in record["rows"]])
+    elif op == "delete_row":
+        table.delete_row(record["index"])
+    elif op == "delete_rows":
+        table.delete_rows(record["indices"])
+    elif op == "edit_row_id":
+        table.edit_row_by_id(record["id"], deserialize(record["data"]))
+    elif op == "delete_row_id":
+        table.delete_row_by_id(record["id"])
+    elif op == "delete_rows_id":
+        table.delete_rows_by_id(record["ids"])
+    elif op == "reorder_columns":
+        table.rename_or_reorder_columns(record["order"], record.get("renames"))
+    elif op == "add_column":
+        field = Field.from_dict(record["field"])
+        decode = field.decoder()
+        table.add_column(field, decode(record["default"]) if decode else record["default"])
+    elif op == "drop_column":
+        table.drop_column(record["column"])
+    elif op == "alter_column_type":
+        table.alter_column_type(record["column"], TYPES_BY_NAME[record["type"]], background=False)
+    elif op == "dictionary_encoding":
+        table.set_dictionary_encoding(record["column"], record["enabled"])
+    elif op == "create_index":
+        table.create_index(record["column"], record["kind"])
+    elif op == "drop_index":
+        table.drop_index(record["column"], record["kind"])
+    else:
+        raise ValueError(f"Невідома операція журналу: {op}")
+    table.lsn = lsn
+
+
+def replay(tables, filename):
+    """
+    Відновлення змін, записаних у журнал після останньої контрольної точки.
+    :param tables: Словник {назва: Table}, завантажений з файлу бази.
+    :param filename: Ім'я файлу бази даних.
+    :return: Найбільший номер запису в журналі (0, якщо журнал порожній).
+    """
+    last_lsn = 0
+    for path in segment_paths(filename):
+        for record in read_records(path):
+            apply_record(tables, record)
+            last_lsn = max(last_lsn, record["lsn"])
+    return last_lsn
+
+
+class WriteAheadLog:
+    def __init__(self, filename, next_lsn=1, sync_every=SYNC_EVERY, sync_interval=SYNC_INTERVAL):
+        """
+        Журнал операцій з дописуванням у кінець. Записи накопичуються у буфері
+        і скидаються на диск одним fsync для групи (group commit): після sync_every
+        записів або не пізніше ніж через sync_interval секунд.
+        Кожне відкриття журналу починає новий сегмент; старі сегменти видаляє контрольна точка.
+        :param filename: Ім'я файлу бази даних.
+        :param next_lsn: Номер наступного запису.
+        :param sync_every: Кількість записів у групі (1 - fsync для кожного запису).
+        :param sync_interval: Максимальна затримка fsync, секунд (None - без фонового потоку).
+        """
+        self.filename = filename
+        self.next_lsn = next_lsn
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.lock = threading.RLock()
+        self.segments = segment_paths(filename)  # Закриті сегменти, ще не враховані у файлі бази
+        for path in self.segments:
+            # Нумерація продовжується після записів, що залишились від попередніх сеансів
+            for record in read_records(path):
+                self.next_lsn = max(self.next_lsn, record["lsn"] + 1)
+        self.pending = 0  # Записи, ще не скинуті на диск через fsync
+        self.syncs = 0  # Кількість виконаних fsync
+        self._file = None
+        self._open_segment()
+        self._closed = threading.Event()
+        self._flusher = None
+        if sync_interval is not None:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def _open_segment(self):
+        existing = self.segments + ([self._file.name] if self._file else [])
+        number = int(existing[-1][len(self.filename + WAL_SUFFIX):]) + 1 if existing else 1
+        self._file = open(f"{self.filename}{WAL_SUFFIX}{number:06d}", 'ab')
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.sync_interval):
+            self.sync()
+
+    def append(self, record):
+        """
+        Додавання запису в журнал.
+        :param record: Словник з полями операції (без номера).
+        :return: Номер запису.
+        """
+        with self.lock:
+            lsn = self.next_lsn
+            self.next_lsn += 1
+            line = json.dumps(dict(record, lsn=lsn), ensure_ascii=False)
+            self._file.write(line.encode("utf-8") + b"\n")
+            self.pending += 1
+            if self.pending >= self.sync_every:
+                self.sync()
+            return lsn
+
+    def sync(self):
+        """
+        Скидання накопичених записів на диск (один fsync на групу).
+        """
+        with self.lock:
+            if self.pending and self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self.pending = 0
+                self.syncs += 1
+
+    def rotate(self):
+        """
+        Закриття поточного сегмента та початок нового.
+        :return: Список закритих сегментів, які можна видалити після контрольної точки.
+        """
+        with self.lock:
+            self.sync()
+            self._file.close()
+            self.segments.append(self._file.name)
+            self._open_segment()
+            return list(self.segments)
+
+    def remove_segments(self, paths):
+        """
+        Видалення сегментів, уже врахованих у файлі бази даних.
+        :param paths: Шляхи сегментів (результат rotate).
+        """
+        with self.lock:
+            for path in paths:
+                if path in self.segments:
+                    self.segments.remove(path)
+                    os.remove(path)
+
+    def close(self):
+        """
+        Скидання записів на диск і закриття журналу.
+        """
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self.lock:
+            self.sync()
+            self._file.close()
+            self._file = None
+